@@ -0,0 +1,155 @@
+'''
+Scaling benchmark of global fits over many datasets.
+
+A series of Lorentzian curves shares the position and the width, the
+amplitude and the offset are dataset specific, as in a titration or a
+temperature series. For every number of datasets the benchmark measures
+
+  setup     adding the datasets, the modelsets and the parameters
+  shared    one residuum after a shared parameter changed, every modelset
+            is recalculated
+  column    one residuum after a dataset specific parameter changed, as for
+            a column of the Jacobian, only one modelset is recalculated
+  lookup    getModelsetBySuffix and getDatasetBySuffix for all suffices
+
+and prints the time per dataset next to the total, which stays about
+constant as long as the bookkeeping grows linearly. The column time is
+mostly bookkeeping, a fit has one such call per dataset specific
+parameter and iteration.
+
+Usage:
+  python benchmarks/scaling.py                  # 10, 100 and 1000 datasets
+  python benchmarks/scaling.py 10 300           # other numbers of datasets
+  python benchmarks/scaling.py --check          # exit with 1 if the time per
+                                                # dataset grows too much
+'''
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from modelexp import Cli
+from modelexp.experiments import Generic
+from modelexp.models.generic import Lorentzian
+from modelexp.data import XyeData
+from modelexp.fit import LevenbergMarquardt
+
+POINTS = 100
+
+def seriesExperiment(nDatasets):
+  tags = [f't{k}' for k in range(nDatasets)]
+
+  class Series(Generic):
+    def __init__(self):
+      super().__init__()
+      self.nDatasets = nDatasets
+      self.datasetSpecificParams = {'a': tags, 'offset': tags}
+
+  return Series, tags
+
+def setup(nDatasets):
+  experiment, tags = seriesExperiment(nDatasets)
+  app = Cli()
+  app.setExperiment(experiment)
+  data = app.setData(XyeData)
+  x = np.linspace(-5, 5, POINTS)
+  for k, tag in enumerate(tags):
+    dataset = XyeData()
+    y = (1 + 0.01*k) / (1 + (np.pi*(x - 1))**2) + 0.1
+    dataset.setData(x, y, 0.01*np.ones(POINTS))
+    data.addDataset(dataset, tag)
+  model = app.setModel(Lorentzian)
+  app.setFit(LevenbergMarquardt)
+  return model, data, tags
+
+def timeCalls(function, repeat):
+  start = time.perf_counter()
+  for _ in range(repeat):
+    function()
+  return (time.perf_counter() - start) / repeat
+
+def measure(nDatasets, repeat):
+  start = time.perf_counter()
+  model, data, tags = setup(nDatasets)
+  setupTime = time.perf_counter() - start
+
+  experiment = model.ptrExperiment
+  params = model.params.copy()
+  experiment.residuum(params)
+
+  def shared():
+    params['beta'].value *= 1.0001
+    experiment.residuum(params)
+
+  def column():
+    params['a_' + tags[nDatasets // 2]].value *= 1.0001
+    experiment.residuum(params)
+
+  def lookup():
+    for tag in tags:
+      model.getModelsetBySuffix(tag)
+      data.getDatasetBySuffix(tag)
+
+  return {
+    'params': len(model.params),
+    'setup': setupTime,
+    'shared': timeCalls(shared, repeat),
+    'column': timeCalls(column, repeat),
+    'lookup': timeCalls(lookup, repeat),
+  }
+
+def printResults(results):
+  print(f'{"datasets":>8s} {"params":>7s}' + ''.join(
+    f' {name:>10s} {"/dataset":>10s}' for name in ('setup', 'shared', 'column', 'lookup')
+  ))
+  for nDatasets, result in results.items():
+    print(f'{nDatasets:8d} {result["params"]:7d}' + ''.join(
+      f' {result[name]*1e3:8.2f}ms {result[name]/nDatasets*1e6:8.2f}us'
+      for name in ('setup', 'shared', 'column', 'lookup')
+    ))
+
+def check(results, tolerance):
+  '''
+  Compare the time per dataset of the largest to the smallest series,
+  returns a list of what grew by more than the tolerance
+  '''
+  sizes = sorted(results)
+  small, large = results[sizes[0]], results[sizes[-1]]
+  regressions = []
+  for name in ('setup', 'shared', 'column', 'lookup'):
+    perSmall = small[name] / sizes[0]
+    perLarge = large[name] / sizes[-1]
+    if perLarge > perSmall * tolerance:
+      regressions.append(
+        f'{name}: {perLarge*1e6:.2f} us per dataset for {sizes[-1]} datasets, '
+        f'{perSmall*1e6:.2f} us for {sizes[0]}'
+      )
+  return regressions
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('datasets', type=int, nargs='*', default=[10, 100, 1000], help='numbers of datasets')
+  parser.add_argument('--repeat', type=int, default=5, help='calls per residuum and lookup measurement')
+  parser.add_argument('--check', action='store_true', help='exit with 1 if the time per dataset grows too much')
+  parser.add_argument('--tolerance', type=float, default=3, help='allowed factor of the time per dataset')
+  args = parser.parse_args()
+
+  results = {nDatasets: measure(nDatasets, args.repeat) for nDatasets in args.datasets}
+  printResults(results)
+
+  if args.check:
+    regressions = check(results, args.tolerance)
+    if len(regressions) > 0:
+      print('\nTime per dataset grows faster than linear:')
+      for regression in regressions:
+        print('  ' + regression)
+      sys.exit(1)
+    print('\nAll times grow linearly with the number of datasets.')
+
+if __name__ == '__main__':
+  main()
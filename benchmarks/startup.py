@@ -0,0 +1,206 @@
+'''
+Startup benchmark of the common modelexp entry points.
+
+Every entry point is run in a fresh interpreter with -X importtime. For each
+of them the wall time, the peak resident memory and a per-module breakdown of
+the import time are recorded. The results can be stored as a JSON baseline
+and later runs can be checked against it, e.g. to notice when a new model
+module ends up on an eager import path.
+
+Usage:
+  python benchmarks/startup.py                 # print the measurement
+  python benchmarks/startup.py --save          # store it as baseline
+  python benchmarks/startup.py --check         # compare to the baseline
+'''
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(ROOT, 'benchmarks', 'startup_baseline.json')
+
+ENTRY_POINTS = {
+  'cli': (
+    'from modelexp import Cli\n'
+  ),
+  'sas_model': (
+    'from modelexp.models.sas import SphereCS\n'
+  ),
+  'cli_sas_setup': (
+    'import numpy as np\n'
+    'from modelexp import Cli\n'
+    'from modelexp.experiments.sas import Saxs\n'
+    'from modelexp.models.sas import Sphere\n'
+    'from modelexp.data import XyeData\n'
+    'from modelexp.fit import LevenbergMarquardt\n'
+    'app = Cli()\n'
+    'app.setExperiment(Saxs)\n'
+    'q = np.linspace(1e-2, 0.5, 200)\n'
+    'dataset = XyeData()\n'
+    'dataset.setData(q, np.ones(len(q)), 0.1*np.ones(len(q)))\n'
+    'app.setData(XyeData).addDataset(dataset)\n'
+    'app.setModel(Sphere)\n'
+    'app.setFit(LevenbergMarquardt)\n'
+  ),
+}
+
+# executed in the child after the entry point, reports what the parent
+# can not measure from the outside
+REPORT = (
+  'import json as _json, resource as _resource, sys as _sys, time as _time\n'
+  '_sys.stdout.write(_json.dumps({\n'
+  '  "time": _time.perf_counter() - _start,\n'
+  '  "peak_rss_kb": _resource.getrusage(_resource.RUSAGE_SELF).ru_maxrss,\n'
+  '}))\n'
+)
+
+def parseImportTime(stderr):
+  """Parse the output of -X importtime into {module: (self us, cumulative us)}
+  """
+  modules = {}
+  for line in stderr.splitlines():
+    if not line.startswith('import time:') or 'self [us]' in line:
+      continue
+    selfTime, cumulative, name = line[len('import time:'):].split('|')
+    modules[name.strip()] = (int(selfTime), int(cumulative))
+  return modules
+
+def packageTimes(modules):
+  """Sum the self time of the modules per top level package
+  """
+  packages = {}
+  for name, (selfTime, _) in modules.items():
+    package = name.split('.')[0]
+    packages[package] = packages.get(package, 0) + selfTime
+  return packages
+
+def runEntryPoint(code):
+  script = 'import time as _t\n_start = _t.perf_counter()\n' + code + REPORT
+  env = dict(os.environ)
+  env['PYTHONPATH'] = os.pathsep.join(filter(None, [ROOT, env.get('PYTHONPATH')]))
+  proc = subprocess.run(
+    [sys.executable, '-X', 'importtime', '-W', 'ignore', '-c', script],
+    stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+    universal_newlines=True, env=env, cwd=ROOT
+  )
+  if proc.returncode != 0:
+    lastLine = proc.stderr.strip().splitlines()[-1]
+    return {'error': lastLine}
+  report = json.loads(proc.stdout.strip().splitlines()[-1])
+  modules = parseImportTime(proc.stderr)
+  return {
+    'time': report['time'],
+    'peak_rss_kb': report['peak_rss_kb'],
+    'modules': modules,
+  }
+
+def measure(repeat):
+  """Run every entry point repeat times and keep the fastest run
+  """
+  results = {}
+  for name, code in ENTRY_POINTS.items():
+    runs = [runEntryPoint(code) for _ in range(repeat)]
+    valid = [run for run in runs if not 'error' in run]
+    if len(valid) == 0:
+      results[name] = runs[0]
+      continue
+    best = min(valid, key=lambda run: run['time'])
+    modules = best['modules']
+    results[name] = {
+      'time': best['time'],
+      'peak_rss_kb': max(run['peak_rss_kb'] for run in valid),
+      'n_modules': len(modules),
+      'modelexp_modules': sorted(m for m in modules if m.split('.')[0] == 'modelexp'),
+      'packages_us': packageTimes(modules),
+      'slowest_modules_us': dict(sorted(
+        ((m, t[0]) for m, t in modules.items()),
+        key=lambda item: -item[1]
+      )[:25]),
+    }
+  return results
+
+def printResults(results, top):
+  for name, result in results.items():
+    print(f'\n== {name}')
+    if 'error' in result:
+      print(f'  failed: {result["error"]}')
+      continue
+    print(f'  wall time      {result["time"]*1e3:10.1f} ms')
+    print(f'  peak rss       {result["peak_rss_kb"]/1024:10.1f} MB')
+    print(f'  modules        {result["n_modules"]:10d} ({len(result["modelexp_modules"])} modelexp)')
+    print('  by package (self time):')
+    packages = sorted(result['packages_us'].items(), key=lambda item: -item[1])
+    for package, t in packages[:top]:
+      print(f'    {package:40s} {t/1e3:8.1f} ms')
+    print('  slowest modules (self time):')
+    for module, t in list(result['slowest_modules_us'].items())[:top]:
+      print(f'    {module:40s} {t/1e3:8.1f} ms')
+
+def check(results, baseline, tolerance):
+  """Compare against the baseline, returns a list of regressions
+  """
+  regressions = []
+  for name, reference in baseline.items():
+    if not name in results:
+      continue
+    if 'error' in reference:
+      # a failed entry point would never be checked
+      regressions.append(f'{name}: the baseline has no measurement ({reference["error"]}), save it again')
+      continue
+    result = results[name]
+    if 'error' in result:
+      regressions.append(f'{name}: failed with {result["error"]}')
+      continue
+    if result['time'] > reference['time'] * (1 + tolerance):
+      regressions.append(
+        f'{name}: wall time {result["time"]*1e3:.1f} ms > '
+        f'baseline {reference["time"]*1e3:.1f} ms'
+      )
+    if result['peak_rss_kb'] > reference['peak_rss_kb'] * (1 + tolerance):
+      regressions.append(
+        f'{name}: peak rss {result["peak_rss_kb"]} kB > '
+        f'baseline {reference["peak_rss_kb"]} kB'
+      )
+    added = sorted(set(result['modelexp_modules']) - set(reference['modelexp_modules']))
+    if len(added) > 0:
+      regressions.append(f'{name}: imports additional modules {", ".join(added)}')
+  return regressions
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('--repeat', type=int, default=5, help='runs per entry point, the fastest is kept')
+  parser.add_argument('--top', type=int, default=10, help='number of packages/modules to print')
+  parser.add_argument('--baseline', default=BASELINE, help='path of the JSON baseline')
+  parser.add_argument('--save', action='store_true', help='store the measurement as baseline')
+  parser.add_argument('--check', action='store_true', help='exit with 1 on regressions against the baseline')
+  parser.add_argument('--tolerance', type=float, default=0.5, help='allowed relative increase of time and memory')
+  args = parser.parse_args()
+
+  results = measure(args.repeat)
+  printResults(results, args.top)
+
+  if args.save:
+    failed = [name for name, result in results.items() if 'error' in result]
+    if len(failed) > 0:
+      print(f'\nNot saving the baseline, failed entry points: {", ".join(failed)}')
+      sys.exit(1)
+    with open(args.baseline, 'w') as f:
+      json.dump(results, f, indent=2, sort_keys=True)
+      f.write('\n')
+    print(f'\nSaved baseline to {args.baseline}')
+
+  if args.check:
+    with open(args.baseline) as f:
+      baseline = json.load(f)
+    regressions = check(results, baseline, args.tolerance)
+    if len(regressions) > 0:
+      print('\nRegressions against baseline:')
+      for regression in regressions:
+        print('  ' + regression)
+      sys.exit(1)
+    print('\nNo regressions against baseline.')
+
+if __name__ == '__main__':
+  main()
@@ -1,2 +1,9 @@
-from ._app import App
-from ._cli import Cli
\ No newline at end of file
+from ._cli import Cli
+
+def __getattr__(name):
+  # The Qt based App is only imported on first access, so that headless
+  # scripts running the Cli never load PyQt5 or a matplotlib gui backend.
+  if name == 'App':
+    from ._app import App
+    return App
+  raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
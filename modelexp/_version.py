@@ -0,0 +1,15 @@
+def getVersion():
+  '''
+  Version of the installed modelexp package. It is looked up on demand when
+  result files are written, since importing pkg_resources at startup costs
+  more than the rest of the headless import path.
+  '''
+  try:
+    from importlib.metadata import version, PackageNotFoundError
+  except ImportError: # python < 3.8
+    import pkg_resources
+    return pkg_resources.require('modelexp')[0].version
+  try:
+    return version('modelexp')
+  except PackageNotFoundError:
+    return 'unknown'
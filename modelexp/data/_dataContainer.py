@@ -1,6 +1,12 @@
 from ._data import Data
 import numpy as np
 
+def suffixKey(suffix):
+  '''
+  Hashable key of a suffix, which is a str or a list of str
+  '''
+  return tuple(suffix) if isinstance(suffix, list) else suffix
+
 class DataContainer():
   '''
   Container class to hold multiple Data objects.
@@ -12,6 +18,7 @@ class DataContainer():
     self.nDatasets = 0 # number of datasets
     self.datasets = []
     self.dataWeights = []
+    self.suffixIndex = {} # first dataset with a suffix, see getDatasetBySuffix
 
     if (experiment is not None):
       self.ptrExperiment = experiment
@@ -26,6 +33,10 @@ class DataContainer():
     return self.datasets[i]
 
   def getDatasetBySuffix(self, suffix):
+    i = self.suffixIndex.get(suffixKey(suffix))
+    if i is not None and self.datasets[i].suffix == suffix:
+      return self.datasets[i]
+    # the suffix of a dataset was changed after it was added
     for dataset in self.datasets:
       if (dataset.suffix == suffix):
         return dataset
@@ -36,6 +47,7 @@ class DataContainer():
     if suffix is None:
       suffix = f'{self.nDatasets}'
     newData.suffix = suffix
+    self.suffixIndex.setdefault(suffixKey(suffix), len(self.datasets))
     self.nDatasets += 1
     self.datasets.append(newData)
     self.dataWeights.append(weight)
@@ -44,6 +56,7 @@ class DataContainer():
     if suffix is None:
       suffix = f'{self.nDatasets}'
     dataset.suffix = suffix
+    self.suffixIndex.setdefault(suffixKey(suffix), len(self.datasets))
     self.nDatasets += 1
     self.datasets.append(dataset)
     self.dataWeights.append(weight)
@@ -1,13 +1,20 @@
 from abc import ABCMeta, abstractmethod
 import numpy as np
+import lmfit
+from ._residuum import DatasetResiduum
 class Experiment(metaclass=ABCMeta):
   """
   Abstract class to describe an experiment.
   A complete experiment consists of experimental data and/or a model of it
   """
+  residuumInFitRange = False # residuum only uses the points inside of fit_range
+
   def __init__(self):
     """Set plotWidgetClass here to change it before it's initialized in between
-    initialization of Experiment and connectGui
+    initialization of Experiment and connectGui. It is either a PlotWidget
+    class or the name of one of the widgets in modelexp.gui, which is only
+    resolved when the gui is built, so that experiments stay importable
+    without Qt.
     """
     self.plotWidgetClass = None
 
@@ -16,6 +23,9 @@ class Experiment(metaclass=ABCMeta):
 
     self.fit_range = None
     self.residuumFormula = self.chi2_residuum
+    self.residuumLayout = [] # DatasetResiduum of every modelset, see getResiduumLayout
+    self.residuumLayoutKey = (None, None, None, None, None)
+    self.residuumBuffer = None
 
   def connectGui(self, gui):
     self.ptrGui = gui
@@ -24,6 +34,10 @@ class Experiment(metaclass=ABCMeta):
 
   def connectData(self, data):
     self.data = data
+    self.residuumLayout = []
+    if hasattr(self, 'model'):
+      # the modelsets are recalculated for the new data
+      self.model.lastValues = None
 
   def connectModel(self, model):
     self.model = model
@@ -43,6 +57,99 @@ class Experiment(metaclass=ABCMeta):
       self.ax.axvline(fit_min, alpha=0.5, marker='None', color='black', zorder=0)
       self.ax.axvline(fit_max, alpha=0.5, marker='None', color='black', zorder=0)
 
+  def getEvaluationRange(self):
+    """Range of the domain the residuum depends on, the fits only calculate
+    the model there. None for the whole domain.
+    """
+    if self.residuumInFitRange:
+      return self.fit_range
+    return None
+
+  def getResiduumFormula(self):
+    """Residuum formula used by residuum, experiments with a fixed formula
+    override this
+    """
+    return self.residuumFormula
+
+  def getResiduumTerms(self, formula):
+    """How the residuum engine evaluates formula, see DatasetResiduum. None
+    if it is not one of the residuum formulas of Experiment.
+    """
+    function = getattr(formula, '__func__', None)
+    if function is Experiment.chi2_residuum:
+      return (False, True, False)
+    if function is Experiment.chi2_no_error_residuum:
+      return (False, False, False)
+    if function is Experiment.log_residuum:
+      return (True, True, True)
+    if function is Experiment.log_no_error_residuum:
+      return (True, False, False)
+    return None
+
+  def getResiduumLayout(self):
+    """DatasetResiduum of every modelset. They are prepared again if the
+    data, the weights, the fit range, the residuum formula or the precision
+    of the model changed.
+    """
+    formula = self.getResiduumFormula()
+    dtype = self.model.getDtype()
+    fit_range = self.getEvaluationRange()
+    fit_range = None if fit_range is None else tuple(fit_range)
+    datasets = self.data.datasets[:self.model.nModelsets]
+    weights = self.data.dataWeights[:self.model.nModelsets]
+    layout = self.residuumLayout
+    valid = (
+      len(layout) == self.model.nModelsets and
+      formula == self.residuumLayoutKey[0] and fit_range == self.residuumLayoutKey[1] and
+      datasets == self.residuumLayoutKey[2] and weights == self.residuumLayoutKey[3] and
+      dtype == self.residuumLayoutKey[4] and
+      all(term.matches(data) for data, term in zip(datasets, layout))
+    )
+    if not valid:
+      terms = self.getResiduumTerms(formula)
+      layout = [
+        DatasetResiduum(data, weight, fit_range, formula, terms, dtype)
+        for data, weight in zip(datasets, weights)
+      ]
+      self.residuumLayout = layout
+      self.residuumLayoutKey = (formula, fit_range, datasets, weights, dtype)
+      self.residuumBuffer = np.empty(sum(term.size for term in layout), dtype=dtype)
+    return layout
+
+  def calcResiduum(self):
+    """Residuum of the current model values. Every modelset fills its part of
+    a buffer that is kept between calls, modelsets that were not recalculated
+    by the last updateModel keep their part. A copy is returned, as the fits
+    keep the residua they get, its dtype is the precision of the model.
+    """
+    layout = self.getResiduumLayout()
+    updated = self.model.updatedModelsets
+    start = 0
+    for i, term in enumerate(layout):
+      end = start + term.size
+      if not term.filled or i >= len(updated) or updated[i]:
+        term.fill(self.model.getModelset(i).getValues(), self.residuumBuffer[start:end])
+        term.filled = True
+      start = end
+    return self.residuumBuffer.copy()
+
+  def residuum(self, p):
+    """Returns the distance between data and model for the parameters p, the
+    model is updated to p
+    """
+    self.model.params = p
+    fit = getattr(self, 'ptrFit', None)
+    if fit is not None:
+      fit.iteration += 1
+    self.model.updateModel()
+    resi = self.calcResiduum()
+
+    if fit is not None and fit.printIteration is not None:
+      if fit.iteration % fit.printIteration == 0:
+        print(f'Iteration: {fit.iteration}\tChi2:{np.sum(resi**2)}')
+        print(lmfit.fit_report(p))
+    return resi
+
   def chi2_residuum(self, x, I, sI, Imodel):
     return (I - Imodel) / sI
 
@@ -69,13 +176,6 @@ class Experiment(metaclass=ABCMeta):
   def setAxProps(self):
     pass
 
-  @abstractmethod
-  def residuum(self):
-    """Returns the distance between data and model. Should take the parameter
-    of the model as argument and update the model values
-    on call according to the given parameters
-    """
-
   @abstractmethod
   def adjustAxToAddedData(self):
     """Called when Data is added to the experiment for a GUI App,
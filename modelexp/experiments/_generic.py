@@ -10,15 +10,8 @@ class Generic(Experiment):
     self.ax.set_ylabel(r'$\mathit{y}$')
     self.ptrGui.plotWidget.draw_idle()# .tight_layout()
 
-  def residuum(self, p):
-    self.model.params = p
-    self.model.updateModel()
-    data0 = self.data.getDataset(0)
-    model0 = self.model.getModelset(0)
-    I_data0 = data0.getValues()
-    I_error0 = data0.getErrors()
-    I_model0 = model0.getValues()
-    return (I_data0 - I_model0) / I_error0
+  def getResiduumFormula(self):
+    return self.chi2_residuum
 
   def adjustAxToAddedData(self):
     data = self.data.getDataset(0)
@@ -1,12 +1,8 @@
 from ._generic import Generic
 import numpy as np
 class GenericXy(Generic):
-  def residuum(self, p):
-    self.model.params = p
-    self.model.updateModel()
-    I_data0 = self.data.getDataset(0).getValues()
-    I_model0 = self.model.getModelset(0).getValues()
-    return (I_data0 - I_model0)
+  def getResiduumFormula(self):
+    return self.chi2_no_error_residuum
 
   def saveModelDataToFile(self, f):
     if hasattr(self, 'data') and hasattr(self, 'model'):
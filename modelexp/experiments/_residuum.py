@@ -0,0 +1,71 @@
+import numpy as np
+
+class DatasetResiduum():
+  '''
+  The part of the residuum of one dataset that does not depend on the model,
+  prepared once for the residuum engine of Experiment: the indices of the
+  points inside of the fit range, the data the model values are compared to
+  and the factor every difference is multiplied with.
+
+  terms are (logarithmic, divide by the errors, multiply by the data) for
+  the residuum formulas of Experiment, None for any other formula, which is
+  then called on the points inside of the fit range. The residuum is
+  calculated in dtype, the precision of the model.
+  '''
+  def __init__(self, data, weight, fit_range, formula, terms, dtype=np.float64):
+    self.domain = data.getDomain()
+    self.values = data.getValues()
+    self.weight = weight
+    self.formula = formula
+    self.filled = False # whether the residuum buffer holds this residuum
+
+    if fit_range is None:
+      self.index = None
+    else:
+      self.index = np.flatnonzero((self.domain > fit_range[0]) & (self.domain < fit_range[1]))
+    x = self.select(self.domain)
+    I = self.select(self.values)
+    self.size = len(I)
+
+    self.terms = terms
+    if terms is None:
+      self.x = x
+      self.I = I
+      self.sI = self.select(data.getErrors())
+      return
+    logarithmic, divideByErrors, multiplyByData = terms
+    target = np.log(I) if logarithmic else I
+    self.target = np.asarray(target, dtype=dtype)
+    scale = np.sqrt(weight)
+    if divideByErrors:
+      scale = scale / self.select(data.getErrors())
+    if multiplyByData:
+      scale = scale * I
+    self.scale = np.asarray(scale, dtype=dtype)
+
+  def select(self, array):
+    if array is None or self.index is None:
+      return array
+    return array[self.index]
+
+  def matches(self, data):
+    '''
+    Whether data still holds the arrays this residuum was prepared for
+    '''
+    return data.getDomain() is self.domain and data.getValues() is self.values
+
+  def fill(self, Imodel, out):
+    '''
+    Write the residuum for the model values Imodel into out
+    '''
+    if self.terms is None:
+      out[:] = np.sqrt(self.weight) * self.formula(self.x, self.I, self.sI, self.select(Imodel))
+      return
+    if self.index is None:
+      np.copyto(out, Imodel)
+    else:
+      np.take(Imodel, self.index, out=out)
+    if self.terms[0]:
+      np.log(out, out=out)
+    np.subtract(self.target, out, out=out)
+    out *= self.scale
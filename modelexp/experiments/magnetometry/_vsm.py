@@ -2,6 +2,9 @@ from .._experiment import Experiment
 import numpy as np
 
 class Vsm(Experiment):
+  # the residuum of Experiment, it applies the dataset weights, which the
+  # own residuum of Vsm ignored unlike all other experiments
+  residuumInFitRange = True
 
   def connectGui(self, gui):
     self.ptrGui = gui
@@ -15,26 +18,6 @@ class Vsm(Experiment):
 
     self.ptrGui.plotWidget.draw_idle()# .tight_layout()
 
-  def residuum(self, p):
-    self.model.params = p
-    self.model.updateModel()
-    resi = []
-    for i in range(self.model.nModelsets):
-      data = self.data.getDataset(i)
-      model = self.model.getModelset(i)
-      B_data = data.getDomain()
-      M_data = data.getValues()
-      M_error = data.getErrors()
-      M_model = model.getValues()
-      if self.fit_range is not None:
-        fit_range = np.logical_and(B_data > self.fit_range[0], B_data < self.fit_range[1])
-        M_data = M_data[fit_range]
-        M_error = M_error[fit_range]
-        M_model = M_model[fit_range]
-      addResi = self.residuumFormula(None, M_data, M_error, M_model)
-      resi = np.concatenate([resi, addResi])
-    return resi
-
   def getMinMaxDomainData(self):
     minB = np.inf
     maxB = -np.inf
@@ -1,8 +1,9 @@
 from ._sas import Sas
 import numpy as np
-import lmfit
 
 class SanspolCrossterm(Sas):
+  residuumInFitRange = False
+
   def __init__(self):
     super().__init__()
 
@@ -32,24 +33,5 @@ class SanspolCrossterm(Sas):
 
     self.ptrGui.plotWidget.draw_idle()
 
-  def residuum(self, p):
-    self.model.params = p
-
-    self.ptrFit.iteration += 1
-    self.model.updateModel()
-    resi = []
-    for i in range(self.model.nModelsets):
-      data = self.data.getDataset(i)
-      weight = self.data.dataWeights[i]
-      model = self.model.getModelset(i)
-
-      I_data = data.getValues()
-      I_error = data.getErrors()
-      I_model = model.getValues()
-      addResi = np.sqrt(weight) * (I_data - I_model) / I_error
-      resi = np.concatenate([resi, addResi])
-    if self.ptrFit.printIteration is not None:
-      if self.ptrFit.iteration % self.ptrFit.printIteration == 0:
-        print(f'Iteration: {self.ptrFit.iteration}\tChi2:{np.sum(resi**2)}')
-        print(lmfit.fit_report(p))
-    return resi
+  def getResiduumFormula(self):
+    return self.chi2_residuum
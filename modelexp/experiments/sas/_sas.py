@@ -1,12 +1,13 @@
 from .._experiment import Experiment
 import numpy as np
-from ...gui.plotWidgetInset import PlotWidgetInset
-import pkg_resources, datetime
-import lmfit
+import datetime
+from ..._version import getVersion
 class Sas(Experiment):
+  residuumInFitRange = True
+
   def __init__(self):
     super().__init__()
-    self.plotWidgetClass = PlotWidgetInset
+    self.plotWidgetClass = 'PlotWidgetInset'
     self.residuumFormula = self.log_residuum
 
   def connectGui(self, gui):
@@ -26,34 +27,7 @@ class Sas(Experiment):
     self.ptrGui.plotWidget.draw_idle()# .tight_layout()
 
   def residuum(self, p):
-    self.model.params = p
-
-    self.ptrFit.iteration += 1
-    self.model.updateModel()
-
-    resi = []
-    for i in range(self.model.nModelsets):
-      data = self.data.getDataset(i)
-      weight = self.data.dataWeights[i]
-      model = self.model.getModelset(i)
-
-      q_data = data.getDomain()
-      I_data = data.getValues()
-      I_error = data.getErrors()
-      I_model = model.getValues()
-      if self.fit_range is not None:
-        fit_range = np.logical_and(q_data > self.fit_range[0], q_data < self.fit_range[1])
-        I_data = I_data[fit_range]
-        I_error = I_error[fit_range]
-        I_model = I_model[fit_range]
-      addResi = np.sqrt(weight) * self.residuumFormula(None, I_data, I_error, I_model)
-      resi = np.concatenate([resi, addResi])
-
-    if self.ptrFit.printIteration is not None:
-      if self.ptrFit.iteration % self.ptrFit.printIteration == 0:
-        print(f'Iteration: {self.ptrFit.iteration}\tChi2:{np.sum(resi**2)}')
-        print(lmfit.fit_report(p))
-
+    resi = super().residuum(p)
     if self.ptrFit.save_intermediate_results_every is not None:
       if self.ptrFit.save_intermediate_results_every % self.ptrFit.printIteration == 0:
         self.ptrFit.exportIntermediateResult('intermediateResult.dat', p)
@@ -146,7 +120,7 @@ class Sas(Experiment):
       with open('fit_sld.dat', 'w') as sldFile:
         sldFile.write(
           '#File generated by ModelExp v' +
-          pkg_resources.require('modelexp')[0].version + '\n'
+          getVersion() + '\n'
         )
         sldFile.write(f'#Generated at {datetime.datetime.now()}\n')
         if self.fit_range is not None:
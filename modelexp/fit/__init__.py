@@ -1,2 +1,4 @@
 from ._fit import Fit
-from .levenberg_marquardt import LevenbergMarquardt
\ No newline at end of file
+from .levenberg_marquardt import LevenbergMarquardt
+from .variable_projection import VariableProjection
+from .multi_fidelity import MultiFidelity
@@ -1,4 +1,6 @@
 from abc import ABCMeta, abstractmethod
+import lmfit
+import numpy as np
 from ..experiments import Experiment
 from ..data import Data
 from ..models import Model
@@ -21,6 +23,7 @@ class Fit(metaclass=ABCMeta):
     self.iteration = 0
 
     self.fit_result = None
+    self.promotePrecision = True # finish a single precision fit in double precision
     self.fit_param_history = []
     self.fit_history_idx = 0
 
@@ -28,6 +31,38 @@ class Fit(metaclass=ABCMeta):
   def connectGui(self, gui):
     self.ptrGui = gui
 
+  def leastsqOptions(self):
+    '''
+    Options of lmfit.minimize for the precision of the model
+    '''
+    if self.ptrModel.precision == 'single':
+      # finite difference steps have to be well above the float32 rounding
+      return {'method': 'leastsq', 'epsfcn': float(np.finfo(np.float32).eps)}
+    return {'method': 'leastsq'}
+
+  def promotedPrecision(self):
+    '''
+    Context in which the last run of a fit is done, double precision if
+    promotePrecision is set
+    '''
+    precision = 'double' if self.promotePrecision else self.ptrModel.precision
+    return self.ptrModel.evaluationPrecision(precision)
+
+  def minimize(self, residuum, params):
+    '''
+    Levenberg-Marquardt fit of residuum starting from params. In single
+    precision the result is polished in double precision if
+    promotePrecision is set, so the final steps and the covariance are not
+    limited by float32. The precision of the last run is stored in the
+    precision attribute of the result.
+    '''
+    if self.ptrModel.precision == 'single' and self.promotePrecision:
+      params = lmfit.minimize(residuum, params, **self.leastsqOptions()).params
+    with self.promotedPrecision():
+      result = lmfit.minimize(residuum, params, **self.leastsqOptions())
+      result.precision = self.ptrModel.precision
+    return result
+
   @abstractmethod
   def fit(self):
     """Calls the fit function to find the minimal parameters of the Model that
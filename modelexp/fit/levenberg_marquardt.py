@@ -1,5 +1,6 @@
 from ._fit import Fit
-import lmfit, datetime, pkg_resources
+import lmfit, datetime
+from .._version import getVersion
 
 class LevenbergMarquardt(Fit):
   def fit(self):
@@ -9,14 +10,15 @@ class LevenbergMarquardt(Fit):
       self.fit_param_history.pop(0)
 
     self.startedFit = datetime.datetime.now()
-    self.fit_result = lmfit.minimize(
-      self.ptrExperiment.residuum, self.ptrModel.params, method='leastsq'
-    )
+    evaluationRange = self.ptrExperiment.getEvaluationRange()
+    with self.ptrModel.exactEvaluation(), self.ptrModel.evaluationWindow(evaluationRange):
+      self.fit_result = self.minimize(self.ptrExperiment.residuum, self.ptrModel.params)
     self.endFit = datetime.datetime.now()
     print(lmfit.fit_report(self.fit_result))
 
-    # Update the parameters of model
+    # Update the parameters of model, on its whole domain
     self.ptrModel.params = self.fit_result.params
+    self.ptrModel.updateModel()
 
     # add new params
     self.fit_param_history.append(self.fit_result.params)
@@ -29,7 +31,7 @@ class LevenbergMarquardt(Fit):
     with open(filename, 'w') as f:
       f.write(
         '#File generated by ModelExp v' +
-        pkg_resources.require('modelexp')[0].version + '\n'
+        getVersion() + '\n'
       )
 
       for i in range(self.ptrData.nDatasets):
@@ -37,6 +39,7 @@ class LevenbergMarquardt(Fit):
       if (self.fit_result is not None):
         f.write('#Started Fit at ' + str(self.startedFit) + '\n')
         f.write('#Finished Fit at ' + str(self.endFit) + '\n')
+        f.write('#Precision ' + getattr(self.fit_result, 'precision', 'double') + '\n')
         f.write('#'+lmfit.fit_report(self.fit_result).replace('\n','\n#')+'\n')
 
       self.ptrExperiment.saveModelDataToFile(f)
@@ -45,7 +48,7 @@ class LevenbergMarquardt(Fit):
     with open(filename, 'w') as f:
       f.write(
         '#File generated by ModelExp v' +
-        pkg_resources.require('modelexp')[0].version + '\n'
+        getVersion() + '\n'
       )
 
       for i in range(self.ptrData.nDatasets):
@@ -53,4 +56,7 @@ class LevenbergMarquardt(Fit):
       f.write('#Started Fit at ' + str(self.startedFit) + '\n')
       f.write('#Iteration ' + str(self.iteration) + '\n')
       f.write('#'+lmfit.fit_report(p).replace('\n','\n#')+'\n')
-      self.ptrExperiment.saveModelDataToFile(f)
+      # the model is only calculated in the fit range during the fit
+      with self.ptrModel.evaluationWindow(None):
+        self.ptrModel.updateModel()
+        self.ptrExperiment.saveModelDataToFile(f)
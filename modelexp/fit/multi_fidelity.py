@@ -0,0 +1,76 @@
+from .levenberg_marquardt import LevenbergMarquardt
+import lmfit
+import numpy as np
+
+class MultiFidelity(LevenbergMarquardt):
+  '''
+  Levenberg-Marquardt fit that runs its early iterations with reduced
+  quadrature orders. The parameters in fidelityParameters, orderHermite of
+  the size distributions and orderLegendre of the orientation averages,
+  are scaled by the fractions in stages, each stage is fitted to
+  convergence with the tolerance of its stage and starts from the result
+  of the one before. The last run uses the orders set by the user, it
+  usually only needs a few iterations from there.
+
+  Orders of 0 are adaptive (see modelexp.kernels.gauss) and are not
+  reduced.
+  '''
+  def __init__(self, experiment, data, model):
+    super().__init__(experiment, data, model)
+    self.fidelityParameters = ['orderHermite', 'orderLegendre']
+    self.stages = (0.25, 0.5) # fractions of the orders before the full accuracy
+    self.stageTolerances = (1e-4, 1e-6) # ftol and xtol of leastsq in every stage
+    self.minOrder = 4
+    self.stageResults = []
+
+  def getFidelityParameters(self, params):
+    return [
+      name for name in params
+      if (name in self.fidelityParameters or name.rsplit('_', 1)[0] in self.fidelityParameters)
+      and params[name].value > 0
+    ]
+
+  def reducedParams(self, params, names, fraction):
+    '''
+    Copy of params with the orders names scaled by fraction, at least
+    minOrder and at most the full order
+    '''
+    reduced = params.copy()
+    for name in names:
+      order = params[name].value
+      reduced[name].vary = False
+      reduced[name].value = min(order, max(self.minOrder, int(round(order * fraction))))
+    return reduced
+
+  def minimize(self, residuum, params):
+    '''
+    Fit residuum through the stages, the last one at the full orders is
+    done by Fit.minimize and returned. The result of every stage is kept
+    in stageResults with the fraction of the orders as fidelity attribute.
+    A stage that changes no parameter by more than its tolerance ends the
+    reduced stages early.
+    '''
+    params = params.copy()
+    self.stageResults = []
+    names = self.getFidelityParameters(params)
+    free = [name for name in params if params[name].vary and not params[name].expr and not name in names]
+    for fraction, tolerance in zip(self.stages, self.stageTolerances):
+      if len(names) == 0:
+        break
+      stage = self.reducedParams(params, names, fraction)
+      result = lmfit.minimize(residuum, stage, ftol=tolerance, xtol=tolerance, **self.leastsqOptions())
+      result.fidelity = fraction
+      self.stageResults.append(result)
+      start = np.array([params[name].value for name in free])
+      for name in free:
+        params[name].value = result.params[name].value
+      end = np.array([params[name].value for name in free])
+      print(
+        f'MultiFidelity: stage with {fraction:g} of the orders, '
+        f'{result.nfev} evaluations, reduced chi-square {result.redchi:.6g}'
+      )
+      if np.all(np.abs(end - start) <= tolerance * np.maximum(np.abs(end), 1e-300)):
+        break
+    result = super().minimize(residuum, params)
+    result.fidelity = 1.
+    return result
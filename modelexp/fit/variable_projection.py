@@ -0,0 +1,274 @@
+from .levenberg_marquardt import LevenbergMarquardt
+import lmfit, datetime
+import numpy as np
+from scipy.optimize import least_squares
+
+class VariableProjection(LevenbergMarquardt):
+  '''
+  Levenberg-Marquardt fit with variable projection.
+  The parameters the model depends on linearly (i0 and bg of the SAXS
+  models, see Model.linearParameters) are removed from the outer fit, the
+  model is an affine function offset + sum_k c_k column_k of them. For
+  every set of nonlinear parameters the linear parameters are solved on
+  the residuum of the experiment, that inner solve does not evaluate the
+  model again. The outer Jacobian only has columns for the nonlinear
+  parameters.
+
+  At the start of the fit the columns are also probed with the nonlinear
+  parameters moved. Columns that do not move, e.g. the 1 of bg or the B of
+  chi, are kept for the whole fit, so a residual of an i0/bg model costs a
+  single evaluation of the model, the one that gives the column F of i0.
+  The probes run through updateModel, i.e. only inside of the evaluation
+  window of the fit, with the evaluation caches and the executor of the
+  container, which is created once per fit if executor is set.
+
+  A final Levenberg-Marquardt run over all parameters starts from the
+  solution, it usually stops after one Jacobian and provides the
+  covariances of all parameters for the report.
+  '''
+  def __init__(self, experiment, data, model):
+    super().__init__(experiment, data, model)
+    self.linearParameters = None # None takes them from the model class
+    self.polish = True
+    self.executor = 'thread' # executor of the container during the fit, see ModelContainer.setExecutor
+    self.workers = None
+    self.nProbes = 0
+    self.nudge = 1e-2 # relative change of the nonlinear parameters that finds the fixed columns
+
+  def setLinearParameters(self, names):
+    '''
+    Set the names of the parameters that are solved linearly instead of
+    the ones declared by the model class
+    '''
+    for name in names:
+      assert name in self.ptrModel.params, 'Unknown parameter: ' + name
+    self.linearParameters = list(names)
+
+  def getLinearCandidates(self, params):
+    if self.linearParameters is not None:
+      candidates = self.linearParameters
+    else:
+      declared = self.ptrModel.modelClass.linearParameters
+      candidates = [
+        name for name in params
+        if name in declared or name.rsplit('_', 1)[0] in declared
+      ]
+    return [name for name in candidates if params[name].vary and not params[name].expr]
+
+  def probeRows(self, steps, columns=None):
+    '''
+    Values of the linear parameters that probe the offset (all 0) and the
+    columns, one row each
+    '''
+    columns = range(len(steps)) if columns is None else columns
+    rows = np.zeros((len(columns) + 1, len(steps)))
+    for k, column in enumerate(columns):
+      rows[k+1, column] = steps[column]
+    return rows
+
+  def evaluate(self, params, names, rows):
+    '''
+    Values of all modelsets for params with the parameters names set to
+    every row, calculated by updateModel. The probes are written to a copy
+    without bounds for names, lmfit would clip them.
+    '''
+    self.nProbes += len(rows)
+    model = self.ptrModel
+    probe = self.probeParams
+    for name in probe:
+      if params is not probe and not probe[name].expr:
+        probe[name].value = params[name].value
+    values = []
+    for row in rows:
+      for name, value in zip(names, row):
+        probe[name].value = value
+      model.params = probe
+      model.updateModel()
+      values.append(np.concatenate([
+        np.asarray(model.getModelset(i).getValues()) for i in range(model.nModelsets)
+      ]))
+    return np.array(values)
+
+  def checkLinearity(self, params, names, steps):
+    '''
+    Keep the candidates the model is jointly affine in at the start values,
+    a candidate that conflicts with an earlier one is fitted nonlinearly.
+    The points outside of the evaluation window are nan and not compared.
+    '''
+    n = len(names)
+    rows = [self.probeRows(steps), 2 * self.probeRows(steps)[1:]]
+    pairs = [(j, k) for j in range(n) for k in range(j+1, n)]
+    for j, k in pairs:
+      row = np.zeros((1, n))
+      row[0, j] = steps[j]
+      row[0, k] = steps[k]
+      rows.append(row)
+    values = self.evaluate(params, names, np.concatenate(rows))
+    window = np.isfinite(values[0])
+    values = values[:, window]
+
+    offset = values[0]
+    singles = values[1:n+1]
+    doubles = values[n+1:2*n+1]
+    atol = 1e-10 * np.max(np.abs(values[np.isfinite(values)]), initial=1)
+
+    def close(a, b):
+      return np.all(np.isfinite(a)) and np.allclose(a, b, rtol=1e-6, atol=atol)
+
+    linear = [close(doubles[k], 2*singles[k] - offset) for k in range(n)]
+    for m, (j, k) in enumerate(pairs):
+      pair = values[2*n+1+m]
+      if linear[j] and linear[k] and not close(pair, singles[j] + singles[k] - offset):
+        linear[k] = False
+    for name, isLinear in zip(names, linear):
+      if not isLinear:
+        print(f'VariableProjection: {name} is not linear, it is fitted nonlinearly')
+    return [k for k in range(n) if linear[k]]
+
+  def columns(self, values, steps):
+    '''
+    Offset and columns from the values of probeRows
+    '''
+    offset = values[0]
+    return offset, (values[1:] - offset) / steps[:, np.newaxis]
+
+  def findFixedColumns(self, params):
+    '''
+    Probe the offset and the columns at the start values and with all
+    nonlinear parameters moved by nudge. The ones that are the same do
+    not depend on the nonlinear parameters and are not probed again.
+    '''
+    steps = self.linearSteps
+    probes = self.probeRows(steps)
+    offset, basis = self.columns(self.evaluate(params, self.linearNames, probes), steps)
+    moved = params.copy()
+    for name in moved:
+      parameter = moved[name]
+      if parameter.vary and not parameter.expr and not name in self.linearNames and parameter.value != 0:
+        value = parameter.value * (1 + self.nudge)
+        if not parameter.min <= value <= parameter.max:
+          value = parameter.value * (1 - self.nudge)
+        parameter.value = value
+    movedOffset, movedBasis = self.columns(self.evaluate(moved, self.linearNames, probes), steps)
+
+    def same(a, b):
+      scale = np.max(np.abs(a[np.isfinite(a)]), initial=0)
+      return bool(np.allclose(a, b, rtol=1e-9, atol=1e-12*scale, equal_nan=True))
+
+    self.fixedOffset = offset if same(offset, movedOffset) else None
+    self.fixedColumns = [
+      basis[k] if same(basis[k], movedBasis[k]) else None
+      for k in range(len(self.linearNames))
+    ]
+    self.probedColumns = [k for k, column in enumerate(self.fixedColumns) if column is None]
+
+  def splitValues(self, values):
+    return np.split(values, np.cumsum(self.ptrModel.getDomainSizes())[:-1])
+
+  def linearResiduum(self, c, params, offset, basis):
+    for name, value in zip(self.linearNames, c):
+      params[name].value = value
+    values = offset + c @ basis
+    with self.ptrModel.valuesPreset(self.splitValues(values)):
+      return self.ptrExperiment.residuum(params)
+
+  def projectedResiduum(self, params):
+    '''
+    Residuum for the nonlinear parameters in params with the linear
+    parameters solved, these are written to params as well. Only the
+    offset and the columns that depend on the nonlinear parameters are
+    probed.
+    '''
+    steps = self.linearSteps
+    probes = self.probeRows(steps, self.probedColumns)
+    if self.fixedOffset is not None:
+      probes = probes[1:]
+    values = list(self.evaluate(params, self.linearNames, probes)) if len(probes) > 0 else []
+    offset = self.fixedOffset if self.fixedOffset is not None else values.pop(0)
+    basis = np.empty((len(self.linearNames), len(offset)), dtype=offset.dtype)
+    for k, column in enumerate(self.fixedColumns):
+      basis[k] = column if column is not None else (values.pop(0) - offset) / steps[k]
+
+    lower = np.array([params[name].min for name in self.linearNames], dtype=float)
+    upper = np.array([params[name].max for name in self.linearNames], dtype=float)
+    start = np.clip(self.linearValues, lower, upper)
+    iteration = self.iteration
+    try:
+      solution = least_squares(
+        self.linearResiduum, start, bounds=(lower, upper), x_scale='jac',
+        args=(params, offset, basis)
+      )
+      self.linearValues = solution.x
+    except ValueError:
+      # residuum not finite at the start, e.g. log of a negative intensity
+      self.linearValues = start
+    self.iteration = iteration
+    return self.linearResiduum(self.linearValues, params, offset, basis)
+
+  def fit(self):
+    params = self.ptrModel.params
+    candidates = self.getLinearCandidates(params)
+    if len(candidates) == 0:
+      return super().fit()
+
+    # add params before starting to fit
+    self.fit_param_history.append(params)
+    if len(self.fit_param_history) > 50:
+      self.fit_param_history.pop(0)
+
+    model = self.ptrModel
+    ownsExecutor = self.executor is not None and model.executor is None
+    if ownsExecutor:
+      model.setExecutor(self.executor, self.workers)
+    self.nProbes = 0
+    self.startedFit = datetime.datetime.now()
+    evaluationRange = self.ptrExperiment.getEvaluationRange()
+    try:
+      with model.exactEvaluation(), model.evaluationWindow(evaluationRange):
+        self.probeParams = params.copy()
+        for name in candidates:
+          self.probeParams[name].min = -np.inf
+          self.probeParams[name].max = np.inf
+        probe = self.probeParams
+        values = np.array([params[name].value for name in candidates], dtype=float)
+        steps = np.where(values != 0, np.abs(values), 1.)
+        accepted = self.checkLinearity(probe, candidates, steps)
+        self.linearNames = [candidates[k] for k in accepted]
+        self.linearValues = values[accepted]
+        self.linearSteps = steps[accepted]
+        self.findFixedColumns(probe)
+
+        outer = params.copy()
+        for name in self.linearNames:
+          outer[name].vary = False
+        self.projection_result = lmfit.minimize(self.projectedResiduum, outer, **self.leastsqOptions())
+        self.projection_result.precision = model.precision
+        result = self.projection_result.params
+        # solve the linear parameters for the best nonlinear ones
+        self.projectedResiduum(result)
+        for name in self.linearNames:
+          result[name].vary = True
+        if self.polish:
+          with self.promotedPrecision():
+            self.fit_result = lmfit.minimize(self.ptrExperiment.residuum, result, **self.leastsqOptions())
+            self.fit_result.precision = model.precision
+        else:
+          self.fit_result = self.projection_result
+    finally:
+      if ownsExecutor:
+        model.shutdownExecutor()
+    self.endFit = datetime.datetime.now()
+    print(f'Variable projection: solved {", ".join(self.linearNames)} linearly, '
+      f'{self.projection_result.nfev} projected evaluations with {self.nProbes} model evaluations')
+    print(lmfit.fit_report(self.fit_result))
+
+    # Update the parameters of model
+    self.ptrModel.params = self.fit_result.params
+    self.ptrModel.updateModel()
+
+    # add new params
+    self.fit_param_history.append(self.fit_result.params)
+    if len(self.fit_param_history) > 50:
+      self.fit_param_history.pop(0)
+    self.fit_history_idx = len(self.fit_param_history)-1
+    return self.fit_result
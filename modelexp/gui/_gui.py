@@ -7,12 +7,19 @@ import warnings
 import numpy as np
 import screeninfo
 from .plotWidget import PlotWidget
+from .plotWidgetInset import PlotWidgetInset
 
 from ..fit import Fit
 from ..experiments import Experiment
 from ..models import ModelContainer
 from ..data import DataContainer
 
+# plot widgets that experiments can refer to by name, without importing Qt
+plotWidgets = {
+  'PlotWidget': PlotWidget,
+  'PlotWidgetInset': PlotWidgetInset
+}
+
 # remove some annoying deprecation warnings
 warnings.filterwarnings("ignore", category=UserWarning, module='matplotlib')
 
@@ -67,7 +74,10 @@ class Gui(qt5w.QMainWindow):
 
   def initPlot(self, plotWidget=None):
     # initialize plotWidget (after experiment is set)
-    # either passed by argument or the default
+    # either passed by argument (as class or by name) or the default
+    if isinstance(plotWidget, str):
+      assert plotWidget in plotWidgets, 'Unknown plot widget: ' + plotWidget
+      plotWidget = plotWidgets[plotWidget]
     self.plotWidget = plotWidget(self) if plotWidget else PlotWidget(self)
 
     self.layoutPlot = qt5w.QVBoxLayout(self.plotContainer)
@@ -200,7 +210,8 @@ class Gui(qt5w.QMainWindow):
       prec = '{:.3f}'
     changedSlider.label.setText(prec.format(newValue))
     currentParameter.value = newValue
-    self.ptrModel.updateModel()
+    with self.ptrModel.evaluationPrecision(self.ptrModel.previewPrecision):
+      self.ptrModel.updateModel()
     self.ptrModel.plotModel()
     self.update()
 
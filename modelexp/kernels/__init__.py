@@ -0,0 +1,2 @@
+from ._backends import BackendRegistry, Kernel, registry
+from ._quadrature import AdaptiveOrders, adaptive, gauss, hermite, legendre
@@ -0,0 +1,286 @@
+import importlib, json, os, platform, threading, time, warnings
+import numpy as np
+
+extensions = {'sas': 'fortSAS', 'refl': 'fortRefl', 'mag': 'fortMag'}
+preference = ('fortran', 'numba', 'numpy') # order of the backends when they are equally fast
+
+def sizeBucket(args):
+  '''
+  Length of the first argument rounded up to a power of two, 0 if it is not
+  an array. The backend is chosen per bucket, as the fastest one depends on
+  the length of q.
+  '''
+  shape = getattr(args[0], 'shape', ()) if len(args) > 0 else ()
+  if len(shape) == 0:
+    return 0
+  return 1 << max(int(shape[0]) - 1, 0).bit_length()
+
+def defaultCachePath():
+  if 'MODELEXP_KERNEL_CACHE' in os.environ:
+    return os.environ['MODELEXP_KERNEL_CACHE']
+  cache = os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache'))
+  return os.path.join(cache, 'modelexp', 'kernels.json')
+
+def machineKey():
+  '''
+  Key of this machine in the cache file, which may be shared by the
+  machines of a cluster through the home directory
+  '''
+  return f'{platform.node()}-{platform.machine()}-py{platform.python_version()}-numpy{np.__version__}'
+
+class Kernel():
+  '''
+  Kernel function, e.g. 'sas.sphere_cs.formfactor', that is served by the
+  fastest of its available backends. On the first call for a length of q
+  every backend is run a few times on the actual arguments, results that
+  do not agree with the preferred backend are not taken.
+
+  A kernel can be called with out, an array the result is written into.
+  Backends that cannot write into it, e.g. the compiled extensions, have
+  their result copied, the ones with acceptsOut get out themselves.
+  '''
+  def __init__(self, registry, name):
+    self.registry = registry
+    self.name = name
+    self.chosen = {} # size bucket -> function
+
+  def __call__(self, *args, out=None, **kwargs):
+    bucket = sizeBucket(args)
+    function = self.chosen.get(bucket)
+    if function is None:
+      function = self.registry.choose(self, bucket, args, kwargs)
+    if out is None:
+      return function(*args, **kwargs)
+    if getattr(function, 'acceptsOut', False):
+      return function(*args, out=out, **kwargs)
+    out[...] = function(*args, **kwargs)
+    return out
+
+  def __repr__(self):
+    return f'<Kernel {self.name}: {", ".join(self.registry.listBackends(self.name))}>'
+
+class KernelNamespace():
+  '''
+  Kernel module of an extension, e.g. sphere_cs of fortSAS. Attributes
+  are the kernels of the module.
+  '''
+  def __init__(self, registry, name):
+    self.registry = registry
+    self.name = name
+
+  def __getattr__(self, attribute):
+    if attribute.startswith('__'):
+      raise AttributeError(attribute)
+    kernel = self.registry.getKernel(self.name + '.' + attribute)
+    setattr(self, attribute, kernel)
+    return kernel
+
+class BackendRegistry():
+  '''
+  Implementations of the kernels of the compiled extensions fortSAS,
+  fortRefl and fortMag. Every kernel has the 'fortran' backend, that is
+  available if the extension can be imported. NumPy and Numba
+  implementations are added with register. The choice of the backend for
+  every kernel and length of q is stored in a JSON file per machine, so
+  that the benchmark only runs once.
+  '''
+  def __init__(self, cachePath=None):
+    self.implementations = {} # kernel name -> {backend: function or loader}
+    self.kernels = {}
+    self.namespaces = {}
+    self.pinned = {} # kernel name or None for all -> backend, see setBackend
+    self.cachePath = defaultCachePath() if cachePath is None else cachePath
+    self.choices = None # loaded from cachePath on the first choice
+    self.repeat = 3
+    self.rtol = 1e-6
+    self.lock = threading.RLock()
+    backend = os.environ.get('MODELEXP_KERNEL_BACKEND')
+    if backend:
+      self.pinned[None] = backend
+
+  def namespace(self, name):
+    '''
+    KernelNamespace of name, e.g. 'sas.sphere_cs'
+    '''
+    if not name in self.namespaces:
+      self.namespaces[name] = KernelNamespace(self, name)
+    return self.namespaces[name]
+
+  def getKernel(self, name):
+    if not name in self.kernels:
+      self.kernels[name] = Kernel(self, name)
+    return self.kernels[name]
+
+  def register(self, name, backend, function=None, loader=None):
+    '''
+    Add an implementation of the kernel name, e.g.
+    'sas.sphere_cs.formfactor'. Either the function itself or a loader
+    that returns it is given, a loader that raises ImportError marks the
+    backend as not available, e.g. without numba. Can be used as decorator.
+    '''
+    if function is None and loader is None:
+      return lambda function: self.register(name, backend, function) or function
+    with self.lock:
+      self.implementations.setdefault(name, {})[backend] = (function, loader)
+      self.reset(name)
+
+  def setBackend(self, backend, name=None):
+    '''
+    Use backend for the kernel name, or for all kernels that have it if
+    name is None. None as backend chooses the fastest again.
+    '''
+    with self.lock:
+      if backend is None:
+        self.pinned.pop(name, None)
+      else:
+        self.pinned[name] = backend
+      self.reset(name)
+
+  def reset(self, name=None):
+    kernels = self.kernels.values() if name is None else [self.kernels[name]] if name in self.kernels else []
+    for kernel in kernels:
+      kernel.chosen = {}
+
+  def loadFortran(self, name):
+    namespace, module, function = name.split('.')
+    extension = importlib.import_module(extensions[namespace])
+    return getattr(getattr(extension, module), function)
+
+  def getImplementations(self, name):
+    '''
+    Available implementations of the kernel name as {backend: function}
+    '''
+    entries = {'fortran': (None, lambda: self.loadFortran(name))}
+    entries.update(self.implementations.get(name, {}))
+    available = {}
+    for backend, (function, loader) in entries.items():
+      if function is None:
+        try:
+          function = loader()
+        except (ImportError, AttributeError):
+          continue
+        # loaded once, an unavailable backend stays a failed loader
+        if backend != 'fortran':
+          self.implementations[name][backend] = (function, None)
+      available[backend] = function
+    return available
+
+  def listBackends(self, name):
+    return sorted(self.getImplementations(name), key=self.rank)
+
+  def rank(self, backend):
+    return preference.index(backend) if backend in preference else len(preference)
+
+  def choose(self, kernel, bucket, args, kwargs):
+    '''
+    Function that serves kernel for arguments of the size bucket
+    '''
+    with self.lock:
+      if bucket in kernel.chosen:
+        return kernel.chosen[bucket]
+      available = self.getImplementations(kernel.name)
+      assert len(available) > 0, (
+        f'No backend available for the kernel {kernel.name}, '
+        f'neither {extensions[kernel.name.split(".")[0]]} nor an implementation in NumPy or Numba'
+      )
+      backend = self.pinned.get(kernel.name, self.pinned.get(None))
+      if not backend in available and len(available) == 1:
+        backend, = available
+      if not backend in available:
+        backend = self.cachedChoice(kernel.name, bucket)
+      if not backend in available:
+        backend = self.benchmark(kernel.name, available, args, kwargs)
+        self.storeChoice(kernel.name, bucket, backend)
+      kernel.chosen[bucket] = available[backend]
+      return kernel.chosen[bucket]
+
+  def benchmark(self, name, available, args, kwargs):
+    '''
+    Fastest backend for the arguments, every backend is called once to
+    compile and check it and then timed repeat times
+    '''
+    backends = sorted(available, key=self.rank)
+    reference = None
+    times = {}
+    for backend in backends:
+      function = available[backend]
+      try:
+        result = function(*args, **kwargs)
+      except Exception as error:
+        warnings.warn(f'Backend {backend} of {name} failed: {error!r}')
+        continue
+      if reference is None:
+        reference = result
+      elif not agrees(result, reference, self.rtol):
+        warnings.warn(f'Backend {backend} of {name} does not agree with {backends[0]}, it is not used')
+        continue
+      best = np.inf
+      for _ in range(self.repeat):
+        start = time.perf_counter()
+        function(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+      times[backend] = best
+    assert len(times) > 0, f'All backends of the kernel {name} failed'
+    return min(times, key=lambda backend: (times[backend], self.rank(backend)))
+
+  def cachedChoice(self, name, bucket):
+    if self.choices is None:
+      self.choices = self.readCache()
+    return self.choices.get(name, {}).get(str(bucket))
+
+  def storeChoice(self, name, bucket, backend):
+    if self.choices is None:
+      self.choices = self.readCache()
+    self.choices.setdefault(name, {})[str(bucket)] = backend
+    self.writeCache()
+
+  def readCache(self):
+    try:
+      with open(self.cachePath) as f:
+        return json.load(f).get(machineKey(), {})
+    except (OSError, ValueError, AttributeError):
+      return {}
+
+  def writeCache(self):
+    '''
+    Store the choices of this machine, a cache file that can not be written
+    only means that the benchmark runs again in the next session
+    '''
+    try:
+      with open(self.cachePath) as f:
+        content = json.load(f)
+      assert isinstance(content, dict)
+    except (OSError, ValueError, AssertionError):
+      content = {}
+    content[machineKey()] = self.choices
+    temporary = f'{self.cachePath}.{os.getpid()}.tmp'
+    try:
+      os.makedirs(os.path.dirname(self.cachePath) or '.', exist_ok=True)
+      with open(temporary, 'w') as f:
+        json.dump(content, f, indent=2, sort_keys=True)
+      os.replace(temporary, self.cachePath)
+    except OSError:
+      pass
+
+  def clearCache(self):
+    '''
+    Forget the choices of this machine, they are benchmarked again
+    '''
+    with self.lock:
+      self.choices = {}
+      self.writeCache()
+      self.reset()
+
+def agrees(result, reference, rtol):
+  if isinstance(reference, tuple):
+    return (
+      isinstance(result, tuple) and len(result) == len(reference) and
+      all(agrees(a, b, rtol) for a, b in zip(result, reference))
+    )
+  result, reference = np.asarray(result), np.asarray(reference)
+  if result.shape != reference.shape:
+    return False
+  scale = np.max(np.abs(reference[np.isfinite(reference)]), initial=0)
+  return bool(np.allclose(result, reference, rtol=rtol, atol=rtol*scale, equal_nan=True))
+
+registry = BackendRegistry()
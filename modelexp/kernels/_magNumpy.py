@@ -0,0 +1,149 @@
+'''
+NumPy and Numba implementations of the Langevin kernels of fortMag. The
+moments of a lognormal distribution are Gauss-Hermite nodes, so that the
+magnetization of all field points is one (B x nodes) matrix product.
+
+Conventions, the BackendRegistry only takes these backends where they
+agree with fortMag:
+
+- mu is the median moment in units of muB, sigMu the width of its
+  logarithm, sigMu = 0 is a single moment. B is in T and T in K.
+- magnetization averages Ms L(mu muB B / kB T) over the number
+  distribution of the moments, mu_weighted_magnetization over the moment
+  weighted one, with the nodes and weights of hermgauss given by the caller.
+- magnetization_populations takes Ms, mu and sigMu of several populations
+  as arrays and returns the sum of their magnetizations, fortMag has no
+  such kernel, its 'fortran' backend calls magnetization per population.
+- Every kernel has a 'numba' backend with the same nodes, if numba is
+  installed.
+'''
+import functools
+import numpy as np
+from ._backends import registry
+from ._quadrature import lognormal
+
+kB = 1.3806485e-23 # J/K
+muB = 9.274009994e-24 # J/T
+order = 31 # Gauss-Hermite nodes of magnetization for sigMu > 0
+
+def langevinFunction(x):
+  '''
+  coth(x) - 1/x, overwrites x. The series around 0 avoids the
+  cancellation.
+  '''
+  small = np.abs(x) < 1e-3
+  series = x[small]
+  series = series/3 - series**3/45
+  x[small] = 1.
+  L = np.tanh(x)
+  np.reciprocal(L, out=L)
+  np.reciprocal(x, out=x)
+  L -= x
+  L[small] = series
+  return L
+
+def weightedMagnetization(B, moments, weights, T, chunk=2**20):
+  '''
+  Sum over the moments (in muB) of weights times the Langevin function
+  for every field in B, in blocks of about chunk matrix elements
+  '''
+  B = np.asarray(B, dtype=float)
+  field = B.ravel()
+  moments = np.asarray(moments, dtype=float) * (muB / (kB * T))
+  M = np.empty(len(field))
+  blockSize = max(1, chunk // max(len(moments), 1))
+  for start in range(0, len(field), blockSize):
+    block = slice(start, start+blockSize)
+    M[block] = langevinFunction(np.multiply.outer(field[block], moments)) @ weights
+  return M.reshape(B.shape)
+
+def magnetizationNodes(Ms, mu, sigMu):
+  '''
+  Moments of the number weighted distribution and their weights times Ms
+  '''
+  moments, weights = lognormal(mu, sigMu, order)
+  return moments, Ms * weights
+
+def muWeightedNodes(Ms, mu, sigMu, x_herm, w_herm):
+  '''
+  Moments of the moment weighted distribution for the nodes of hermgauss
+  and their weights times Ms
+  '''
+  moments = mu * np.exp(np.sqrt(2) * sigMu * np.asarray(x_herm))
+  weights = np.asarray(w_herm) * moments
+  return moments, Ms * weights / weights.sum()
+
+def populationNodes(Ms, mu, sigMu):
+  '''
+  Moments of all populations and their weights times Ms
+  '''
+  moments, weights = [], []
+  for ms, m, sig in np.broadcast(Ms, mu, sigMu):
+    nodes, w = lognormal(m, sig, order)
+    moments.append(nodes)
+    weights.append(ms * w)
+  return np.concatenate(moments), np.concatenate(weights)
+
+@registry.register('mag.langevin.magnetization', 'numpy')
+def magnetization(B, Ms, mu, T, sigMu):
+  return weightedMagnetization(B, *magnetizationNodes(Ms, mu, sigMu), T)
+
+@registry.register('mag.langevin.mu_weighted_magnetization', 'numpy')
+def muWeightedMagnetization(B, Ms, mu, T, sigMu, x_herm, w_herm):
+  return weightedMagnetization(B, *muWeightedNodes(Ms, mu, sigMu, x_herm, w_herm), T)
+
+@registry.register('mag.langevin.magnetization_populations', 'numpy')
+def magnetizationPopulations(B, Ms, mu, T, sigMu):
+  return weightedMagnetization(B, *populationNodes(Ms, mu, sigMu), T)
+
+@functools.lru_cache(maxsize=None)
+def numbaWeightedMagnetization():
+  '''
+  weightedMagnetization compiled with numba, one thread per block of fields
+  '''
+  import numba
+
+  @numba.njit(parallel=True)
+  def weighted(B, moments, weights, T):
+    scale = muB / (kB * T)
+    M = np.zeros(B.shape[0])
+    for i in numba.prange(B.shape[0]):
+      total = 0.
+      for j in range(moments.shape[0]):
+        x = B[i] * moments[j] * scale
+        if abs(x) < 1e-3:
+          total += weights[j] * (x/3 - x**3/45)
+        else:
+          total += weights[j] * (1/np.tanh(x) - 1/x)
+      M[i] = total
+    return M
+
+  def weightedMagnetization(B, moments, weights, T):
+    B = np.asarray(B, dtype=float)
+    return weighted(
+      np.ascontiguousarray(B.ravel()), np.asarray(moments, dtype=float),
+      np.asarray(weights, dtype=float), float(T)
+    ).reshape(B.shape)
+  return weightedMagnetization
+
+def loadNumba(nodes):
+  '''
+  Loader of the numba kernel that sums over the moments of nodes
+  '''
+  def load():
+    weighted = numbaWeightedMagnetization()
+    def kernel(B, Ms, mu, T, sigMu, *rule):
+      return weighted(B, *nodes(Ms, mu, sigMu, *rule), T)
+    return kernel
+  return load
+
+def loopedPopulations():
+  kernel = registry.loadFortran('mag.langevin.magnetization')
+  def populations(B, Ms, mu, T, sigMu):
+    return sum(kernel(B, ms, m, T, sig) for ms, m, sig in np.broadcast(Ms, mu, sigMu))
+  return populations
+
+registry.register('mag.langevin.magnetization', 'numba', loader=loadNumba(magnetizationNodes))
+registry.register('mag.langevin.mu_weighted_magnetization', 'numba', loader=loadNumba(muWeightedNodes))
+registry.register('mag.langevin.magnetization_populations', 'numba', loader=loadNumba(populationNodes))
+registry.register('mag.langevin.magnetization_populations', 'fortran', loader=loopedPopulations)
@@ -0,0 +1,171 @@
+'''
+Quadrature node tables, calculated once per order and process. The arrays
+are read only, as they are shared by every caller.
+
+Kernels that integrate over a size distribution and the orientations,
+e.g. cube.formfactor, are called through gauss, which appends the nodes
+to the arguments. An order of 0 is chosen adaptively, see AdaptiveOrders.
+'''
+import functools, threading, warnings
+import numpy as np
+from numpy.polynomial.hermite import hermgauss
+from numpy.polynomial.legendre import leggauss
+
+def readOnly(x, w):
+  x.flags.writeable = False
+  w.flags.writeable = False
+  return x, w
+
+@functools.lru_cache(maxsize=None)
+def hermite(order):
+  '''
+  Gauss-Hermite nodes and weights of order, like hermgauss
+  '''
+  return readOnly(*hermgauss(int(order)))
+
+@functools.lru_cache(maxsize=None)
+def legendre(order):
+  '''
+  Gauss-Legendre nodes and weights of order, like leggauss
+  '''
+  return readOnly(*leggauss(int(order)))
+
+def lognormal(median, sig, order):
+  '''
+  Nodes and normalized weights of a lognormal distribution of median and
+  width sig of the logarithm, a single node if sig is 0
+  '''
+  if sig == 0:
+    return np.array([float(median)]), np.ones(1)
+  x, w = hermite(order)
+  return median * np.exp(np.sqrt(2) * sig * x), w / np.sqrt(np.pi)
+
+rules = (hermite, legendre)
+
+def nodes(orders):
+  '''
+  Arguments x_herm, w_herm[, x_leg, w_leg] of a kernel for orders
+  '''
+  return tuple(array for rule, order in zip(rules, orders) for array in rule(order))
+
+def qRange(q):
+  '''
+  Key of the domain the adaptive orders are remembered for
+  '''
+  q = np.asarray(q, dtype=float)
+  if q.size == 0:
+    return (0,)
+  return (q.size, float(f'{q.min():.3g}'), float(f'{q.max():.3g}'))
+
+def scalars(args):
+  '''
+  Values of the scalar arguments of a kernel, arrays are left out
+  '''
+  values = []
+  for arg in args:
+    try:
+      values.append(float(arg))
+    except TypeError:
+      pass
+  return np.array(values)
+
+class AdaptiveOrders():
+  '''
+  Orders of the Gauss-Hermite and Gauss-Legendre rules that are raised
+  until raising them changes I(q) by less than rtol. The sufficient
+  orders are remembered per kernel, fixed orders and q-range together with
+  the scalar arguments they were found for. Later calls use them without a
+  search, unless an argument moved by more than retune relative to those,
+  e.g. the size or its width. Then the convergence is checked again from
+  the remembered orders, which costs one more evaluation per adaptive
+  order if they still suffice.
+  '''
+  def __init__(self, rtol=1e-4, start=4, growth=1.5, maxOrder=150, retune=0.1):
+    self.rtol = rtol
+    self.start = start
+    self.growth = growth
+    self.maxOrder = maxOrder
+    self.retune = retune
+    self.orders = {} # (kernel name, orders, q-range) -> (orders, arguments)
+    self.lock = threading.Lock()
+
+  def clear(self):
+    with self.lock:
+      self.orders.clear()
+
+  def raiseOrder(self, order):
+    return min(self.maxOrder, max(order + 1, int(round(order * self.growth))))
+
+  def converged(self, values, previous):
+    '''
+    Whether values changed by less than rtol, relative to their largest
+    magnitude near zeros of I(q), e.g. the minima of a monodisperse sphere
+    '''
+    values, previous = np.asarray(values), np.asarray(previous)
+    atol = self.rtol * np.max(np.abs(values), initial=0)
+    return bool(np.all(np.abs(values - previous) <= self.rtol * np.abs(values) + atol))
+
+  def moved(self, arguments, reference):
+    '''
+    Whether any argument changed by more than retune since reference
+    '''
+    if arguments.shape != reference.shape:
+      return True
+    change = np.abs(arguments - reference)
+    return bool(np.any(change > self.retune * np.maximum(np.abs(arguments), np.abs(reference))))
+
+  def __call__(self, kernel, orders, q, args, kwargs):
+    '''
+    Value of kernel for the orders, the orders that are 0 are adaptive
+    '''
+    name = getattr(kernel, 'name', getattr(kernel, '__name__', repr(kernel)))
+    key = (name, tuple(orders), qRange(q))
+    arguments = scalars(args)
+    with self.lock:
+      known = self.orders.get(key)
+    if known is not None and not self.moved(arguments, known[1]):
+      return kernel(q, *args, *nodes(known[0]), **kwargs)
+
+    if known is not None:
+      orders = list(known[0])
+    else:
+      orders = [order if order > 0 else self.start for order in orders]
+    adaptive = [k for k, order in enumerate(key[1]) if order == 0]
+    values = kernel(q, *args, *nodes(orders), **kwargs)
+    for k in adaptive:
+      while True:
+        if orders[k] >= self.maxOrder:
+          warnings.warn(f'{name} did not converge to rtol={self.rtol} up to order {self.maxOrder}')
+          break
+        raised = list(orders)
+        raised[k] = self.raiseOrder(orders[k])
+        higher = kernel(q, *args, *nodes(raised), **kwargs)
+        if self.converged(higher, values):
+          # orders suffice, so a check from them does not raise them again
+          break
+        values, orders = higher, raised
+    with self.lock:
+      self.orders[key] = (tuple(orders), arguments)
+    return values
+
+adaptive = AdaptiveOrders()
+
+def gauss(kernel, orderHermite, orderLegendre=None):
+  '''
+  kernel with the nodes of the orders appended to its arguments, e.g.
+
+    gauss(cube.formfactor, theta['orderHermite'], theta['orderLegendre'])(
+      q, theta['a'], theta['sldCore'], theta['sldSolvent'], theta['sigA']
+    )
+
+  An order of 0 is chosen by adaptive.
+  '''
+  orders = tuple(
+    int(getattr(order, 'value', order))
+    for order in (orderHermite, orderLegendre) if order is not None
+  )
+  def integrate(q, *args, **kwargs):
+    if 0 in orders:
+      return adaptive(kernel, orders, q, args, kwargs)
+    return kernel(q, *args, *nodes(orders), **kwargs)
+  return integrate
@@ -0,0 +1,95 @@
+'''
+NumPy implementations of the Parratt reflectivity and of the rough sld
+profile of fortRefl, for a batch of layer stacks with the same number of
+layers at once. The layers are given from the substrate to the ambient
+medium, roughness[j] belongs to the interface between the layers j and
+j+1, the thickness of the substrate only sets the origin of the profile.
+SLDs can be complex, absorption is a negative imaginary part as in the
+_cmplx models, so that the principal root of kz decays into the layers.
+
+parrat_batch and roughsld_thick_layers_batch take (batch, layers) arrays
+and return (batch, len(q)) and (batch, len(z)) arrays. fortRefl has no
+batched kernels, their 'fortran' backend calls its kernel for every stack.
+'''
+import numpy as np
+from scipy.special import erf
+from ._backends import registry
+from ._sasNumpy import resolutionSmear
+
+def stacks(sld, roughness, thickness):
+  sld = np.atleast_2d(np.asarray(sld, dtype=complex))
+  roughness = np.atleast_2d(np.asarray(roughness, dtype=float))
+  thickness = np.atleast_2d(np.asarray(thickness, dtype=float))
+  return sld, roughness, thickness
+
+@registry.register('refl.algorithms.parrat_batch', 'numpy')
+def parrattBatch(q, sld, roughness, thickness):
+  '''
+  Reflectivity of every stack with Nevot-Croce roughness, the recursion
+  runs over the layers for all stacks and q at once
+  '''
+  sld, roughness, thickness = stacks(sld, roughness, thickness)
+  q = np.asarray(q, dtype=float)
+  # (batch, q, layer), relative to the ambient medium the beam comes from
+  kz = np.sqrt(0j +
+    (q[np.newaxis, :, np.newaxis] / 2)**2
+    - 4 * np.pi * (sld - sld[:, -1:])[:, np.newaxis, :]
+  )
+  reflection = np.zeros(kz.shape[:2], dtype=complex)
+  for j in range(sld.shape[1] - 1):
+    below, above = kz[..., j], kz[..., j+1]
+    fresnel = (above - below) / (above + below) * np.exp(
+      -2 * below * above * roughness[:, j, np.newaxis]**2
+    )
+    if j > 0:
+      reflection = reflection * np.exp(2j * below * thickness[:, j, np.newaxis])
+    reflection = (fresnel + reflection) / (1 + fresnel * reflection)
+  return np.abs(reflection)**2
+
+@registry.register('refl.algorithms.parrat', 'numpy')
+def parratt(q, sld, roughness, thickness):
+  return parrattBatch(q, [sld], [roughness], [thickness])[0]
+
+@registry.register('refl.algorithms.roughsld_thick_layers_batch', 'numpy')
+def roughSldBatch(z, sld, roughness, thickness):
+  '''
+  SLD profile of every stack on z, the interfaces are error functions of
+  the width of their roughness. The interface between the substrate and
+  the first layer is at z = 0.
+  '''
+  sld, roughness, thickness = stacks(sld, roughness, thickness)
+  z = np.asarray(z, dtype=float)
+  interfaces = np.concatenate(
+    [np.zeros((len(sld), 1)), np.cumsum(thickness[:, 1:-1], axis=1)], axis=1
+  )
+  distance = z[np.newaxis, :, np.newaxis] - interfaces[:, np.newaxis, :]
+  width = np.sqrt(2) * roughness[:, np.newaxis, :-1]
+  step = np.where(
+    width > 0,
+    0.5 * (1 + erf(distance / np.where(width > 0, width, 1))),
+    distance >= 0
+  )
+  return sld[:, :1] + np.sum(step * np.diff(sld, axis=1)[:, np.newaxis, :], axis=2)
+
+@registry.register('refl.algorithms.roughsld_thick_layers', 'numpy')
+def roughSld(z, sld, roughness, thickness):
+  return roughSldBatch(z, [sld], [roughness], [thickness])[0]
+
+def loopedKernel(name):
+  '''
+  Loader of the 'fortran' backend of a batched kernel, that calls the
+  kernel name of fortRefl for every stack
+  '''
+  def load():
+    kernel = registry.loadFortran(name)
+    def batch(x, sld, roughness, thickness):
+      return np.array([kernel(x, *stack) for stack in zip(sld, roughness, thickness)])
+    return batch
+  return load
+
+registry.register('refl.algorithms.parrat_batch', 'fortran', loader=loopedKernel('refl.algorithms.parrat'))
+registry.register(
+  'refl.algorithms.roughsld_thick_layers_batch', 'fortran',
+  loader=loopedKernel('refl.algorithms.roughsld_thick_layers')
+)
+registry.register('refl.math.resolution_smear', 'numpy', resolutionSmear)
@@ -0,0 +1,211 @@
+'''
+NumPy implementations of the sphere kernels of fortSAS and of its
+resolution smearing. The polydispersity integrals are Gauss-Hermite sums
+that are broadcast over q and the nodes, no loop runs over q or over the
+size distribution.
+
+Conventions, the BackendRegistry only takes this backend where it agrees
+with fortSAS:
+
+- Radii and thicknesses are lognormal distributed with their parameter
+  as median and sig as width of the logarithm, sig = 0 is monodisperse.
+- The amplitude of a particle of concentric shells is the sum over its
+  interfaces of the contrast times the amplitude of a homogeneous sphere,
+  V(R) 3 (sin(qR) - qR cos(qR)) / (qR)^3, the formfactor its mean square.
+- The magnetic formfactor of a polarization P = +-1 is
+  <FN^2 + sin2alpha (FM^2 - 2 P FN FM)> with FM scaled by xi.
+- The sld profiles are steps on a grid from 0 to 1.5 times the outer
+  radius.
+- The parameters may be given as lmfit Parameter, they are converted to
+  float before numpy sees them, see scalarArguments.
+'''
+import functools
+import numpy as np
+from ._backends import registry
+from ._quadrature import lognormal as lognormalNodes
+
+order = 31 # Gauss-Hermite nodes of every polydisperse size
+profilePoints = 500
+
+def scalarArguments(kernel):
+  '''
+  kernel with its scalar arguments converted to float, arrays and lists,
+  e.g. q, are passed as they are. numpy cannot build arrays from a lmfit
+  Parameter.
+  '''
+  @functools.wraps(kernel)
+  def converted(*args):
+    return kernel(*(
+      arg if isinstance(arg, (np.ndarray, list, tuple)) else float(arg) for arg in args
+    ))
+  return converted
+
+def lognormal(median, sig):
+  return lognormalNodes(median, sig, order)
+
+def sphereAmplitude(q, r):
+  '''
+  Amplitude of a homogeneous sphere of radius r and contrast 1
+  '''
+  x = q * r
+  small = np.abs(x) < 1e-3
+  x = np.where(small, 1., x)
+  f = np.where(small, 1 - (q*r)**2 / 10, 3 * (np.sin(x) - x * np.cos(x)) / x**3)
+  return 4/3 * np.pi * r**3 * f
+
+def shellAmplitude(q, radii, slds):
+  '''
+  Amplitude of concentric shells with outer radii and the slds from the
+  inside out, the last sld is the one of the solvent
+  '''
+  amplitude = 0
+  for k, r in enumerate(radii):
+    amplitude = amplitude + (slds[k] - slds[k+1]) * sphereAmplitude(q, np.maximum(r, 0))
+  return amplitude
+
+def sizeGrid(q, *distributions):
+  '''
+  q along axis 0 and the node arrays of the sizes along the axes 1, 2, ...
+  so that they broadcast against each other, and the product of their
+  weights
+  '''
+  q = np.asarray(q, dtype=float).reshape((-1,) + (1,) * len(distributions))
+  nodes = []
+  weight = np.ones(())
+  n = len(distributions)
+  for k, (values, weights) in enumerate(distributions):
+    shape = [1] * (n+1)
+    shape[k+1] = len(values)
+    nodes.append(values.reshape(shape))
+    weight = weight[..., np.newaxis] * weights
+  return q, nodes, weight
+
+def average(values, weight):
+  '''
+  Mean of values over all axes but the q axis
+  '''
+  return np.tensordot(values, weight, axes=weight.ndim)
+
+def nuclear(q, radii, slds, weight):
+  return average(shellAmplitude(q, radii, slds)**2, weight)
+
+def magnetic(q, radii, slds, magRadii, magSlds, weight, xi, sin2alpha, polarization):
+  fn = shellAmplitude(q, radii, slds)
+  fm = xi * shellAmplitude(q, magRadii, magSlds)
+  return average(fn**2 + sin2alpha * (fm**2 - 2 * polarization * fn * fm), weight)
+
+def stepProfile(radii, slds):
+  r = np.linspace(0, 1.5 * max(radii[-1], 1e-10), profilePoints)
+  sld = np.full(profilePoints, float(slds[-1]))
+  for radius, value in reversed(list(zip(radii, slds))):
+    sld[r <= radius] = value
+  return r, sld
+
+@registry.register('sas.sphere.formfactor', 'numpy')
+@scalarArguments
+def sphereFormfactor(q, r, sldCore, sldSolvent, sigR):
+  q, (R,), weight = sizeGrid(q, lognormal(r, sigR))
+  return nuclear(q, [R], [sldCore, sldSolvent], weight)
+
+@registry.register('sas.sphere.magnetic_formfactor', 'numpy')
+@scalarArguments
+def sphereMagneticFormfactor(q, r, sldCore, sldSolvent, sigR, magSldCore, magSldSolvent, xi, sin2alpha, polarization):
+  q, (R,), weight = sizeGrid(q, lognormal(r, sigR))
+  return magnetic(
+    q, [R], [sldCore, sldSolvent], [R], [magSldCore, magSldSolvent],
+    weight, xi, sin2alpha, polarization
+  )
+
+@registry.register('sas.sphere.sld', 'numpy')
+@scalarArguments
+def sphereSld(r, sldCore, sldSolvent):
+  return stepProfile([r], [sldCore, sldSolvent])
+
+@registry.register('sas.sphere_cs.formfactor', 'numpy')
+@scalarArguments
+def sphereCSFormfactor(q, r, d, sldCore, sldShell, sldSolvent, sigR, sigD):
+  q, (R, D), weight = sizeGrid(q, lognormal(r, sigR), lognormal(d, sigD))
+  return nuclear(q, [R, R + D], [sldCore, sldShell, sldSolvent], weight)
+
+@registry.register('sas.sphere_cs.magnetic_formfactor', 'numpy')
+@scalarArguments
+def sphereCSMagneticFormfactor(
+  q, r, d, sldCore, sldShell, sldSolvent, sigR, sigD, dDead,
+  magSldCore, magSldShell, magSldSolvent, xi, sin2alpha, polarization
+):
+  # the magnetic core is smaller by the dead layer, see SphereCS.magneticProfile
+  q, (R, D), weight = sizeGrid(q, lognormal(r, sigR), lognormal(d, sigD))
+  return magnetic(
+    q, [R, R + D], [sldCore, sldShell, sldSolvent],
+    [R - dDead, R - dDead + D], [magSldCore, magSldShell, magSldSolvent],
+    weight, xi, sin2alpha, polarization
+  )
+
+@registry.register('sas.sphere_cs.sld', 'numpy')
+@scalarArguments
+def sphereCSSld(r, d, sldCore, sldShell, sldSolvent):
+  return stepProfile([r, r + d], [sldCore, sldShell, sldSolvent])
+
+@registry.register('sas.sphere_css_coupled.formfactor', 'numpy')
+@scalarArguments
+def sphereCSSCoupledFormfactor(
+  q, particleSize, dShell, dSurfactant, sldCore, sldShell, sldSurfactant, sldSolvent,
+  sigParticleSize, sigD
+):
+  q, (R, D), weight = sizeGrid(q, lognormal(particleSize, sigParticleSize), lognormal(dShell, sigD))
+  return nuclear(
+    q, [R, R + D, R + D + dSurfactant],
+    [sldCore, sldShell, sldSurfactant, sldSolvent], weight
+  )
+
+@registry.register('sas.sphere_css_coupled.magnetic_formfactor', 'numpy')
+@scalarArguments
+def sphereCSSCoupledMagneticFormfactor(
+  q, particleSize, dShell, dSurfactant, sldCore, sldShell, sldSurfactant, sldSolvent,
+  sigParticleSize, sigD, magSldCore, magSldShell, magSldSurfactant, magSldSolvent,
+  xi, sin2alpha, polarization
+):
+  q, (R, D), weight = sizeGrid(q, lognormal(particleSize, sigParticleSize), lognormal(dShell, sigD))
+  radii = [R, R + D, R + D + dSurfactant]
+  return magnetic(
+    q, radii, [sldCore, sldShell, sldSurfactant, sldSolvent],
+    radii, [magSldCore, magSldShell, magSldSurfactant, magSldSolvent],
+    weight, xi, sin2alpha, polarization
+  )
+
+@registry.register('sas.sphere_css_coupled.sld', 'numpy')
+@scalarArguments
+def sphereCSSCoupledSld(particleSize, dShell, dSurfactant, sldCore, sldShell, sldSurfactant, sldSolvent):
+  return stepProfile(
+    [particleSize, particleSize + dShell, particleSize + dShell + dSurfactant],
+    [sldCore, sldShell, sldSurfactant, sldSolvent]
+  )
+
+@registry.register('sas.math.resolution_smear', 'numpy')
+def resolutionSmear(q, I, sigQ, chunk=2**20, out=None):
+  '''
+  Gaussian smearing of I with the width sigQ at every q, the integral over
+  the q points is a trapezoid sum. The rows are calculated in blocks of
+  about chunk matrix elements. The result is written into out if it is
+  given, out must not share its memory with I.
+  '''
+  q = np.asarray(q, dtype=float)
+  I = np.asarray(I, dtype=float)
+  sigQ = np.broadcast_to(np.asarray(sigQ, dtype=float), q.shape)
+  steps = np.diff(q) / 2
+  trapezoid = np.zeros(len(q))
+  trapezoid[:-1] += steps
+  trapezoid[1:] += steps
+
+  smeared = np.empty(len(q)) if out is None else out
+  assert not np.shares_memory(smeared, I), 'out must not share its memory with I'
+  smeared[...] = I
+  rows = np.flatnonzero(sigQ > 0)
+  blockSize = max(1, chunk // max(len(q), 1))
+  for start in range(0, len(rows), blockSize):
+    block = rows[start:start+blockSize]
+    x = (q - q[block, np.newaxis]) / sigQ[block, np.newaxis]
+    weights = np.exp(-0.5 * x * x) * trapezoid
+    smeared[block] = (weights @ I) / weights.sum(axis=1)
+  return smeared
+resolutionSmear.acceptsOut = True
@@ -0,0 +1,13 @@
+'''
+Kernels of fortMag, served by the fastest available backend, see
+BackendRegistry. Used like the extension itself:
+
+  from modelexp.kernels.mag import <module>
+'''
+from ._backends import registry
+from . import _magNumpy # registers the NumPy and Numba kernels
+
+def __getattr__(name):
+  if name.startswith('__'):
+    raise AttributeError(name)
+  return registry.namespace('mag.' + name)
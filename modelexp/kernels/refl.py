@@ -0,0 +1,13 @@
+'''
+Kernels of fortRefl, served by the fastest available backend, see
+BackendRegistry. Used like the extension itself:
+
+  from modelexp.kernels.refl import <module>
+'''
+from ._backends import registry
+from . import _reflNumpy # registers the NumPy kernels
+
+def __getattr__(name):
+  if name.startswith('__'):
+    raise AttributeError(name)
+  return registry.namespace('refl.' + name)
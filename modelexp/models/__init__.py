@@ -1,2 +1,3 @@
 from ._model import Model
 from ._modelContainer import ModelContainer
+from ._components import component
@@ -0,0 +1,181 @@
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from collections import OrderedDict
+import itertools, os, weakref
+import numpy as np
+from ._decoration import Decoration
+
+# kept by the worker processes: attached shared memory by name and the models
+# built for a shared ModelsetKernel by its token
+_attached = OrderedDict()
+_workerModels = OrderedDict()
+_maxWorkerEntries = 64
+_tokens = itertools.count()
+
+def decorationClasses(model):
+  '''
+  Classes of the decorations of a model, the innermost first
+  '''
+  classes = []
+  decoration = model.decoration
+  while isinstance(decoration, Decoration):
+    classes.append(type(decoration))
+    decoration = decoration.ptrModel
+  return classes[::-1]
+
+def _releaseMemory(memory):
+  memory.close()
+  memory.unlink()
+
+def _attach(name):
+  memory = _attached.get(name)
+  if memory is None:
+    memory = SharedMemory(name=name)
+    _attached[name] = memory
+    while len(_attached) > 4 * _maxWorkerEntries:
+      try:
+        _attached.popitem(last=False)[1].close()
+      except BufferError:
+        # still mapped by a cached model
+        pass
+  return memory
+
+class SharedArray():
+  '''
+  Copy of an array in shared memory. It is pickled as the name of the memory
+  block, a worker process maps the block instead of unpickling the data.
+  The creating process unlinks the block when release is called or the
+  SharedArray is garbage collected.
+  '''
+  def __init__(self, array):
+    array = np.ascontiguousarray(array)
+    self.shape = array.shape
+    self.dtype = array.dtype
+    self.memory = SharedMemory(create=True, size=max(array.nbytes, 1))
+    self.array = np.ndarray(self.shape, self.dtype, buffer=self.memory.buf)
+    self.array[...] = array
+    self.finalizer = weakref.finalize(self, _releaseMemory, self.memory)
+
+  def __getstate__(self):
+    return {'name': self.memory.name, 'shape': self.shape, 'dtype': self.dtype}
+
+  def __setstate__(self, state):
+    self.shape = state['shape']
+    self.dtype = state['dtype']
+    self.memory = _attach(state['name'])
+    self.array = np.ndarray(self.shape, self.dtype, buffer=self.memory.buf)
+    self.finalizer = None
+
+  def release(self):
+    if self.finalizer is not None:
+      self.array = None
+      self.finalizer()
+
+class ModelsetKernel():
+  '''
+  Picklable description of how a modelset is evaluated: the model class,
+  its domain, the resolution of its dataset and the classes of its
+  decorations. Calling it evaluates the decorated model for one set of
+  parameter values on an unconnected instance, which is rebuilt after
+  unpickling so that it can be used in a worker process.
+  '''
+  def __init__(self, model):
+    self.modelClass = type(model)
+    self.domain = model.getDomain()
+    self.resolution = model.getResolution() if hasattr(model, 'getResolution') else None
+    self.decorations = decorationClasses(model)
+    self.model = None
+    self.shared = {} # SharedArray of the domain and the resolution, see share
+    self.token = None
+
+  def __getstate__(self):
+    state = self.__dict__.copy()
+    state['model'] = None
+    for name in self.shared:
+      state[name] = None
+    return state
+
+  def __setstate__(self, state):
+    self.__dict__.update(state)
+    for name, array in self.shared.items():
+      setattr(self, name, array.array)
+
+  def share(self):
+    '''
+    Move the domain and the resolution into shared memory, tasks for a
+    process pool then only carry their names. The workers keep the model
+    they build for this kernel.
+    '''
+    for name in ('domain', 'resolution'):
+      if getattr(self, name) is not None:
+        self.shared[name] = SharedArray(getattr(self, name))
+        setattr(self, name, self.shared[name].array)
+    self.token = (os.getpid(), next(_tokens))
+    return self
+
+  def release(self):
+    for array in self.shared.values():
+      array.release()
+    self.shared = {}
+
+  def matches(self, model):
+    '''
+    Whether the kernel still evaluates model, i.e. neither its class, its
+    decorations, its domain nor its resolution changed
+    '''
+    resolution = model.getResolution() if hasattr(model, 'getResolution') else None
+    if type(model) is not self.modelClass or decorationClasses(model) != self.decorations:
+      return False
+    if (resolution is None) != (self.resolution is None):
+      return False
+    return np.array_equal(model.getDomain(), self.domain) and (
+      resolution is None or np.array_equal(resolution, self.resolution)
+    )
+
+  def isVectorized(self):
+    return self.modelClass.vectorized and len(self.decorations) == 0
+
+  def build(self):
+    model = self.modelClass(None)
+    model.defineDomain(self.domain)
+    if self.resolution is not None:
+      model.setResolution(self.resolution)
+    for decoration in self.decorations:
+      model._addDecoration(decoration)
+    return model
+
+  def __call__(self, theta):
+    if self.model is None and self.token is not None:
+      self.model = _workerModels.get(self.token)
+    if self.model is None:
+      self.model = self.build()
+      if self.token is not None:
+        _workerModels[self.token] = self.model
+        while len(_workerModels) > _maxWorkerEntries:
+          _workerModels.popitem(last=False)
+    return self.model.evaluateDecorated(self.domain, theta)
+
+def _evaluateTask(task):
+  kernel, theta = task
+  return kernel(theta)
+
+def getExecutor(executor, workers):
+  '''
+  Returns (executor, owned) for the executor argument of evaluateBatch.
+  Owned executors are created here and have to be shut down by the caller.
+  '''
+  if executor is None or isinstance(executor, Executor):
+    return executor, False
+  assert executor in ('thread', 'process'), (
+    "executor has to be None, 'thread', 'process' or a concurrent.futures.Executor"
+  )
+  if executor == 'thread':
+    return ThreadPoolExecutor(workers), True
+  return ProcessPoolExecutor(workers), True
+
+def mapTasks(executor, tasks, chunksize=1):
+  if executor is None:
+    return map(_evaluateTask, tasks)
+  if isinstance(executor, ProcessPoolExecutor):
+    return executor.map(_evaluateTask, tasks, chunksize=chunksize)
+  return executor.map(_evaluateTask, tasks)
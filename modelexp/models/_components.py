@@ -0,0 +1,107 @@
+import hashlib, threading
+from collections import OrderedDict
+import numpy as np
+
+def domainKey(domain):
+  '''
+  Hashable key of a domain array, based on its content. The 256 bit digest
+  makes two different domains with the same key practically impossible,
+  unlike the 64 bit hash().
+  '''
+  domain = np.ascontiguousarray(domain)
+  return (domain.shape, domain.dtype.str, hashlib.blake2b(domain, digest_size=32).digest())
+
+def freeze(value):
+  '''
+  Hashable version of an argument of a component
+  '''
+  if isinstance(value, (list, tuple)):
+    return tuple(freeze(v) for v in value)
+  if isinstance(value, np.ndarray):
+    return domainKey(value)
+  return getattr(value, 'value', value)
+
+class Component():
+  '''
+  Sub-term of a model that only depends on the domain and a few parameters.
+  The results are kept in a least recently used cache keyed on the domain
+  and the values of exactly these parameters, so that changing any other
+  parameter of the model, e.g. in a column of a finite difference Jacobian,
+  does not recompute the component.
+
+  Components are created with the component decorator and can be combined
+  freely in the evaluate function of a model, also across models.
+  The cached arrays are read only, combine them into new arrays.
+  '''
+  def __init__(self, function, paramNames, maxsize=64):
+    self.function = function
+    self.paramNames = paramNames
+    self.maxsize = maxsize
+    self.cache = OrderedDict()
+    self.lock = threading.Lock()
+    self.hits = 0
+    self.misses = 0
+    self.__doc__ = function.__doc__
+    self.__name__ = function.__name__
+
+  def __call__(self, domain, theta):
+    '''
+    Value of the component on domain for the parameters in theta
+    '''
+    return self.evaluate(domain, *[theta[name] for name in self.paramNames])
+
+  def evaluate(self, domain, *args):
+    '''
+    Value of the component for explicitly given arguments
+    '''
+    key = (domainKey(domain), freeze(args))
+    with self.lock:
+      if key in self.cache:
+        self.hits += 1
+        self.cache.move_to_end(key)
+        return self.cache[key]
+      self.misses += 1
+
+    values = np.asarray(self.function(domain, *args))
+    values.setflags(write=False)
+
+    with self.lock:
+      self.cache[key] = values
+      while len(self.cache) > self.maxsize:
+        self.cache.popitem(last=False)
+    return values
+
+  def cacheInfo(self):
+    return {
+      'hits': self.hits, 'misses': self.misses,
+      'size': len(self.cache), 'maxsize': self.maxsize,
+    }
+
+  def cacheClear(self):
+    with self.lock:
+      self.cache.clear()
+      self.hits = 0
+      self.misses = 0
+
+def component(*paramNames, maxsize=64):
+  '''
+  Decorator that turns function(domain, *values) into a cached Component.
+  paramNames are the names of the parameters the component depends on, they
+  are taken from theta in this order when the component is called as
+  component(domain, theta). Components without paramNames are called with
+  explicit arguments through component.evaluate(domain, *args).
+
+  Example
+  -------
+  class Model(SAXSModel):
+    @component('rOleic', 'sldShell', 'sldSolvent')
+    def oleicFormfactor(q, rOleic, sldShell, sldSolvent):
+      return sphere.formfactor(q, rOleic, sldShell, sldSolvent, 0)
+
+    @classmethod
+    def evaluate(cls, q, theta):
+      return theta['i0Oleic'] * cls.oleicFormfactor(q, theta) + theta['bg']
+  '''
+  def decorate(function):
+    return Component(function, paramNames, maxsize)
+  return decorate
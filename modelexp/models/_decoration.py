@@ -1,6 +1,7 @@
 from abc import ABCMeta, abstractmethod
 
 class Decoration(metaclass=ABCMeta):
+  valueParameters = () # parameters only used by transformDomain and transformValues
 
   def __init__(self, model):
     self.ptrModel = model
@@ -9,6 +10,51 @@ class Decoration(metaclass=ABCMeta):
   def calcModel(self):
     pass
 
+  def transformDomain(self, domain, theta):
+    """Domain on which the decorated model has to be evaluated
+    """
+    return domain
+
+  def transformDomainInto(self, domain, theta, out):
+    """transformDomain written into the buffer out, see DecorationPlan
+    """
+    out[...] = self.transformDomain(domain, theta)
+    return out
+
+  def transformValues(self, domain, values, theta):
+    """Modify the values of the decorated model, e.g. smear them out
+    """
+    return values
+
+  def transformValuesWithWidth(self, domain, values, theta, width, out=None):
+    """transformValues with the resolutionWidth already calculated, the
+    result may be written into out, which has the shape of domain
+    """
+    return self.transformValues(domain, values, theta)
+
+  def kernelName(self, kernel, theta):
+    """Name of the classmethod of the model class that is evaluated below
+    this decoration, kernel is the one requested by the outer decorations
+    """
+    return kernel
+
+  def resolutionWidth(self, domain, theta):
+    """Width by which transformValues mixes the values at every point of
+    domain, values further away than a few widths do not contribute
+    """
+    return 0
+
+  def evaluate(self, domain, theta):
+    """Values of the decorated model on domain for the parameter values theta,
+    without changing the state of the model
+    """
+    values = self.ptrModel.evaluate(self.transformDomain(domain, theta), theta)
+    return self.transformValues(domain, values, theta)
+
+  def evaluateMagnetic(self, domain, theta):
+    values = self.ptrModel.evaluateMagnetic(self.transformDomain(domain, theta), theta)
+    return self.transformValues(domain, values, theta)
+
   def plotModel(self):
     self.ptrModel.plotModel()
 
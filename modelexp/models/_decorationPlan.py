@@ -0,0 +1,108 @@
+import numpy as np
+from ._decoration import Decoration
+from ._model import parameterValues
+from ._workspace import Workspace
+
+class DecorationPlan():
+  '''
+  The decorations of a modelset flattened into one evaluation. The domains
+  below domain transforming decorations, e.g. ShiftQ, are written into
+  arrays of the Workspace of the modelset that are reused from call to call. The resolution widths are
+  kept as long as the domain, the resolution of the dataset and the
+  parameters they depend on do not change. The kernel classmethod of the
+  model class is called once with the workspace active, then every
+  decoration transforms the values in a single step, the smearing ones
+  into an array of the workspace. The domain stored in the model is never modified.
+
+  Only valid for models whose calcModel is their evaluate, see
+  Model.stackable.
+  '''
+  def __init__(self, model, workspace=None):
+    self.model = model
+    self.workspace = Workspace() if workspace is None else workspace
+    self.decorations = [] # the outermost first
+    decoration = model.decoration
+    while isinstance(decoration, Decoration):
+      self.decorations.append(decoration)
+      decoration = decoration.ptrModel
+    self.transformsDomain = [
+      type(decoration).transformDomain is not Decoration.transformDomain
+      for decoration in self.decorations
+    ]
+    self.hasWidth = [
+      type(decoration).resolutionWidth is not Decoration.resolutionWidth
+      for decoration in self.decorations
+    ]
+    self.widths = [None] * len(self.decorations) # (domain, resolution, parameters, width)
+
+  def domains(self, theta):
+    '''
+    Domain seen by every decoration, the last one is the kernel domain
+    '''
+    domains = [self.model.getDomain()]
+    for k, decoration in enumerate(self.decorations):
+      domain = domains[-1]
+      if self.transformsDomain[k]:
+        out = self.workspace.get(('domain', k), np.shape(domain))
+        domain = decoration.transformDomainInto(domain, theta, out)
+      domains.append(domain)
+    return domains
+
+  def width(self, k, domains, theta):
+    '''
+    resolutionWidth of decoration k, recalculated only if its domain or the
+    parameters of the decorations down to k changed
+    '''
+    if not self.hasWidth[k]:
+      return 0
+    resolution = self.model.getResolution() if hasattr(self.model, 'getResolution') else None
+    parameters = tuple(
+      float(theta[name]) for decoration in self.decorations[:k+1]
+      for name in decoration.valueParameters if name in theta
+    )
+    cached = self.widths[k]
+    if (
+      cached is not None and cached[0] is domains[0] and
+      cached[1] is resolution and cached[2] == parameters
+    ):
+      return cached[3]
+    width = self.decorations[k].resolutionWidth(domains[k], theta)
+    self.widths[k] = (domains[0], resolution, parameters, width)
+    return width
+
+  def calc(self, dtype=np.float64):
+    '''
+    Calculate the values and defer the profile of the model, like
+    calcDecoratedModel. Vectorized kernels, which are written in NumPy,
+    get their domain in dtype, so that float32 halves their temporaries.
+    '''
+    model = self.model
+    modelClass = type(model)
+    theta = model.params
+    kernel = 'evaluate'
+    for decoration in self.decorations:
+      kernel = decoration.kernelName(kernel, theta)
+
+    domains = self.domains(theta)
+    domain = domains[-1]
+    if modelClass.vectorized and domain.dtype != dtype:
+      domain = self.workspace.get('kernelDomain', np.shape(domain), dtype)
+      np.copyto(domain, domains[-1], casting='unsafe')
+    with self.workspace.activate():
+      values = getattr(modelClass, kernel)(domain, theta)
+    if values is None:
+      # the model could not be calculated, e.g. without its real space grid
+      model.calcDecoratedModel()
+      return
+    for k in reversed(range(len(self.decorations))):
+      out = None
+      if self.hasWidth[k]:
+        out = self.workspace.get(('values', k), np.shape(domains[k]))
+      values = self.decorations[k].transformValuesWithWidth(
+        domains[k], values, theta, self.width(k, domains, theta), out
+      )
+    model.setValues(values)
+
+    profileFunction = getattr(modelClass, modelClass.kernelProfiles[kernel])
+    snapshot = parameterValues(theta)
+    model.deferProfile(modelClass.profileAttributes, lambda: profileFunction(snapshot))
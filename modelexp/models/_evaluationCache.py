@@ -0,0 +1,109 @@
+from collections import OrderedDict
+import numpy as np
+from ._model import DeferredProfile
+
+class EvaluationCache():
+  '''
+  Memory bounded cache of evaluated modelsets.
+  An entry holds the values and the profile arrays of a modelset and is
+  keyed on the index of the modelset and its routed parameter vector.
+  With a quantum the parameter vector is quantised, so that parameter sets
+  that only differ below the resolution of the sliders share an entry.
+  '''
+  def __init__(self, maxBytes=64*2**20, maxEntries=None, eviction='lru', quantum=1e-3):
+    """
+    Parameters
+    ----------
+    maxBytes : int
+      Upper limit of the memory of all stored arrays
+    maxEntries : int
+      Upper limit of the number of entries, None for no limit
+    eviction : str
+      'lru' removes the least recently used entry first, 'fifo' the oldest
+    quantum : float
+      Resolution of the key relative to the parameter range (max - min),
+      for parameters without finite bounds relative to the value.
+      None uses the exact parameter values.
+    """
+    assert eviction in ('lru', 'fifo'), "eviction has to be 'lru' or 'fifo'"
+    self.maxBytes = maxBytes
+    self.maxEntries = maxEntries
+    self.eviction = eviction
+    self.quantum = quantum
+    self.exact = False # set while fitting, quantised keys would break derivatives
+
+    self.entries = OrderedDict()
+    self.nBytes = 0
+    self.hits = 0
+    self.misses = 0
+    self.evictions = 0
+
+  def key(self, i, values, lower=None, upper=None):
+    '''
+    Key of modelset i for its routed parameter vector values.
+    lower and upper are the bounds of the parameters, they define the
+    quantisation step.
+    '''
+    if self.quantum is None or self.exact:
+      return (i, values.tobytes())
+    if lower is None or upper is None:
+      lower = upper = np.full(len(values), np.inf)
+    finite = np.isfinite(lower) & np.isfinite(upper) & (upper > lower)
+    # bins of the slider resolution for bounded parameters and bins of
+    # constant relative width for the others
+    magnitude = np.abs(values)
+    relative = np.round(np.log(np.where(magnitude > 0, magnitude, 1.)) / np.log1p(self.quantum))
+    absolute = np.round((values - np.where(finite, lower, 0.)) / np.where(finite, (upper - lower) * self.quantum, 1.))
+    bins = np.where(finite, absolute, relative)
+    steps = np.where(finite, upper - lower, 0.)
+    return (i, bins.tobytes(), np.sign(values).tobytes(), steps.tobytes())
+
+  def get(self, key):
+    entry = self.entries.get(key)
+    if entry is None:
+      self.misses += 1
+      return None
+    self.hits += 1
+    if self.eviction == 'lru':
+      self.entries.move_to_end(key)
+    return entry
+
+  def put(self, key, values, profile):
+    # stored read only, an entry is handed out to the modelsets as it is
+    values = np.array(values, copy=True)
+    values.setflags(write=False)
+    # entries that are not calculated yet stay deferred, see Model.deferProfile
+    profile = {
+      name: array if isinstance(array, DeferredProfile) else np.array(array, copy=True)
+      for name, array in profile.items()
+    }
+    arrays = [array for array in profile.values() if isinstance(array, np.ndarray)]
+    for array in arrays:
+      array.setflags(write=False)
+    size = values.nbytes + sum(array.nbytes for array in arrays)
+    if size > self.maxBytes:
+      return
+    if key in self.entries:
+      self.nBytes -= self.entries.pop(key)[2]
+    self.entries[key] = (values, profile, size)
+    self.nBytes += size
+    while self.nBytes > self.maxBytes or (
+      self.maxEntries is not None and len(self.entries) > self.maxEntries
+    ):
+      _, (_, _, evictedSize) = self.entries.popitem(last=False)
+      self.nBytes -= evictedSize
+      self.evictions += 1
+
+  def clear(self):
+    self.entries.clear()
+    self.nBytes = 0
+
+  def info(self):
+    return {
+      'hits': self.hits,
+      'misses': self.misses,
+      'evictions': self.evictions,
+      'entries': len(self.entries),
+      'bytes': self.nBytes,
+      'maxBytes': self.maxBytes,
+    }
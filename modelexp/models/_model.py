@@ -1,13 +1,173 @@
+import copy, math
+import numpy as np
 from abc import ABCMeta, abstractmethod
 from lmfit import Parameters
 from ._decoration import Decoration
 
+class ParameterValue(float):
+  """Plain parameter value that can be used in place of a lmfit Parameter
+  by model code that reads theta['name'].value
+  """
+  @property
+  def value(self):
+    return float(self)
+
+class TableParameter(ParameterValue):
+  """Row of a ParameterTable, the value with the bounds, the vary flag and
+  the expression
+  """
+  def __new__(cls, value, min, max, vary, expr=None):
+    parameter = super().__new__(cls, value)
+    parameter.min = min
+    parameter.max = max
+    parameter.vary = vary
+    parameter.expr = expr
+    return parameter
+
+class ParameterTable():
+  """Parameters of a modelset of a ModelContainer. The models only add their
+  parameters and read them, so instead of a lmfit Parameters with its
+  expression interpreter the rows are kept in plain columns. Bounds are
+  applied like lmfit does when a parameter is added. Expressions are only
+  stored, the container adds them to its lmfit Parameters, which evaluate
+  them, and routes the values to the modelsets.
+  """
+  def __init__(self):
+    self.rows = {} # name -> row
+    self.value = []
+    self.min = []
+    self.max = []
+    self.vary = []
+    self.expr = []
+
+  def add(self, name, value=None, vary=True, min=-np.inf, max=np.inf, expr=None, brute_step=None):
+    if not isinstance(name, str):
+      # a lmfit Parameter
+      parameter = name
+      name, value, vary = parameter.name, parameter.value, parameter.vary
+      min, max, expr = parameter.min, parameter.max, parameter.expr
+    min = -np.inf if min is None else min
+    max = np.inf if max is None else max
+    value = -np.inf if value is None else value
+    if min > max:
+      min, max = max, min
+    assert not math.isclose(min, max, rel_tol=1e-13, abs_tol=1e-13), f"Parameter '{name}' has min == max"
+    value = float(value)
+    if value > max:
+      value = max
+    if value < min:
+      value = min
+    if name in self.rows:
+      row = self.rows[name]
+      self.value[row], self.min[row], self.max[row], self.vary[row] = value, min, max, vary
+      self.expr[row] = expr
+      return
+    self.rows[name] = len(self.value)
+    self.value.append(value)
+    self.min.append(min)
+    self.max.append(max)
+    self.vary.append(vary)
+    self.expr.append(expr)
+
+  def __getitem__(self, name):
+    row = self.rows[name]
+    return TableParameter(
+      self.value[row], self.min[row], self.max[row], self.vary[row], self.expr[row]
+    )
+
+  def __contains__(self, name):
+    return name in self.rows
+
+  def __iter__(self):
+    return iter(self.rows)
+
+  def __len__(self):
+    return len(self.rows)
+
+  def keys(self):
+    return self.rows.keys()
+
+  def items(self):
+    return ((name, self[name]) for name in self.rows)
+
+  def valuesdict(self):
+    return {name: self.value[row] for name, row in self.rows.items()}
+
+def parameterValues(params):
+  """Convert lmfit Parameters, or any mapping of numbers, into a plain dict
+  of ParameterValue. The result holds no references to the fit or the gui and
+  can be passed to another thread or pickled into a worker process.
+  """
+  return {
+    name: ParameterValue(getattr(params[name], 'value', params[name]))
+    for name in params
+  }
+
+class DeferredProfile():
+  """Profile entries that are calculated by compute() when the first of
+  them is read, and only once
+  """
+  def __init__(self, compute):
+    self.compute = compute
+    self.profile = None
+
+  def get(self):
+    if self.profile is None:
+      self.profile = self.compute()
+    return self.profile
+
+class ProfileAttribute():
+  """Attribute of a model that holds a profile array, e.g. r or sld.
+  Profiles are only needed for plotting and saving, so models defer them
+  with deferProfile and they are calculated when they are read.
+  """
+  def __init__(self, name):
+    self.name = name
+
+  def __get__(self, model, owner=None):
+    if model is None:
+      return self
+    model._resolveProfile(self.name)
+    try:
+      return model.__dict__[self.name]
+    except KeyError:
+      raise AttributeError(self.name) from None
+
+  def __set__(self, model, value):
+    pending = model.__dict__.get('pendingProfile', {})
+    if self.name in pending:
+      model.pendingProfile = {name: d for name, d in pending.items() if name != self.name}
+    model.__dict__[self.name] = value
+
+_prototypes = {}
+
 class Model(metaclass=ABCMeta):
   """Abstract class to describe a model.
   Specific models are defined by classes that have to implemented the defined functions here.
+
+  The numerical part of a model is available without any instance state:
+  evaluate(domain, theta) returns the values of the model and profile(theta)
+  returns a dict with the real space profile (see profileAttributes).
+  calcModel only stores their results on the instance for plotting.
   """
+  profileAttributes = () # names of the profile entries, e.g. ('r', 'sld')
+  vectorized = False # evaluate broadcasts parameters given as (N, 1) arrays
+  linearParameters = () # parameters the values depend on linearly, see VariableProjection
+  # values at a point do not depend on the rest of the domain and calcModel
+  # stores evaluate, see calcStacked and DecorationPlan
+  stackable = True
+  # classmethod that returns the profile belonging to a kernel classmethod
+  kernelProfiles = {'evaluate': 'profile', 'evaluateMagnetic': 'magneticProfile'}
+
+  def __init_subclass__(cls, **kwargs):
+    super().__init_subclass__(**kwargs)
+    for name in cls.profileAttributes:
+      if not isinstance(getattr(cls, name, None), ProfileAttribute):
+        setattr(cls, name, ProfileAttribute(name))
+
   def __init__(self, parent=None):
-    self.params = Parameters()
+    # the parameters of a modelset are set by its container, see ParameterTable
+    self.params = Parameters() if parent is None else ParameterTable()
     self.decoration = Decoration
     self.suffix = ''
     self.constantParameters = [] # parameters that dont have a slider Bar
@@ -24,6 +184,115 @@ class Model(metaclass=ABCMeta):
       self.decoration = decoratingClass(self)
 
 
+  @classmethod
+  def _scratchModel(cls, domain, theta):
+    """Copy of an unconnected instance to run a stateful calcModel on
+    """
+    if not cls in _prototypes:
+      _prototypes[cls] = cls(None)
+    model = copy.copy(_prototypes[cls])
+    model.params = parameterValues(theta)
+    model.defineDomain(domain)
+    return model
+
+  @classmethod
+  def evaluate(cls, domain, theta):
+    """Values of the model on domain for the parameter values theta.
+
+    Models that only implement calcModel are evaluated on a scratch copy,
+    so the call does not touch any instance that is shown in the gui.
+
+    Parameters
+    ----------
+    domain : np.ndarray
+      Domain on which the model is evaluated
+    theta : Parameters or dict
+      Parameter values by name
+    """
+    model = cls._scratchModel(domain, theta)
+    model.calcModel()
+    return model.getValues()
+
+  @classmethod
+  def evaluateMagnetic(cls, domain, theta):
+    """Values of the magnetic variant of the model, see evaluate
+    """
+    model = cls._scratchModel(domain, theta)
+    model.calcMagneticModel()
+    return model.getValues()
+
+  @classmethod
+  def profile(cls, theta):
+    """Real space profile of the model as dict with the keys in profileAttributes
+    """
+    # calcModel also calculates the values, a single point keeps that cheap
+    model = cls._scratchModel(np.ones(1), theta)
+    model.calcModel()
+    return model._collectProfile()
+
+  @classmethod
+  def magneticProfile(cls, theta):
+    """Real space profile of the magnetic variant of the model, see profile
+    """
+    model = cls._scratchModel(np.ones(1), theta)
+    model.calcMagneticModel()
+    return model._collectProfile()
+
+  def _collectProfile(self):
+    return {
+      name: getattr(self, name) for name in self.profileAttributes
+      if getattr(self, name, None) is not None
+    }
+
+  def profileSnapshot(self):
+    """Profile like _collectProfile, but entries that are not calculated yet
+    stay a DeferredProfile
+    """
+    pending = self.__dict__.get('pendingProfile', {})
+    profile = dict(pending)
+    for name in self.profileAttributes:
+      if not name in pending and self.__dict__.get(name) is not None:
+        profile[name] = self.__dict__[name]
+    return profile
+
+  def setProfile(self, profile):
+    for name, value in profile.items():
+      if isinstance(value, DeferredProfile):
+        self.deferProfile((name,), value)
+      else:
+        setattr(self, name, value)
+
+  def deferProfile(self, names, compute):
+    """Calculate the profile entries names with compute() when one of them
+    is read. compute returns a dict, entries it does not return keep their
+    last value.
+    """
+    deferred = compute if isinstance(compute, DeferredProfile) else DeferredProfile(compute)
+    # replaced instead of updated, scratch models share it with their prototype
+    pending = dict(self.__dict__.get('pendingProfile', {}))
+    for name in names:
+      pending[name] = deferred
+    self.pendingProfile = pending
+
+  def _resolveProfile(self, name):
+    pending = self.__dict__.get('pendingProfile', {})
+    if not name in pending:
+      return
+    deferred = pending[name]
+    profile = deferred.get()
+    self.pendingProfile = {key: d for key, d in pending.items() if d is not deferred}
+    for key, d in pending.items():
+      if d is deferred and key in profile:
+        self.__dict__[key] = profile[key]
+
+  def evaluateDecorated(self, domain, theta):
+    """Values of the model including all decorations, without changing the
+    state of the model
+    """
+    if isinstance(self.decoration, Decoration):
+      return self.decoration.evaluate(domain, theta)
+    return self.evaluate(domain, theta)
+
   def addConstantParam(self, param):
     self.constantParameters.append(param)
 
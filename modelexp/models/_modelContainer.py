@@ -1,14 +1,31 @@
-from ._model import Model
+from ._model import Model, parameterValues
 import sys
+from contextlib import contextmanager
 from lmfit import Parameters
 import numpy as np
 from ._decoration import Decoration
+from ._routing import RoutingPlan
+from concurrent.futures import ProcessPoolExecutor
+from ._batch import ModelsetKernel, getExecutor, mapTasks, _evaluateTask
+from ._evaluationCache import EvaluationCache
+from ._stacking import calcStacked, kernelChain
+from ._window import restrictDomain, restoreDomain
+from ._decorationPlan import DecorationPlan
+from ._workspace import Workspace
 
 try:
   from ..experiments import Experiment
 except ImportError:
   pass
 
+def suffixKey(suffix):
+  '''
+  Hashable key of a suffix, which is a str or a list of str
+  '''
+  return tuple(suffix) if isinstance(suffix, list) else suffix
+
+precisions = {'single': np.float32, 'double': np.float64}
+
 class ModelContainer():
   '''
   Container class to hold multiple Model objects.
@@ -19,12 +36,29 @@ class ModelContainer():
     self.modelClass = modelClass
     self.nModelsets = 0 # number of datasets
     self.modelsets = []
+    self.suffixIndex = {} # first modelset with a suffix, see getModelsetBySuffix
 
     self.decoration = decoration
     self.constantParameters = [] # set by model during initParameters
     self.datasetSpecificParams = [] # set by experiment during initParameters
     self.combinedParameters = {}
     self.params = Parameters() # empty parameter container
+    self.routingPlan = None # compiled on the first updateModel
+    self.decorationPlans = {} # DecorationPlan of every modelset, see calcModelset
+    self.workspaces = {} # Workspace of every modelset, see getWorkspace
+    self.evaluationCache = None # see enableEvaluationCache
+    self.presetValues = None # see valuesPreset
+    self.lastValues = None # parameter vector of the last updateModel
+    self.lastDomains = [] # domain of every modelset at the last updateModel
+    self.updatedModelsets = [] # modelsets recalculated by the last updateModel
+    self.stackedEvaluation = False # see enableStackedEvaluation
+    self.window = None # (lower, upper, padding) of evaluationWindow
+    self.executor = None # pool that calculates the modelsets, see setExecutor
+    self.ownsExecutor = False
+    self.sharedKernels = {} # ModelsetKernel in shared memory of every modelset
+    self.precision = 'double' # see setPrecision
+    self.previewPrecision = 'double' # precision of the gui previews
+    self.lastPrecision = None # precision of the last updateModel
 
     if gui is not None:
       self.connectGui(gui)
@@ -54,8 +88,14 @@ class ModelContainer():
           'Tried to add a decoration that is not derived from Decoration'
         newModel._addDecoration(self.decoration)
     newModel.suffix = suffix
+    self.suffixIndex.setdefault(suffixKey(suffix), len(self.modelsets))
     self.modelsets.append(newModel)
     self.nModelsets += 1
+    self.routingPlan = None
+    self.decorationPlans = {}
+    self.lastValues = None
+    if self.evaluationCache is not None:
+      self.evaluationCache.clear()
 
     # when as much models have been added as expected for the experiment
     # -> initialize the parameters
@@ -70,44 +110,51 @@ class ModelContainer():
 
   def initParameters(self):
     self.datasetSpecificParams = self.ptrExperiment.datasetSpecificParams
-    addedParams = []
+    self.routingPlan = None
+    specificTags = {
+      parameter: set(tags) for parameter, tags in self.datasetSpecificParams.items()
+    }
+    constantParameters = set(self.constantParameters)
+    expressions = {}
 
     for i in range(self.nModelsets):
       model = self.getModelset(i)
       params = model.params
 
       for parameter in model.constantParameters:
-        if not parameter in self.constantParameters:
+        if not parameter in constantParameters:
+          constantParameters.add(parameter)
           self.constantParameters.append(parameter)
 
+      if isinstance(model.suffix, str):
+        suffices = [model.suffix]
+      elif isinstance(model.suffix, list):
+        suffices = model.suffix
+      else:
+        suffices = []
+
       for parameter in params:
-        p = params[parameter]
-        if parameter in self.datasetSpecificParams:
+        if parameter in specificTags:
           # parameter is shared only by datasets with specific tags
           # these are added to the dataset either as a str or a list of str
-
-          specificTags = self.datasetSpecificParams[parameter]
-          if isinstance(model.suffix, str):
-            if model.suffix in specificTags:
-              suffixedParameter = parameter + '_' + model.suffix
+          for suffix in suffices:
+            if suffix in specificTags[parameter]:
+              suffixedParameter = parameter + '_' + suffix
               if not suffixedParameter in self.params:
+                p = params[parameter]
                 self.params.add(
                   suffixedParameter, p.value,
                   min=p.min, max=p.max, vary=p.vary
                 )
-          elif isinstance(model.suffix, list):
-            for suffix in model.suffix:
-              if suffix in specificTags:
-                suffixedParameter = parameter + '_' + suffix
-                if not suffixedParameter in self.params:
-                  self.params.add(
-                    suffixedParameter, p.value,
-                    min=p.min, max=p.max, vary=p.vary
-                  )
-        elif parameter in addedParams:
-          continue
-        else:
-          self.params.add(p)
+        elif not parameter in self.params:
+          p = params[parameter]
+          self.params.add(parameter, p.value, min=p.min, max=p.max, vary=p.vary)
+          if p.expr:
+            expressions[parameter] = p.expr
+
+    # set once all parameters exist, an expression may refer to any of them
+    for parameter, expr in expressions.items():
+      self.params[parameter].expr = expr
 
   def connectGui(self, gui):
     self.ptrGui = gui
@@ -119,10 +166,12 @@ class ModelContainer():
     return self.modelsets[i]
 
   def getModelsetBySuffix(self, suffix):
-    for i in range(self.nModelsets):
-      model = self.getModelset(i)
-      modelSuffix = model.suffix
-      if modelSuffix == suffix:
+    i = self.suffixIndex.get(suffixKey(suffix))
+    if i is not None and self.getModelset(i).suffix == suffix:
+      return self.getModelset(i)
+    # the suffix of a modelset was changed after it was added
+    for model in self.modelsets:
+      if model.suffix == suffix:
         return model
     return None
 
@@ -172,6 +221,7 @@ class ModelContainer():
     self.params[paramName2].max = self.params[paramName1].max
     self.params[paramName2].vary = False
     self.combinedParameters[paramName2] = paramName1
+    self.routingPlan = None
 
     if (hasattr(self, 'ptrGui')):
       self.ptrGui.removeSlider(paramName2)
@@ -187,46 +237,387 @@ class ModelContainer():
     for i in range(self.nModelsets):
       self.getModelset(i).plotDecoratedModel()
 
-  def updateModel(self):
-    # create a parameter container for each sub model respectively
-    p = Parameters()
-    for parameter in self.params:
-      if not parameter.rsplit('_',1)[0] in self.ptrExperiment.datasetSpecificParams:
-        # parameters that are not dataset specific are shared by all datasets
-        p.add(self.params[parameter])
-
-    for i in range(self.nModelsets):
+  def getRoutingPlan(self):
+    # the routing to the sub models is compiled once, every update only
+    # gathers the parameter values of each sub model
+    if self.routingPlan is None or not self.routingPlan.isValid(self.params):
+      self.routingPlan = RoutingPlan(self)
+      self.lastValues = None
+    return self.routingPlan
+
+  def getParameterNames(self):
+    '''
+    Names of the parameters in the order of the columns of evaluateBatch
+    '''
+    return list(self.getRoutingPlan().names)
+
+  def getParameterVector(self):
+    '''
+    Current parameter values in the order of getParameterNames
+    '''
+    plan = self.getRoutingPlan()
+    return plan.values(self.params)
+
+  def enableEvaluationCache(self, maxBytes=64*2**20, maxEntries=None, eviction='lru', quantum=1e-3):
+    '''
+    Keep the results of updateModel in an EvaluationCache, so that going
+    back to a parameter set that was already evaluated (parameter history,
+    sliders, the final evaluation of a fit) does not recalculate the model.
+    The default quantum matches the resolution of the gui sliders.
+    '''
+    self.evaluationCache = EvaluationCache(maxBytes, maxEntries, eviction, quantum)
+    return self.evaluationCache
+
+  def disableEvaluationCache(self):
+    self.evaluationCache = None
+
+  def setExecutor(self, executor='thread', workers=None):
+    '''
+    Calculate the modelsets that updateModel and calcModel recalculate
+    concurrently, e.g. the sa/la and p/m modelsets of a SANSPOL fit.
+    'thread' suits kernels that release the GIL, 'process' kernels that do
+    not. The worker processes map the domains from shared memory and
+    only receive the parameter values with every task. A
+    concurrent.futures.Executor is used as it is, None calculates the
+    modelsets one after the other. The pool is kept until the next
+    setExecutor or shutdownExecutor.
+    '''
+    self.shutdownExecutor()
+    self.executor, self.ownsExecutor = getExecutor(executor, workers)
+
+  def shutdownExecutor(self):
+    if self.executor is not None and self.ownsExecutor:
+      self.executor.shutdown()
+    self.executor = None
+    self.ownsExecutor = False
+    for kernel in self.sharedKernels.values():
+      kernel.release()
+    self.sharedKernels = {}
+
+  def getSharedKernel(self, i):
+    '''
+    ModelsetKernel of modelset i in shared memory, created again when the
+    domain or the resolution of the modelset changed
+    '''
+    subModel = self.getModelset(i)
+    kernel = self.sharedKernels.get(i)
+    if kernel is None or not kernel.matches(subModel):
+      if kernel is not None:
+        kernel.release()
+      kernel = ModelsetKernel(subModel).share()
+      self.sharedKernels[i] = kernel
+    return kernel
+
+  def calcModelsets(self, indices):
+    '''
+    Calculate the modelsets in indices, concurrently if an executor is set
+    '''
+    if self.executor is None or len(indices) < 2:
+      for i in indices:
+        self.calcModelset(i)
+      return
+    if not isinstance(self.executor, ProcessPoolExecutor):
+      for _ in self.executor.map(self.calcModelset, indices):
+        pass
+      return
+
+    # models whose calcModel is their evaluate are evaluated by the workers,
+    # the others meanwhile in this process
+    remote = [i for i in indices if type(self.getModelset(i)).stackable]
+    tasks = [
+      (self.getSharedKernel(i), parameterValues(self.getModelset(i).params))
+      for i in remote
+    ]
+    results = [self.executor.submit(_evaluateTask, task) for task in tasks]
+    for i in indices:
+      if not i in remote:
+        self.calcModelset(i)
+    for i, result in zip(remote, results):
       subModel = self.getModelset(i)
-      subP = p.copy()
-      for parameter in self.ptrExperiment.datasetSpecificParams:
-        specificTags = self.datasetSpecificParams[parameter]
-
-        if isinstance(subModel.suffix, str):
-          if subModel.suffix in specificTags:
-            suffixedParameter = parameter + '_' + subModel.suffix
-
-            if suffixedParameter in self.params:
-              specParam = self.params[suffixedParameter]
-              subP.add(
-                parameter, specParam.value,
-                min=specParam.min, max=specParam.max, vary=specParam.vary
-              )
-        elif isinstance(subModel.suffix, list):
-          for suffix in subModel.suffix:
-            if suffix in specificTags:
-              suffixedParameter = parameter + '_' + suffix
-              if suffixedParameter in self.params:
-                specParam = self.params[suffixedParameter]
-                subP.add(
-                  parameter, specParam.value,
-                  min=specParam.min, max=specParam.max, vary=specParam.vary
-                )
+      values = result.result()
+      if values is None:
+        # the model could not be calculated, e.g. without its real space grid
+        subModel.calcDecoratedModel()
+        continue
+      subModel.setValues(values)
+      modelClass = type(subModel)
+      kernel, _ = kernelChain(subModel, subModel.params)
+      profileFunction = getattr(modelClass, modelClass.kernelProfiles[kernel])
+      subModel.deferProfile(
+        modelClass.profileAttributes,
+        lambda f=profileFunction, theta=parameterValues(subModel.params): f(theta)
+      )
+
+  def enableStackedEvaluation(self):
+    '''
+    Calculate modelsets that only differ in their domain and the parameters
+    of their decorations, e.g. the resolution of different detector
+    distances, with a single kernel call on the concatenated domains
+    '''
+    self.stackedEvaluation = True
+
+  def disableStackedEvaluation(self):
+    self.stackedEvaluation = False
+
+  def setPrecision(self, precision, preview=None):
+    '''
+    Precision the modelsets, evaluateBatch and the residuum of the
+    experiment are calculated in, 'single' (float32) or 'double' (float64).
+    Single precision halves the memory of the values, the residua and the
+    batches, e.g. for coarse searches. Only the vectorized NumPy kernels,
+    e.g. of the generic models, calculate in float32. The compiled kernels
+    and the resolution smearing still calculate in double precision and
+    their results are cast afterwards, so their memory traffic and run
+    time stay the same. preview is the precision of the gui while a slider
+    is moved, by default the same. A fit in single precision is finished
+    in double precision, see Fit.promotePrecision.
+    '''
+    preview = precision if preview is None else preview
+    for name in (precision, preview):
+      assert name in precisions, f"precision has to be 'single' or 'double', got {name}"
+    self.precision = precision
+    self.previewPrecision = preview
+
+  def getDtype(self):
+    return precisions[self.precision]
+
+  @contextmanager
+  def evaluationPrecision(self, precision):
+    '''
+    Calculate in precision inside the with block, see setPrecision
+    '''
+    assert precision in precisions, f"precision has to be 'single' or 'double', got {precision}"
+    previous = self.precision
+    self.precision = precision
+    try:
+      yield
+    finally:
+      self.precision = previous
+
+  def applyPrecision(self, indices):
+    '''
+    Convert the values of the modelsets in indices to the precision
+    '''
+    dtype = self.getDtype()
+    for i in indices:
+      subModel = self.getModelset(i)
+      values = subModel.getValues()
+      if isinstance(values, np.ndarray) and values.dtype != dtype:
+        subModel.setValues(values.astype(dtype))
+
+  @contextmanager
+  def exactEvaluation(self):
+    '''
+    Use exact cache keys inside the with block, e.g. during a fit where
+    quantised keys would hide small parameter changes
+    '''
+    cache = self.evaluationCache
+    exact = cache.exact if cache is not None else None
+    if cache is not None:
+      cache.exact = True
+    try:
+      yield
+    finally:
+      if cache is not None:
+        cache.exact = exact
+
+  @contextmanager
+  def evaluationWindow(self, domainRange, padding=5):
+    '''
+    Inside the with block updateModel only calculates the modelsets on the
+    part of their domain within domainRange, widened by padding times the
+    width of their resolution. The values outside are nan. Used by the fits,
+    where the residuum only uses the points in the fit range.
+    None calculates the whole domain, e.g. to export during a fit.
+    '''
+    window = self.window
+    self.window = None if domainRange is None else (domainRange[0], domainRange[1], padding)
+    self.lastValues = None
+    try:
+      yield
+    finally:
+      self.window = window
+      self.lastValues = None
+
+  @contextmanager
+  def valuesPreset(self, values):
+    '''
+    Inside the with block updateModel routes the parameters as usual but
+    sets the given values on the modelsets instead of calculating them.
+    Used by fit routines that compose the model values themselves.
+
+    Parameters
+    ----------
+    values : list
+      Values of every modelset on its domain
+    '''
+    self.presetValues = values
+    try:
+      yield
+    finally:
+      self.presetValues = None
+
+  def changedDomains(self):
+    '''
+    Which modelsets got another domain array since the last updateModel,
+    e.g. by defineDomain, their values are recalculated even if their
+    parameters did not change. The cached values of the old domains are
+    dropped.
+    '''
+    domains = [self.getModelset(i).getDomain() for i in range(self.nModelsets)]
+    changed = np.ones(self.nModelsets, dtype=bool)
+    if len(domains) == len(self.lastDomains):
+      changed = np.fromiter(
+        (domain is not last for domain, last in zip(domains, self.lastDomains)),
+        dtype=bool, count=self.nModelsets
+      )
+    if changed.any() and self.evaluationCache is not None and len(self.lastDomains) > 0:
+      self.evaluationCache.clear()
+    self.lastDomains = domains
+    return changed
 
-      for parameter in self.combinedParameters:
-        if parameter in subP and self.combinedParameters[parameter] in subP:
-          subP[parameter].value = subP[self.combinedParameters[parameter]].value
-      subModel.params = subP
-      subModel.calcDecoratedModel()
+  def updateModel(self):
+    plan = self.getRoutingPlan()
+    values = plan.values(self.params)
+    if self.presetValues is not None:
+      for i in range(self.nModelsets):
+        subModel = self.getModelset(i)
+        subModel.params = plan.modelsetParams(i, values)
+        subModel.setValues(self.presetValues[i])
+      self.lastValues = None
+      self.updatedModelsets = [True] * self.nModelsets
+      return
+
+    # only modelsets fed by a changed parameter are recalculated, e.g. a
+    # Jacobian column of dTheta_sa only touches the small angle modelsets
+    if self.lastPrecision != self.precision:
+      self.lastValues = None
+    self.lastPrecision = self.precision
+    changed = plan.changedModelsets(self.lastValues, values) | self.changedDomains()
+    self.lastValues = values
+    self.updatedModelsets = changed.tolist()
+
+    cache = self.evaluationCache
+    if cache is not None and cache.quantum is not None and not cache.exact:
+      lower, upper = plan.bounds(self.params)
+
+    pending = []
+    keys = {}
+    for i in np.flatnonzero(changed).tolist():
+      subModel = self.getModelset(i)
+      subModel.params = plan.modelsetParams(i, values)
+      if cache is not None:
+        index = plan.indices[i]
+        # windowed values are only valid inside of the window
+        cacheIndex = i if self.window is None else (i,) + self.window
+        if self.precision != 'double':
+          cacheIndex = (cacheIndex, self.precision)
+        if cache.quantum is not None and not cache.exact:
+          keys[i] = cache.key(cacheIndex, values[index], lower[index], upper[index])
+        else:
+          keys[i] = cache.key(cacheIndex, values[index])
+        entry = cache.get(keys[i])
+        if entry is not None:
+          subModel.setValues(entry[0])
+          subModel.setProfile(entry[1])
+          continue
+      pending.append(i)
+
+    restricted = {}
+    if self.window is not None:
+      for i in pending:
+        restricted[i] = restrictDomain(self.getModelset(i), *self.window)
+    # modelsets without a point in the window are not calculated at all
+    calculated = [
+      i for i in pending
+      if restricted.get(i) is None or restricted[i][2].any()
+    ]
+
+    try:
+      if self.stackedEvaluation:
+        calcStacked([self.getModelset(i) for i in calculated], self.getWorkspace('stacked'))
+      else:
+        self.calcModelsets(calculated)
+      self.applyPrecision(calculated)
+    finally:
+      for i, state in restricted.items():
+        if state is not None:
+          restoreDomain(self.getModelset(i), state)
+
+    if cache is not None:
+      for i in pending:
+        subModel = self.getModelset(i)
+        cache.put(keys[i], subModel.getValues(), subModel.profileSnapshot())
+
+  def getDomainSizes(self):
+    '''
+    Number of points of every modelset, the columns of evaluateBatch are
+    split accordingly
+    '''
+    return [len(self.getModelset(i).getDomain()) for i in range(self.nModelsets)]
+
+  def evaluateBatch(self, thetaMatrix, executor='thread', workers=None):
+    '''
+    Evaluate the decorated model of all modelsets for many parameter sets,
+    without changing the state of the container or the modelsets.
+
+    Parameters
+    ----------
+    thetaMatrix : np.ndarray
+      (N, P) array, every row is a parameter vector in the order of
+      getParameterNames. Expressions and bounds of the parameters are not
+      applied, the values are used as they are.
+    executor : None, 'thread', 'process' or concurrent.futures.Executor
+      How models without a vectorized kernel are evaluated. None evaluates
+      sequentially, 'thread' and 'process' create a pool with workers
+      workers for the duration of the call.
+    workers : int
+      Number of workers of a created pool
+
+    Returns
+    -------
+    np.ndarray
+      (N, total_points) array with the values of all modelsets concatenated
+      in the order of the modelsets, in the precision of the container
+    '''
+    thetaMatrix = np.atleast_2d(np.asarray(thetaMatrix, dtype=float))
+    plan = self.getRoutingPlan()
+    assert thetaMatrix.ndim == 2 and thetaMatrix.shape[1] == len(plan.names), (
+      f'thetaMatrix has to be of shape (N, {len(plan.names)}), got {thetaMatrix.shape}'
+    )
+    nSets = thetaMatrix.shape[0]
+
+    kernels = [ModelsetKernel(self.getModelset(i)) for i in range(self.nModelsets)]
+    offsets = np.cumsum([0] + [len(kernel.domain) for kernel in kernels])
+    dtype = self.getDtype()
+    values = np.empty((nSets, offsets[-1]), dtype=dtype)
+
+    tasks = []
+    slices = []
+    for i, kernel in enumerate(kernels):
+      columns = slice(offsets[i], offsets[i+1])
+      if kernel.isVectorized():
+        # parameters as columns, the kernel broadcasts them against the domain
+        local = thetaMatrix[:, plan.indices[i]].astype(dtype, copy=False)
+        theta = {name: local[:, [j]] for j, name in enumerate(plan.localNames[i])}
+        # without decorations the kernel is the evaluate of the model class,
+        # which then calculates in the precision of the domain
+        values[:, columns] = kernel.modelClass.evaluate(kernel.domain.astype(dtype, copy=False), theta)
+        continue
+      for n in range(nSets):
+        tasks.append((kernel, plan.modelsetParams(i, thetaMatrix[n])))
+        slices.append((n, columns))
+
+    if len(tasks) > 0:
+      pool, owned = getExecutor(executor, workers)
+      try:
+        chunksize = max(1, len(tasks) // (4 * (workers or 4)))
+        for (n, columns), result in zip(slices, mapTasks(pool, tasks, chunksize)):
+          values[n, columns] = result
+      finally:
+        if owned:
+          pool.shutdown()
+    return values
 
   def draw(self):
     self.ptrGui.update()
@@ -265,8 +656,50 @@ class ModelContainer():
     print("Updated script file: " + script_file_name)
 
   def calcModel(self):
-    for i in range(self.nModelsets):
-      self.getModelset(i).calcDecoratedModel()
+    if len(self.params) > 0:
+      # the modelsets are calculated for the parameters of the container
+      plan = self.getRoutingPlan()
+      values = plan.values(self.params)
+      for i in range(self.nModelsets):
+        self.getModelset(i).params = plan.modelsetParams(i, values)
+    self.lastValues = None
+    self.updatedModelsets = [True] * self.nModelsets
+    if self.stackedEvaluation:
+      calcStacked(self.modelsets, self.getWorkspace('stacked'))
+    else:
+      self.calcModelsets(list(range(self.nModelsets)))
+    self.applyPrecision(range(self.nModelsets))
+
+  def calcModelset(self, i):
+    '''
+    Calculate modelset i through its DecorationPlan, which is compiled on
+    the first call
+    '''
+    subModel = self.getModelset(i)
+    if not type(subModel).stackable:
+      subModel.calcDecoratedModel()
+      return
+    if not i in self.decorationPlans:
+      self.decorationPlans[i] = DecorationPlan(subModel, self.getWorkspace(i))
+    self.decorationPlans[i].calc(self.getDtype())
+
+  def getWorkspace(self, i):
+    '''
+    Workspace of modelset i, created on the first call. The stacked
+    evaluation uses the one of 'stacked'.
+    '''
+    if not i in self.workspaces:
+      self.workspaces[i] = Workspace()
+    return self.workspaces[i]
+
+  def getWorkspaceAllocations(self):
+    '''
+    Number of arrays allocated by the workspaces so far, it does not grow
+    anymore once all domains were evaluated with their current sizes. The
+    temporaries of the kernels and the residua are not counted, see
+    Workspace.
+    '''
+    return sum(workspace.allocations for workspace in self.workspaces.values())
 
   def callModelFunctions(self, functionName, *param):
     for i in range(self.nModelsets):
@@ -274,6 +707,9 @@ class ModelContainer():
       getattr(model, functionName)(*param)
 
   def setResolution(self, suffices=None):
+    self.lastValues = None
+    if self.evaluationCache is not None:
+      self.evaluationCache.clear()
     for i in range(self.nModelsets):
       data = self.ptrExperiment.data.getDataset(i)
       model = self.ptrExperiment.model.getModelset(i)
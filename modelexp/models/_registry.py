@@ -0,0 +1,60 @@
+import importlib
+
+class LazyRegistry():
+  '''
+  Registry of the classes a models package exports.
+  Every class is listed by name together with the private submodule that
+  defines it. The submodule, and with it the compiled kernels it imports,
+  is only loaded when the class is accessed for the first time.
+  '''
+  def __init__(self, package, models, decorations=None):
+    """
+    Parameters
+    ----------
+    package : str
+      Name of the package the registry belongs to (__name__)
+    models : dict
+      Class name -> relative module name of the models of the package
+    decorations : dict
+      Class name -> relative module name of the decorations of the package
+    """
+    self.package = package
+    self.models = models
+    self.decorations = decorations if decorations is not None else {}
+
+  def __contains__(self, name):
+    return name in self.models or name in self.decorations
+
+  def load(self, name):
+    if name in self.models:
+      module = self.models[name]
+    elif name in self.decorations:
+      module = self.decorations[name]
+    else:
+      raise AttributeError(f'module {self.package!r} has no attribute {name!r}')
+    return getattr(importlib.import_module(module, self.package), name)
+
+  def listModels(self):
+    return sorted(self.models)
+
+  def listDecorations(self):
+    return sorted(self.decorations)
+
+  def names(self):
+    return sorted(list(self.models) + list(self.decorations))
+
+def lazyModule(namespace, registry):
+  '''
+  Returns the module level __getattr__ and __dir__ functions of a package
+  whose classes are served by registry. Loaded classes are stored in the
+  namespace of the package, so that __getattr__ is only hit once per class.
+  '''
+  def __getattr__(name):
+    value = registry.load(name)
+    namespace[name] = value
+    return value
+
+  def __dir__():
+    return sorted(set(namespace) | set(registry.names()))
+
+  return __getattr__, __dir__
@@ -0,0 +1,95 @@
+import numpy as np
+from ._model import ParameterValue
+
+class RoutingPlan():
+  '''
+  Routing of the parameters of a ModelContainer to its modelsets.
+  Which container parameter ends up as which parameter of a modelset only
+  depends on the parameter names, the dataset specific parameters, the
+  suffices of the modelsets and the combined parameters. It is resolved once
+  into an index array per modelset, so that updating the modelsets is a
+  gather from the vector of parameter values.
+  '''
+  def __init__(self, container):
+    self.names = tuple(container.params)
+    self.localNames = []
+    self.indices = []
+
+    position = {name: i for i, name in enumerate(self.names)}
+    datasetSpecificParams = {
+      parameter: set(tags)
+      for parameter, tags in container.ptrExperiment.datasetSpecificParams.items()
+    }
+    # parameters that are not dataset specific are shared by all datasets
+    shared = [
+      name for name in self.names
+      if not name.rsplit('_', 1)[0] in datasetSpecificParams
+    ]
+
+    for model in container.modelsets:
+      route = {name: position[name] for name in shared}
+
+      if isinstance(model.suffix, str):
+        suffices = [model.suffix]
+      elif isinstance(model.suffix, list):
+        suffices = model.suffix
+      else:
+        suffices = []
+      for parameter in datasetSpecificParams:
+        specificTags = datasetSpecificParams[parameter]
+        for suffix in suffices:
+          suffixedParameter = parameter + '_' + suffix
+          if suffix in specificTags and suffixedParameter in position:
+            route[parameter] = position[suffixedParameter]
+
+      for parameter, combinedWith in container.combinedParameters.items():
+        if parameter in route and combinedWith in route:
+          route[parameter] = route[combinedWith]
+
+      self.localNames.append(tuple(route))
+      self.indices.append(np.fromiter(route.values(), dtype=np.intp, count=len(route)))
+
+    # dependents[j, i] is True if container parameter j feeds modelset i
+    self.dependents = np.zeros((len(self.names), len(self.indices)), dtype=bool)
+    for i, index in enumerate(self.indices):
+      self.dependents[index, i] = True
+
+  def isValid(self, params):
+    '''
+    Whether the plan was compiled for parameters with these names
+    '''
+    return len(params) == len(self.names) and tuple(params) == self.names
+
+  def values(self, params):
+    '''
+    Vector of the values of the container parameters
+    '''
+    # isValid ensures that params iterates in the order of names
+    return np.fromiter(
+      (parameter.value for parameter in params.values()), dtype=float, count=len(self.names)
+    )
+
+  def changedModelsets(self, previous, values):
+    '''
+    Which modelsets get different parameters for values than for previous
+    '''
+    if previous is None or len(previous) != len(values):
+      return np.ones(len(self.indices), dtype=bool)
+    changed = np.nonzero(previous != values)[0]
+    return self.dependents[changed].any(axis=0)
+
+  def bounds(self, params):
+    '''
+    Vectors of the lower and upper bounds of the container parameters
+    '''
+    lower = np.array([params[name].min for name in self.names], dtype=float)
+    upper = np.array([params[name].max for name in self.names], dtype=float)
+    return lower, upper
+
+  def modelsetParams(self, i, values):
+    '''
+    Parameter values of modelset i as dict of ParameterValue
+    '''
+    return dict(zip(
+      self.localNames[i], map(ParameterValue, values[self.indices[i]].tolist())
+    ))
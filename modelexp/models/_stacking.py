@@ -0,0 +1,81 @@
+import numpy as np
+from ._decoration import Decoration
+from ._model import DeferredProfile, parameterValues
+
+def kernelChain(model, theta):
+  '''
+  Returns the name of the classmethod of the model class that computes the
+  undecorated values of model for theta, and the decorations, the outermost
+  first
+  '''
+  decorations = []
+  decoration = model.decoration
+  while isinstance(decoration, Decoration):
+    decorations.append(decoration)
+    decoration = decoration.ptrModel
+  kernel = 'evaluate'
+  for decoration in decorations:
+    kernel = decoration.kernelName(kernel, theta)
+  return kernel, decorations
+
+def kernelKey(model, kernel, decorations, theta):
+  '''
+  Modelsets with the same key compute their undecorated values with the
+  same kernel call, only on different domains
+  '''
+  valueParameters = set()
+  for decoration in decorations:
+    valueParameters.update(decoration.valueParameters)
+  return (type(model), kernel, tuple(
+    (name, float(theta[name])) for name in theta if not name in valueParameters
+  ))
+
+def calcStacked(models, workspace=None):
+  '''
+  Calculate the decorated values and profiles of models, like
+  calcDecoratedModel of every model. Models that share model class, kernel
+  and kernel parameters, e.g. the detector distances of a SANS measurement,
+  are evaluated by a single kernel call on their concatenated domains. The
+  values are split up again and every model applies its decorations, e.g.
+  its resolution, on its own domain. The concatenated domains are written
+  into an array of workspace if one is given.
+  '''
+  groups = {}
+  for model in models:
+    if not type(model).stackable:
+      model.calcDecoratedModel()
+      continue
+    theta = model.params
+    kernel, decorations = kernelChain(model, theta)
+    # domains[k] is the domain seen by decorations[k], the last one the kernel domain
+    domains = [model.getDomain()]
+    for decoration in decorations:
+      domains.append(decoration.transformDomain(domains[-1], theta))
+    key = kernelKey(model, kernel, decorations, theta)
+    groups.setdefault(key, []).append((model, decorations, domains))
+
+  for (modelClass, kernel, _), members in groups.items():
+    theta = members[0][0].params
+    sizes = [len(domains[-1]) for _, _, domains in members]
+    out = None
+    if workspace is not None:
+      out = workspace.get(('stacked', modelClass.__name__, kernel), (sum(sizes),))
+    values = getattr(modelClass, kernel)(
+      np.concatenate([domains[-1] for _, _, domains in members], out=out), theta
+    )
+    if values is None:
+      # the model could not be calculated, e.g. without its real space grid
+      for model, _, _ in members:
+        model.calcDecoratedModel()
+      continue
+    segments = np.split(np.asarray(values), np.cumsum(sizes)[:-1])
+
+    # calculated once for the group, when the first profile is read
+    profileFunction = getattr(modelClass, modelClass.kernelProfiles[kernel])
+    profile = DeferredProfile(lambda f=profileFunction, theta=parameterValues(theta): f(theta))
+
+    for (model, decorations, domains), segment in zip(members, segments):
+      for k in reversed(range(len(decorations))):
+        segment = decorations[k].transformValues(domains[k], segment, model.params)
+      model.setValues(segment)
+      model.deferProfile(modelClass.profileAttributes, profile)
@@ -0,0 +1,47 @@
+import numpy as np
+from ._decoration import Decoration
+
+def resolutionWidth(model, domain, theta):
+  '''
+  Width by which the decorations of model mix the values at every point of
+  domain, the widths of chained decorations add up
+  '''
+  width = np.zeros(len(domain))
+  decoration = model.decoration
+  while isinstance(decoration, Decoration):
+    width = width + decoration.resolutionWidth(domain, theta)
+    domain = decoration.transformDomain(domain, theta)
+    decoration = decoration.ptrModel
+  return width
+
+def restrictDomain(model, lower, upper, padding):
+  '''
+  Restrict the domain of model, and the resolution of its dataset, to the
+  points between lower and upper widened by padding times the resolution
+  width, so that smearing the values stays correct between lower and upper.
+  Returns what restoreDomain needs, None if all points are needed.
+  '''
+  domain = model.getDomain()
+  width = padding * resolutionWidth(model, domain, model.params)
+  mask = (domain + width >= lower) & (domain - width <= upper)
+  if mask.all():
+    return None
+  resolution = model.getResolution() if hasattr(model, 'getResolution') else None
+  model.defineDomain(domain[mask])
+  if resolution is not None:
+    model.setResolution(resolution[mask])
+  return domain, resolution, mask
+
+def restoreDomain(model, restricted):
+  '''
+  Undo restrictDomain, the values outside of the window are nan
+  '''
+  domain, resolution, mask = restricted
+  calculated = model.getValues() if mask.any() else None
+  values = np.full(len(domain), np.nan, dtype=getattr(calculated, 'dtype', float))
+  if calculated is not None:
+    values[mask] = calculated
+  model.defineDomain(domain)
+  if resolution is not None:
+    model.setResolution(resolution)
+  model.setValues(values)
@@ -0,0 +1,56 @@
+import contextlib, contextvars
+import numpy as np
+
+active = contextvars.ContextVar('workspace', default=None)
+
+class Workspace():
+  '''
+  Named arrays of one modelset that are reused from evaluation to
+  evaluation, e.g. the shifted domains of a DecorationPlan. An array is only
+  allocated again if its shape or dtype changes, allocations counts how
+  often that happened, so that a steady state fit can be checked to not
+  allocate any workspace at all.
+
+  While a DecorationPlan evaluates its modelset the workspace is active,
+  SAXSModel.scaleIntensity writes the intensity into it and the resolution
+  decorations their smeared values. Only the arrays of the workspace are
+  counted, the temporaries inside of the kernels are not seen here.
+  '''
+  def __init__(self):
+    self.arrays = {}
+    self.allocations = 0
+
+  def get(self, name, shape, dtype=float):
+    '''
+    Array stored under name with shape and dtype, its content is undefined
+    '''
+    array = self.arrays.get(name)
+    if array is None or array.shape != tuple(np.atleast_1d(shape)) or array.dtype != dtype:
+      array = np.empty(shape, dtype=dtype)
+      self.arrays[name] = array
+      self.allocations += 1
+    return array
+
+  @contextlib.contextmanager
+  def activate(self):
+    '''
+    Make this the workspace of activeWorkspace inside the with block
+    '''
+    token = active.set(self)
+    try:
+      yield self
+    finally:
+      active.reset(token)
+
+  def nbytes(self):
+    return sum(array.nbytes for array in self.arrays.values())
+
+  def clear(self):
+    self.arrays = {}
+
+def activeWorkspace():
+  '''
+  Workspace of the modelset that is evaluated in this thread, None outside
+  of a DecorationPlan
+  '''
+  return active.get()
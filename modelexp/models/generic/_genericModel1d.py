@@ -65,6 +65,9 @@ class GenericModel1d(Model):
     self.plotModel()
     # self.modelPlot.set_ydata(self.y)
 
+  def calcModel(self):
+    self.y = self.evaluate(self.x, self.params)
+
   def calcDecoratedModel(self):
     if isinstance(self.decoration, Decoration):
       self.decoration.calcModel()
@@ -4,9 +4,13 @@ class Linear(GenericModel1d):
   '''
   Model to describe a linear function
   '''
+  vectorized = True
+  linearParameters = ('m', 'y0')
+
   def initParameters(self):
     self.params.add('m', 1) # Slope
     self.params.add('y0', 1) # y-intercept
 
-  def calcModel(self):
-    self.y = self.params['m']*self.x + self.params['y0']
\ No newline at end of file
+  @classmethod
+  def evaluate(cls, x, theta):
+    return theta['m']*x + theta['y0']
\ No newline at end of file
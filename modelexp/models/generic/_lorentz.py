@@ -4,6 +4,8 @@ class Lorentzian(GenericModel1d):
   '''
   Model to describe a parabola
   '''
+  vectorized = True
+  linearParameters = ('a', 'offset')
 
   def initParameters(self):
     self.params.add('a', 1) # Amplitude of parabola
@@ -11,8 +13,9 @@ class Lorentzian(GenericModel1d):
     self.params.add('beta', 1) # fwhm
     self.params.add('offset', 0) # offset
 
-  def calcModel(self):
-    self.y = (
-      self.params['a']/(1 + (pi*(self.x - self.params['x0']) / self.params['beta'])**2)
-      + self.params['offset']
+  @classmethod
+  def evaluate(cls, x, theta):
+    return (
+      theta['a']/(1 + (pi*(x - theta['x0']) / theta['beta'])**2)
+      + theta['offset']
     )
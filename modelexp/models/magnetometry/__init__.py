@@ -1,3 +1,17 @@
-from ._langevin import Langevin
-from ._langevinMuWeighted import LangevinMuWeighted
-from ._twoLangevin import TwoLangevin
\ No newline at end of file
+from .._registry import LazyRegistry as _LazyRegistry, lazyModule as _lazyModule
+
+# models are imported on first access, see LazyRegistry, their fortMag
+# kernels on their first call, see modelexp.kernels
+_registry = _LazyRegistry(__name__, {
+  'Langevin': '._langevin',
+  'LangevinMuWeighted': '._langevinMuWeighted',
+  'TwoLangevin': '._twoLangevin',
+})
+
+__getattr__, __dir__ = _lazyModule(globals(), _registry)
+__all__ = _registry.names()
+
+def list_models():
+  """Names of the models available in this package, without importing them
+  """
+  return _registry.listModels()
@@ -1,10 +1,12 @@
 from ._magnetizationModel import MagnetizationModel
-from fortMag import langevin
+from modelexp.kernels.mag import langevin
 
 class Langevin(MagnetizationModel):
   '''
   Model to describe a linear function
   '''
+  linearParameters = ('Ms', 'chi')
+
   def __init__(self, parent):
     super().__init__(parent)
     self.kB = 1.3806485e-23 # J/K
@@ -19,11 +21,12 @@ class Langevin(MagnetizationModel):
     self.params.add('T', 298.25, vary=False) # fixed to 25deg C
     self.addConstantParam('T')
 
-  def calcModel(self):
-    self.M = langevin.magnetization(
-      self.B,
-      self.params['Ms'],
-      self.params['mu'],
-      self.params['T'],
-      self.params['sigMu']
-    ) + self.params['chi']*self.B
+  @classmethod
+  def evaluate(cls, B, theta):
+    return langevin.magnetization(
+      B,
+      theta['Ms'],
+      theta['mu'],
+      theta['T'],
+      theta['sigMu']
+    ) + theta['chi']*B
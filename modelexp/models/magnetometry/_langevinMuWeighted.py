@@ -1,11 +1,13 @@
 from ._magnetizationModel import MagnetizationModel
-from fortMag import langevin
+from modelexp.kernels import gauss
+from modelexp.kernels.mag import langevin
 
-from numpy.polynomial.hermite import hermgauss
 class LangevinMuWeighted(MagnetizationModel):
   '''
   Model to describe a linear function
   '''
+  linearParameters = ('Ms', 'chi')
+
   def __init__(self, parent):
     super().__init__(parent)
     self.kB = 1.3806485e-23 # J/K
@@ -22,13 +24,12 @@ class LangevinMuWeighted(MagnetizationModel):
     self.addConstantParam('orderHermite')
     self.addConstantParam('T')
 
-  def calcModel(self):
-    self.x_herm, self.w_herm = hermgauss(int(self.params['orderHermite']))
-    self.M = langevin.mu_weighted_magnetization(
-      self.B,
-      self.params['Ms'],
-      self.params['mu'],
-      self.params['T'],
-      self.params['sigMu'],
-      self.x_herm, self.w_herm
-    ) + self.params['chi']*self.B
+  @classmethod
+  def evaluate(cls, B, theta):
+    return gauss(langevin.mu_weighted_magnetization, theta['orderHermite'])(
+      B,
+      theta['Ms'],
+      theta['mu'],
+      theta['T'],
+      theta['sigMu']
+    ) + theta['chi']*B
@@ -65,6 +65,9 @@ class MagnetizationModel(Model):
     self.plotModel()
     # self.modelPlot.set_ydata(self.M)
 
+  def calcModel(self):
+    self.M = self.evaluate(self.B, self.params)
+
   def calcDecoratedModel(self):
     if isinstance(self.decoration, Decoration):
       self.decoration.calcModel()
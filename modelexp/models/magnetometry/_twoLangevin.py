@@ -1,10 +1,12 @@
 from ._magnetizationModel import MagnetizationModel
-from fortMag import langevin
+from modelexp.kernels.mag import langevin
 
 class TwoLangevin(MagnetizationModel):
   '''
   Model to describe a linear function
   '''
+  linearParameters = ('Ms1', 'Ms2', 'chi')
+
   def __init__(self, parent):
     super().__init__(parent)
     self.kB = 1.3806485e-23 # J/K
@@ -20,17 +22,12 @@ class TwoLangevin(MagnetizationModel):
     self.params.add('T', 298.25, vary=False) # fixed to 25deg C
     self.addConstantParam('T')
 
-  def calcModel(self):
-    self.M = langevin.magnetization(
-      self.B,
-      self.params['Ms1'],
-      self.params['mu1'],
-      self.params['T'],
-      0.0
-    ) + langevin.magnetization(
-      self.B,
-      self.params['Ms2'],
-      self.params['mu2'],
-      self.params['T'],
+  @classmethod
+  def evaluate(cls, B, theta):
+    return langevin.magnetization_populations(
+      B,
+      [theta['Ms1'], theta['Ms2']],
+      [theta['mu1'], theta['mu2']],
+      theta['T'],
       0.0
-    ) + self.params['chi']*self.B
+    ) + theta['chi']*B
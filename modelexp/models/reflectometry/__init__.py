@@ -1,40 +1,53 @@
 from ._reflModel import ReflectometryModel
+from .._registry import LazyRegistry as _LazyRegistry, lazyModule as _lazyModule
 
-from ._sphereCSStacked import SphereCSStacked
-from ._sphereCSStackedSpacer import SphereCSStackedSpacer
-from ._sphereCSStackedLinearSpacer import SphereCSStackedLinearSpacer
-from ._sphereCSStackedParabolicSpacer import SphereCSStackedParabolicSpacer
-from ._sphereCSStacked5 import SphereCSStacked5
-from ._sphereCSStacked5Spacer import SphereCSStacked5Spacer
-from ._sphereCSStacked6 import SphereCSStacked6
-from ._sphereCSStacked6Spacer import SphereCSStacked6Spacer
-from ._sphereCSStacked11Spacer import SphereCSStacked11Spacer
-from ._cmplx_sphereCSStacked import CmplxSphereCSStacked
-from ._cmplx_sphereCSStacked11Spacer import CmplxSphereCSStacked11Spacer
+# models and decorations are imported on first access, see LazyRegistry,
+# their fortRefl kernels on their first call, see modelexp.kernels
+_registry = _LazyRegistry(__name__, {
+  'SphereCSStacked': '._sphereCSStacked',
+  'SphereCSStackedSpacer': '._sphereCSStackedSpacer',
+  'SphereCSStackedLinearSpacer': '._sphereCSStackedLinearSpacer',
+  'SphereCSStackedParabolicSpacer': '._sphereCSStackedParabolicSpacer',
+  'SphereCSStacked5': '._sphereCSStacked5',
+  'SphereCSStacked5Spacer': '._sphereCSStacked5Spacer',
+  'SphereCSStacked6': '._sphereCSStacked6',
+  'SphereCSStacked6Spacer': '._sphereCSStacked6Spacer',
+  'SphereCSStacked11Spacer': '._sphereCSStacked11Spacer',
+  'CmplxSphereCSStacked': '._cmplx_sphereCSStacked',
+  'CmplxSphereCSStacked11Spacer': '._cmplx_sphereCSStacked11Spacer',
 
-from ._sphereCSSStacked import SphereCSSStacked
-from ._sphereCSSStacked6Spacer import SphereCSSStacked6Spacer
-from ._cmplx_sphereCSSStacked import CmplxSphereCSSStacked
-from ._cmplx_sphereCSSStacked6Spacer import CmplxSphereCSSStacked6Spacer
+  'SphereCSSStacked': '._sphereCSSStacked',
+  'SphereCSSStacked6Spacer': '._sphereCSSStacked6Spacer',
+  'CmplxSphereCSSStacked': '._cmplx_sphereCSSStacked',
+  'CmplxSphereCSSStacked6Spacer': '._cmplx_sphereCSSStacked6Spacer',
 
-from ._cubeCSStacked import CubeCSStacked
-from ._cubeCSDoubleLayer import CubeCSDoubleLayer
-from ._cubeCSDoubleLayerOnSpacer import CubeCSDoubleLayerOnSpacer
-from ._cubeCSDoubleLayerNoSpacer import CubeCSDoubleLayerNoSpacer
-from ._oneLayer import OneLayer
-from ._substrate import Substrate
-from ._cubeCSMonolayer import CubeCSMonolayer
-from ._cubeCSMonolayerOnSpacer import CubeCSMonolayerOnSpacer
-from ._cubeCSMonolayerOnSpacerReducedMagnetism import CubeCSMonolayerOnSpacerReducedMagnetism
-from ._cubeCSMonolayerOnSpacerPartial import CubeCSMonolayerOnSpacerPartial
+  'CubeCSStacked': '._cubeCSStacked',
+  'CubeCSDoubleLayer': '._cubeCSDoubleLayer',
+  'CubeCSDoubleLayerOnSpacer': '._cubeCSDoubleLayerOnSpacer',
+  'CubeCSDoubleLayerNoSpacer': '._cubeCSDoubleLayerNoSpacer',
+  'OneLayer': '._oneLayer',
+  'Substrate': '._substrate',
+  'CubeCSMonolayer': '._cubeCSMonolayer',
+  'CubeCSMonolayerOnSpacer': '._cubeCSMonolayerOnSpacer',
+  'CubeCSMonolayerOnSpacerReducedMagnetism': '._cubeCSMonolayerOnSpacerReducedMagnetism',
+  'CubeCSMonolayerOnSpacerPartial': '._cubeCSMonolayerOnSpacerPartial',
 
-from ._cmplx_cubeCSDoublelayerOnSpacer import CmplxCubeCSDoublelayerOnSpacer
-from ._cmplx_cubeCSDoublelayerOnSpacerNoPMMA import CmplxCubeCSDoublelayerOnSpacerNoPmma
-from ._cmplx_cubeCSMonolayerOnSpacer import CmplxCubeCSMonolayerOnSpacer
+  'CmplxCubeCSDoublelayerOnSpacer': '._cmplx_cubeCSDoublelayerOnSpacer',
+  'CmplxCubeCSDoublelayerOnSpacerNoPmma': '._cmplx_cubeCSDoublelayerOnSpacerNoPMMA',
+  'CmplxCubeCSMonolayerOnSpacer': '._cmplx_cubeCSMonolayerOnSpacer',
+}, {
+  # decorating functions
+  'InstrumentalResolution': '._instrumentalResolution',
+  'DataResolution': '._dataResolution',
+  'Magnetic': '._magnetic',
+  'MagneticSF': '._magneticSF',
+  'ShiftQ': '._shiftQ',
+})
 
-# decorating functions
-from ._instrumentalResolution import InstrumentalResolution
-from ._dataResolution import DataResolution
-from ._magnetic import Magnetic
-from ._magneticSF import MagneticSF
-from ._shiftQ import ShiftQ
\ No newline at end of file
+__getattr__, __dir__ = _lazyModule(globals(), _registry)
+__all__ = ['ReflectometryModel'] + _registry.names()
+
+def list_models():
+  """Names of the models available in this package, without importing them
+  """
+  return _registry.listModels()
@@ -1,5 +1,6 @@
 from ._reflModel import ReflectometryModel
-from fortRefl import nanocubes, algorithms, math
+from modelexp.kernels.refl import nanocubes, algorithms, math
+from ._substrateReflectivity import substrateReflectivity
 import numpy as np
 from numpy.polynomial.hermite import hermgauss
 
@@ -116,7 +117,7 @@ class CmplxCubeCSDoublelayerOnSpacer(ReflectometryModel):
       0
     ]
 
-    Isubstrate = algorithms.parrat(
+    Isubstrate = substrateReflectivity.evaluate(
       self.q,
       [reSldSub - 1j*imSldSub, 0],
       [roughSub, 0],
@@ -142,7 +143,7 @@ class CmplxCubeCSDoublelayerOnSpacer(ReflectometryModel):
       roughness,
       thickness
     )
-    self.sld = algorithms.roughsld_thick_layers(self.z, sld, roughness, thickness).real
+    self.deferRoughSld('sld', sld, roughness, thickness)
     self.I = self.params["i0"] * (
       coverage * IparticleLayer + (1 - coverage) * Isubstrate
     )  + self.params["bg"]
@@ -205,7 +206,7 @@ class CmplxCubeCSDoublelayerOnSpacer(ReflectometryModel):
       0
     ]
 
-    Isubstrate = algorithms.parrat(
+    Isubstrate = substrateReflectivity.evaluate(
       self.q,
       [sldSub, 0],
       [roughSub, 0],
@@ -221,5 +222,5 @@ class CmplxCubeCSDoublelayerOnSpacer(ReflectometryModel):
     self.I = self.params["i0"] * (
       coverage * IparticleLayer + (1 - coverage) * Isubstrate
     )  + self.params["bg"]
-    self.sld = algorithms.roughsld_thick_layers(self.z, sld, roughness, thickness).real
-    self.sldMag = algorithms.roughsld_thick_layers(self.z, sldMag, roughness, thickness).real
+    self.deferRoughSld('sld', sld, roughness, thickness)
+    self.deferRoughSld('sldMag', sldMag, roughness, thickness)
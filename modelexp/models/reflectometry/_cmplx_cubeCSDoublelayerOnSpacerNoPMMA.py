@@ -1,5 +1,6 @@
 from ._reflModel import ReflectometryModel
-from fortRefl import nanocubes, algorithms, math
+from modelexp.kernels.refl import nanocubes, algorithms, math
+from ._substrateReflectivity import substrateReflectivity
 import numpy as np
 from numpy.polynomial.hermite import hermgauss
 
@@ -104,7 +105,7 @@ class CmplxCubeCSDoublelayerOnSpacerNoPmma(ReflectometryModel):
       0
     ]
 
-    Isubstrate = algorithms.parrat(
+    Isubstrate = substrateReflectivity.evaluate(
       self.q,
       [reSldSub - 1j*imSldSub, 0],
       [roughSub, 0],
@@ -129,7 +130,7 @@ class CmplxCubeCSDoublelayerOnSpacerNoPmma(ReflectometryModel):
       roughness,
       thickness
     )
-    self.sld = algorithms.roughsld_thick_layers(self.z, sld, roughness, thickness).real
+    self.deferRoughSld('sld', sld, roughness, thickness)
     self.I = self.params["i0"] * (
       coverage * IparticleLayer + (1 - coverage) * Isubstrate
     )  + self.params["bg"]
@@ -192,7 +193,7 @@ class CmplxCubeCSDoublelayerOnSpacerNoPmma(ReflectometryModel):
       0
     ]
 
-    Isubstrate = algorithms.parrat(
+    Isubstrate = substrateReflectivity.evaluate(
       self.q,
       [sldSub, 0],
       [roughSub, 0],
@@ -208,5 +209,5 @@ class CmplxCubeCSDoublelayerOnSpacerNoPmma(ReflectometryModel):
     self.I = self.params["i0"] * (
       coverage * IparticleLayer + (1 - coverage) * Isubstrate
     )  + self.params["bg"]
-    self.sld = algorithms.roughsld_thick_layers(self.z, sld, roughness, thickness).real
-    self.sldMag = algorithms.roughsld_thick_layers(self.z, sldMag, roughness, thickness).real
+    self.deferRoughSld('sld', sld, roughness, thickness)
+    self.deferRoughSld('sldMag', sldMag, roughness, thickness)
@@ -1,5 +1,6 @@
 from ._reflModel import ReflectometryModel
-from fortRefl import nanocubes, algorithms
+from modelexp.kernels.refl import nanocubes, algorithms
+from ._substrateReflectivity import substrateReflectivity
 import numpy as np
 
 class CubeCSDoubleLayer(ReflectometryModel):
@@ -88,7 +89,7 @@ class CubeCSDoubleLayer(ReflectometryModel):
       thickness
     )
 
-    Isubstrate = algorithms.parrat(
+    Isubstrate = substrateReflectivity.evaluate(
       self.q,
       [sldSub, 0],
       [roughSub, roughSub],
@@ -100,7 +101,7 @@ class CubeCSDoubleLayer(ReflectometryModel):
     self.I = self.params["i0"] * (
       self.params['coverage'] * IparticleLayer + (1-self.params['coverage']) * Isubstrate
     )  + self.params["bg"]
-    self.sld = algorithms.roughsld_thick_layers(self.z, sld, roughness, thickness).real
+    self.deferRoughSld('sld', sld, roughness, thickness)
 
   def calcMagneticModel(self):
     a = self.params['a'].value
@@ -173,7 +174,7 @@ class CubeCSDoubleLayer(ReflectometryModel):
       thickness
     )
 
-    Isubstrate = algorithms.parrat(
+    Isubstrate = substrateReflectivity.evaluate(
       self.q,
       [sldSub, 0],
       [roughSub, roughSub],
@@ -185,6 +186,6 @@ class CubeCSDoubleLayer(ReflectometryModel):
     self.I = self.params["i0"] * (
       self.params['coverage'] * IparticleLayer + (1-self.params['coverage']) * Isubstrate
     )  + self.params["bg"]
-    self.sld = algorithms.roughsld_thick_layers(self.z, sld, roughness, thickness).real
+    self.deferRoughSld('sld', sld, roughness, thickness)
 
-    self.sldMag = algorithms.roughsld_thick_layers(self.z, sldMag, roughness, thickness).real
+    self.deferRoughSld('sldMag', sldMag, roughness, thickness)
@@ -1,5 +1,5 @@
 from ._reflModel import ReflectometryModel
-from fortRefl import nanocubes, algorithms
+from modelexp.kernels.refl import nanocubes, algorithms
 import numpy as np
 
 class CubeCSDoubleLayerNoSpacer(ReflectometryModel):
@@ -104,7 +104,7 @@ class CubeCSDoubleLayerNoSpacer(ReflectometryModel):
 
     self.z = np.linspace(-thickness[0], z, 300)
     self.I = self.params["i0"] * IparticleLayer + self.params["bg"]
-    self.sld = algorithms.roughsld_thick_layers(self.z, sld, roughness, thickness).real
+    self.deferRoughSld('sld', sld, roughness, thickness)
 
   def calcMagneticModel(self):
     a = self.params['a'].value
@@ -189,5 +189,5 @@ class CubeCSDoubleLayerNoSpacer(ReflectometryModel):
 
     self.z = np.linspace(-thickness[0], z, 300)
     self.I = self.params["i0"] * IparticleLayer + self.params["bg"]
-    self.sld = algorithms.roughsld_thick_layers(self.z, sld, roughness, thickness).real
-    self.sldMag = algorithms.roughsld_thick_layers(self.z, sldMag, roughness, thickness).real
+    self.deferRoughSld('sld', sld, roughness, thickness)
+    self.deferRoughSld('sldMag', sldMag, roughness, thickness)
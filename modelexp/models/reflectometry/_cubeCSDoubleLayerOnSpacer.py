@@ -1,5 +1,5 @@
 from ._reflModel import ReflectometryModel
-from fortRefl import nanocubes, algorithms
+from modelexp.kernels.refl import nanocubes, algorithms
 import numpy as np
 
 class CubeCSDoubleLayerOnSpacer(ReflectometryModel):
@@ -114,7 +114,7 @@ class CubeCSDoubleLayerOnSpacer(ReflectometryModel):
 
     self.z = np.linspace(-thickness[0], z, 300)
     self.I = self.params["i0"] * IparticleLayer + self.params["bg"]
-    self.sld = algorithms.roughsld_thick_layers(self.z, sld, roughness, thickness).real
+    self.deferRoughSld('sld', sld, roughness, thickness)
 
   def calcMagneticModel(self):
     a = self.params['a'].value
@@ -207,5 +207,5 @@ class CubeCSDoubleLayerOnSpacer(ReflectometryModel):
 
     self.z = np.linspace(-thickness[0], z, 300)
     self.I = self.params["i0"] * IparticleLayer + self.params["bg"]
-    self.sld = algorithms.roughsld_thick_layers(self.z, sld, roughness, thickness).real
-    self.sldMag = algorithms.roughsld_thick_layers(self.z, sldMag, roughness, thickness).real
+    self.deferRoughSld('sld', sld, roughness, thickness)
+    self.deferRoughSld('sldMag', sldMag, roughness, thickness)
@@ -1,5 +1,6 @@
 from ._reflModel import ReflectometryModel
-from fortRefl import nanocubes, algorithms
+from modelexp.kernels.refl import nanocubes, algorithms
+from ._substrateReflectivity import substrateReflectivity
 import numpy as np
 
 class CubeCSMonolayer(ReflectometryModel):
@@ -69,7 +70,7 @@ class CubeCSMonolayer(ReflectometryModel):
       0
     ]
 
-    Isubstrate = algorithms.parrat(
+    Isubstrate = substrateReflectivity.evaluate(
       self.q,
       [sldSub, 0],
       [roughSub, 0],
@@ -85,7 +86,7 @@ class CubeCSMonolayer(ReflectometryModel):
     self.I = self.params["i0"] * (
       coverage * IparticleLayer + (1 - coverage) * Isubstrate
     )  + self.params["bg"]
-    self.sld = algorithms.roughsld_thick_layers(self.z, sld, roughness, thickness).real
+    self.deferRoughSld('sld', sld, roughness, thickness)
 
   def calcMagneticModel(self):
     a = self.params['a'].value
@@ -138,7 +139,7 @@ class CubeCSMonolayer(ReflectometryModel):
       0
     ]
 
-    Isubstrate = algorithms.parrat(
+    Isubstrate = substrateReflectivity.evaluate(
       self.q,
       [sldSub, 0],
       [roughSub, 0],
@@ -154,5 +155,5 @@ class CubeCSMonolayer(ReflectometryModel):
     self.I = self.params["i0"] * (
       coverage * IparticleLayer + (1 - coverage) * Isubstrate
     )  + self.params["bg"]
-    self.sld = algorithms.roughsld_thick_layers(self.z, sld, roughness, thickness).real
-    self.sldMag = algorithms.roughsld_thick_layers(self.z, sldMag, roughness, thickness).real
\ No newline at end of file
+    self.deferRoughSld('sld', sld, roughness, thickness)
+    self.deferRoughSld('sldMag', sldMag, roughness, thickness)
\ No newline at end of file
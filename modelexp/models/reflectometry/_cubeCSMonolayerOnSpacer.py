@@ -1,7 +1,8 @@
 from ._reflModel import ReflectometryModel
-from fortRefl import nanocubes, algorithms, math
+from modelexp.kernels.refl import nanocubes, algorithms, math
+from ._substrateReflectivity import substrateReflectivity
 import numpy as np
-from numpy.polynomial.hermite import hermgauss
+from modelexp.kernels import hermite
 
 class CubeCSMonolayerOnSpacer(ReflectometryModel):
   '''
@@ -76,7 +77,7 @@ class CubeCSMonolayerOnSpacer(ReflectometryModel):
       0
     ]
 
-    Isubstrate = algorithms.parrat(
+    Isubstrate = substrateReflectivity.evaluate(
       self.q,
       [sldSub, 0],
       [roughSub, 0],
@@ -92,38 +93,28 @@ class CubeCSMonolayerOnSpacer(ReflectometryModel):
       0
     ]
     self.z = np.linspace(-thickness[0], -thickness[0]+np.sum(thickness)+sub_thickness, 300)
-    IparticleLayer = algorithms.parrat(
-      self.q,
-      sld,
-      roughness,
-      thickness
-    )
-    self.sld = algorithms.roughsld_thick_layers(self.z, sld, roughness, thickness).real
     if sigA > 0:
-      x_herm, w_herm = hermgauss(int(self.params['orderHermite']))
-      w_sum = 0
+      x_herm, w_herm = hermite(int(self.params['orderHermite']))
       a_vals = a*np.exp(np.sqrt(2) * x_herm * sigA)
-      IparticleLayer = np.zeros(len(self.q))
-      rough_sld = np.zeros(len(self.z))
-      for i, w_i in enumerate(w_herm):
-        thickness = [
-          sub_thickness,
-          thicknessSpacer,
-          thicknessShellLower,
-          a_vals[i],
-          thicknessShellTop,
-          0
-        ]
-        IparticleLayer += w_i*algorithms.parrat(
-          self.q,
-          sld,
-          roughness,
-          thickness
-        )
-        rough_sld += w_i*algorithms.roughsld_thick_layers(self.z, sld, roughness, thickness).real
-        w_sum += w_i
-      IparticleLayer /= w_sum
-      self.sld = rough_sld / w_sum
+      # one stack per node of the size distribution, calculated in one call
+      nNodes = len(a_vals)
+      thicknesses = np.tile(np.array(thickness, dtype=float), (nNodes, 1))
+      thicknesses[:, 3] = a_vals
+      IparticleLayer = w_herm @ algorithms.parrat_batch(
+        self.q,
+        np.tile(sld, (nNodes, 1)),
+        np.tile(roughness, (nNodes, 1)),
+        thicknesses
+      ) / np.sum(w_herm)
+      self.deferRoughSld('sld', sld, roughness, thicknesses, w_herm)
+    else:
+      IparticleLayer = algorithms.parrat(
+        self.q,
+        sld,
+        roughness,
+        thickness
+      )
+      self.deferRoughSld('sld', sld, roughness, thickness)
     self.I = self.params["i0"] * (
       coverage * IparticleLayer + (1 - coverage) * Isubstrate
     )  + self.params["bg"]
@@ -187,7 +178,7 @@ class CubeCSMonolayerOnSpacer(ReflectometryModel):
       0
     ]
 
-    Isubstrate = algorithms.parrat(
+    Isubstrate = substrateReflectivity.evaluate(
       self.q,
       [sldSub, 0],
       [roughSub, 0],
@@ -203,5 +194,5 @@ class CubeCSMonolayerOnSpacer(ReflectometryModel):
     self.I = self.params["i0"] * (
       coverage * IparticleLayer + (1 - coverage) * Isubstrate
     )  + self.params["bg"]
-    self.sld = algorithms.roughsld_thick_layers(self.z, sld, roughness, thickness).real
-    self.sldMag = algorithms.roughsld_thick_layers(self.z, sldMag, roughness, thickness).real
+    self.deferRoughSld('sld', sld, roughness, thickness)
+    self.deferRoughSld('sldMag', sldMag, roughness, thickness)
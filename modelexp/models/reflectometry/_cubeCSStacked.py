@@ -1,5 +1,6 @@
 from ._reflModel import ReflectometryModel
-from fortRefl import nanocubes, algorithms
+from modelexp.kernels.refl import nanocubes, algorithms
+from ._substrateReflectivity import substrateReflectivity
 import numpy as np
 
 class CubeCSStacked(ReflectometryModel):
@@ -62,7 +63,7 @@ class CubeCSStacked(ReflectometryModel):
     ]
     z = -thickness[0] + np.sum(thickness)
 
-    Isubstrate = algorithms.parrat(
+    Isubstrate = substrateReflectivity.evaluate(
       self.q,
       [sldSub, 0],
       [roughSub, roughSub],
@@ -78,7 +79,7 @@ class CubeCSStacked(ReflectometryModel):
     self.I = self.params["i0"] * (
       coverage * IparticleLayer + (1 - coverage) * Isubstrate
     )  + self.params["bg"]
-    self.sld = algorithms.roughsld_thick_layers(self.z, sld, roughness, thickness).real
+    self.deferRoughSld('sld', sld, roughness, thickness)
 
   def calcMagneticModel(self):
     a = self.params['a'].value
@@ -124,7 +125,7 @@ class CubeCSStacked(ReflectometryModel):
     ]
     z = -thickness[0] + np.sum(thickness)
 
-    Isubstrate = algorithms.parrat(
+    Isubstrate = substrateReflectivity.evaluate(
       self.q,
       [sldSub, 0],
       [roughSub, roughSub],
@@ -140,5 +141,5 @@ class CubeCSStacked(ReflectometryModel):
     self.I = self.params["i0"] * (
       coverage * IparticleLayer + (1 - coverage) * Isubstrate
     )  + self.params["bg"]
-    self.sld = algorithms.roughsld_thick_layers(self.z, sld, roughness, thickness).real
-    self.sldMag = algorithms.roughsld_thick_layers(self.z, sldMag, roughness, thickness).real
+    self.deferRoughSld('sld', sld, roughness, thickness)
+    self.deferRoughSld('sldMag', sldMag, roughness, thickness)
@@ -1,7 +1,7 @@
 from .._decoration import Decoration
 
 import numpy as np
-from fortRefl import math
+from modelexp.kernels.refl import math
 
 class DataResolution(Decoration):
   """Decorator class that takes the output of a model class and adds parameters
@@ -19,8 +19,20 @@ class DataResolution(Decoration):
     self.ptrModel.calcModel()
     q = self.ptrModel.getDomain()
     I = self.ptrModel.getValues()
-    dI = self.ptrModel.getResolution()
-    params = self.ptrModel.getParams()
+    self.setValues(self.transformValues(q, I, self.ptrModel.getParams()))
 
+  def transformValues(self, q, I, params):
+    # the resolution belongs to the dataset, so it is only valid on its domain
+    dI = self.getResolution()
     if ((q is not None) and (I is not None) and (dI is not None)):
-      self.setValues(math.resolution_smear(q, I, dI))
\ No newline at end of file
+      return self.transformValuesWithWidth(q, I, params, dI)
+    return I
+
+  def transformValuesWithWidth(self, q, I, params, dI, out=None):
+    if np.ndim(dI) == 0 and dI == 0:
+      return I
+    return math.resolution_smear(q, I, dI, out=out)
+
+  def resolutionWidth(self, q, params):
+    dI = self.getResolution()
+    return 0 if dI is None else dI
@@ -1,7 +1,7 @@
 from .._decoration import Decoration
 
 import numpy as np
-from fortRefl import math
+from modelexp.kernels.refl import math
 
 class InstrumentalResolution(Decoration):
   """Decorator class that takes the output of a model class and adds parameters
@@ -12,6 +12,8 @@ class InstrumentalResolution(Decoration):
   Model : Model
     Base Abstract class
   """
+  valueParameters = ('dTheta', 'wavelength', 'dWavelength')
+
   def __init__(self, model):
     super().__init__(model)
     params = self.getParams()
@@ -28,11 +30,22 @@ class InstrumentalResolution(Decoration):
     self.ptrModel.calcModel()
     q = self.ptrModel.getDomain()
     I = self.ptrModel.getValues()
-    params = self.ptrModel.getParams()
-    if ((q is not None) and (I is not None) and 'dTheta' in params) and ('dWavelength' in params) and ('wavelength' in params):
-      sigQ = np.sqrt(
+    self.setValues(self.transformValues(q, I, self.ptrModel.getParams()))
+
+  def transformValues(self, q, I, params):
+    if ((q is not None) and (I is not None) and ('dTheta' in params) and ('dWavelength' in params) and ('wavelength' in params)):
+      return self.transformValuesWithWidth(q, I, params, self.resolutionWidth(q, params))
+    return I
+
+  def transformValuesWithWidth(self, q, I, params, sigQ, out=None):
+    if np.ndim(sigQ) == 0 and sigQ == 0:
+      return I
+    return math.resolution_smear(q, I, sigQ, out=out)
+
+  def resolutionWidth(self, q, params):
+    if ('dTheta' in params) and ('dWavelength' in params) and ('wavelength' in params):
+      return np.sqrt(
         (params['dWavelength'] * q)**2 +
         (4 * np.pi / params['wavelength'] * params['dTheta'])**2
       )
-
-      self.setValues(math.resolution_smear(q, I, sigQ))
\ No newline at end of file
+    return 0
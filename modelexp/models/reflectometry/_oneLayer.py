@@ -1,5 +1,6 @@
 from ._reflModel import ReflectometryModel
-from fortRefl import nanocubes, algorithms
+from modelexp.kernels.refl import nanocubes, algorithms
+from ._substrateReflectivity import substrateReflectivity
 import numpy as np
 
 class OneLayer(ReflectometryModel):
@@ -45,7 +46,7 @@ class OneLayer(ReflectometryModel):
       roughness,
       thickness
     )
-    Isubstrate = algorithms.parrat(
+    Isubstrate = substrateReflectivity.evaluate(
       self.q,
       [self.params['sldSubstrate'].value, 0],
       [self.params['roughnessSubstrate'], 0],
@@ -59,7 +60,7 @@ class OneLayer(ReflectometryModel):
     self.I = self.params["i0"] * (
       self.params['coverage'] * Ilayer + (1-self.params['coverage']) * Isubstrate
     ) + self.params["bg"]
-    self.sld = algorithms.roughsld_thick_layers(self.z, sld, roughness, thickness).real
+    self.deferRoughSld('sld', sld, roughness, thickness)
 
   def calcMagneticModel(self):
     self.calcModel()
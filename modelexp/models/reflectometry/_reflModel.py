@@ -1,7 +1,39 @@
+import numpy as np
 from .._model import Model
 from .._decoration import Decoration
 
 class ReflectometryModel(Model):
+  profileAttributes = ('z', 'sld', 'sldMag')
+  linearParameters = ('i0', 'coverage', 'bg')
+  kernelProfiles = dict(Model.kernelProfiles, evaluateMagneticWithSpinFlip='magneticProfile')
+
+  @classmethod
+  def evaluateMagneticWithSpinFlip(cls, q, theta):
+    """Values of the magnetic model including spin flip, see evaluate
+    """
+    model = cls._scratchModel(q, theta)
+    model.calcMagneticModelWithSpinFlip()
+    return model.getValues()
+
+  def deferRoughSld(self, name, sld, roughness, thickness, weights=None):
+    """Set the profile name to the rough sld of the layers on z. It is only
+    calculated when it is plotted or saved. With weights, thickness is a list
+    of layer thicknesses and the profile is their weighted mean.
+    """
+    from modelexp.kernels.refl import algorithms
+    z, sld, roughness, thickness = [np.array(a) for a in (self.z, sld, roughness, thickness)]
+    weights = None if weights is None else np.array(weights)
+
+    def compute():
+      if weights is None:
+        return {name: algorithms.roughsld_thick_layers(z, sld, roughness, thickness).real}
+      profiles = algorithms.roughsld_thick_layers_batch(
+        z, np.tile(sld, (len(weights), 1)), np.tile(roughness, (len(weights), 1)), thickness
+      )
+      return {name: (weights @ profiles).real / np.sum(weights)}
+
+    self.deferProfile((name,), compute)
+
   def __init__(self, parent):
     self.q = None
     self.I = None
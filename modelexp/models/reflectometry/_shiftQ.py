@@ -11,6 +11,8 @@ class ShiftQ(Decoration):
   Model : Model
     Base Abstract class
   """
+  valueParameters = ('qShift',)
+
   def __init__(self, model):
     super().__init__(model)
     params = self.ptrModel.getParams()
@@ -20,7 +22,17 @@ class ShiftQ(Decoration):
     '''
     Define how to modify the
     '''
-    qShift = self.ptrModel.getParams()['qShift'].value
-    self.ptrModel.setDomain(self.ptrModel.getDomain() - qShift)
-    self.ptrModel.calcModel()
-    self.ptrModel.setDomain(self.ptrModel.getDomain() + qShift)
+    # the original domain is restored, shifting it back would let it drift
+    # by the rounding error of every round trip
+    q = self.ptrModel.getDomain()
+    self.ptrModel.setDomain(self.transformDomain(q, self.ptrModel.getParams()))
+    try:
+      self.ptrModel.calcModel()
+    finally:
+      self.ptrModel.setDomain(q)
+
+  def transformDomain(self, q, params):
+    return q - params['qShift']
+
+  def transformDomainInto(self, q, params, out):
+    return np.subtract(q, float(params['qShift']), out=out)
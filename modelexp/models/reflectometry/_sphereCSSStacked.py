@@ -1,5 +1,5 @@
 from ._reflModel import ReflectometryModel
-from fortRefl import nanospheres, algorithms
+from modelexp.kernels.refl import nanospheres, algorithms
 import numpy as np
 
 class SphereCSSStacked(ReflectometryModel):
@@ -48,7 +48,7 @@ class SphereCSSStacked(ReflectometryModel):
       thickness = (self.z[1] - self.z[0])*np.ones(len(sld))
 
       self.I = self.params["i0"] * algorithms.parrat(self.q, sld, roughness, thickness)  + self.params["bg"]
-      self.sld = algorithms.roughsld_thick_layers(self.z, sld, roughness, thickness).real
+      self.deferRoughSld('sld', sld, roughness, thickness)
 
   def calcMagneticModel(self):
     self.calcModel()
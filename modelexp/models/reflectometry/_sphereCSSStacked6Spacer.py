@@ -1,5 +1,5 @@
 from ._reflModel import ReflectometryModel
-from fortRefl import nanospheres, algorithms
+from modelexp.kernels.refl import nanospheres, algorithms
 import numpy as np
 
 class SphereCSSStacked6Spacer(ReflectometryModel):
@@ -75,7 +75,7 @@ class SphereCSSStacked6Spacer(ReflectometryModel):
       roughness = self.params["roughness"].value + self.z * self.params["roughnessSlope"].value
 
       self.I = self.params["i0"] * algorithms.parrat(self.q, sld, roughness, thickness)  + self.params["bg"]
-      self.sld = algorithms.roughsld_thick_layers(self.z, sld, roughness, thickness).real
+      self.deferRoughSld('sld', sld, roughness, thickness)
 
   def calcMagneticModel(self):
     if (self.z is not None):
@@ -120,8 +120,8 @@ class SphereCSSStacked6Spacer(ReflectometryModel):
       Rminus = algorithms.parrat(self.q, sld - sldMag, roughness, thickness)
       cosGamma = np.cos(self.params['gamma']*np.pi/180)
       self.I = self.params["i0"] * 0.5 * (Rplus * ( 1 + polarization*P*cosGamma) + Rminus * ( 1 - polarization*P*cosGamma ) )  + self.params["bg"]
-      self.sld = algorithms.roughsld_thick_layers(self.z, sld, roughness, thickness).real
-      self.sldMag = algorithms.roughsld_thick_layers(self.z, sldMag, roughness, thickness).real
+      self.deferRoughSld('sld', sld, roughness, thickness)
+      self.deferRoughSld('sldMag', sldMag, roughness, thickness)
 
 
   def calcMagneticModelWithSpinFlip(self):
@@ -176,5 +176,5 @@ class SphereCSSStacked6Spacer(ReflectometryModel):
         self.I = P*Rmm + (1-P)*Rmp
       else:
         self.I = P*Rmp + (1-P)*(Rpp+Rmm)/2
-      self.sld = algorithms.roughsld_thick_layers(self.z, sld, roughness, thickness).real
-      self.sldMag = algorithms.roughsld_thick_layers(self.z, sldMag, roughness, thickness).real
\ No newline at end of file
+      self.deferRoughSld('sld', sld, roughness, thickness)
+      self.deferRoughSld('sldMag', sldMag, roughness, thickness)
\ No newline at end of file
@@ -1,5 +1,5 @@
 from ._reflModel import ReflectometryModel
-from fortRefl import nanospheres, algorithms
+from modelexp.kernels.refl import nanospheres, algorithms
 import numpy as np
 
 class SphereCSStacked6Spacer(ReflectometryModel):
@@ -65,7 +65,7 @@ class SphereCSStacked6Spacer(ReflectometryModel):
       roughness = self.params["roughness"].value + self.z * self.params["roughnessSlope"].value
 
       self.I = self.params["i0"] * algorithms.parrat(self.q, sld, roughness, thickness)  + self.params["bg"]
-      self.sld = algorithms.roughsld_thick_layers(self.z, sld, roughness, thickness).real
+      self.deferRoughSld('sld', sld, roughness, thickness)
 
   def calcMagneticModel(self):
     if (self.z is not None):
@@ -98,5 +98,5 @@ class SphereCSStacked6Spacer(ReflectometryModel):
       roughness = self.params["roughness"].value + self.z * self.params["roughnessSlope"].value
 
       self.I = self.params["i0"] * algorithms.parrat(self.q, sld + polarization*sldMag, roughness, thickness)  + self.params["bg"]
-      self.sld = algorithms.roughsld_thick_layers(self.z, sld, roughness, thickness).real
-      self.sldMag = algorithms.roughsld_thick_layers(self.z, sldMag, roughness, thickness).real
+      self.deferRoughSld('sld', sld, roughness, thickness)
+      self.deferRoughSld('sldMag', sldMag, roughness, thickness)
@@ -1,5 +1,5 @@
 from ._reflModel import ReflectometryModel
-from fortRefl import nanocubes, algorithms
+from modelexp.kernels.refl import nanocubes, algorithms
 import numpy as np
 
 class Substrate(ReflectometryModel):
@@ -37,7 +37,7 @@ class Substrate(ReflectometryModel):
 
     self.z = np.linspace(-10- 2.5*self.params["roughness"].value, (10+ 2.5*self.params["roughness"].value), 100)
     self.I = self.params["i0"] * Ilayer + self.params["bg"]
-    self.sld = algorithms.roughsld_thick_layers(self.z, sld, roughness, thickness).real
+    self.deferRoughSld('sld', sld, roughness, thickness)
 
   def calcMagneticModel(self):
     self.calcModel()
@@ -0,0 +1,11 @@
+from modelexp.kernels.refl import algorithms
+from .._components import component
+
+@component()
+def substrateReflectivity(q, sld, roughness, thickness):
+  '''
+  Parratt reflectivity of the uncovered substrate. It only depends on the
+  substrate parameters, so it is cached across the parameters of the layers
+  on top of it.
+  '''
+  return algorithms.parrat(q, sld, roughness, thickness)
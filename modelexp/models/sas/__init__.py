@@ -1,49 +1,62 @@
 from ._saxsModel import SAXSModel
-
-from ._sphere import Sphere
-from ._sphereCS import SphereCS
-from ._sphereCSS import SphereCSS
-from ._sphereCSSDead import SphereCSSDead
-from ._sphereCSCoupled import SphereCSCoupled
-from ._sphereCSSCoupled import SphereCSSCoupled
-from ._sphereCSSCoupledOA import SphereCSSCoupledOA
-from ._sphereCSSCoupledDead import SphereCSSCoupledDead
-from ._sphereLinHullS import SphereLinHullS
-from ._sphereCSBimodal import SphereCSBimodal
-
-from ._sphereCSSCoupledHardSphereStructure import SphereCSSCoupledHSStructure
-from ._sphereCSOA import SphereCSOA
-from ._sphereCSBimodalOA import SphereCSBimodalOA
-from ._sphereCSSCoupledBimodal import SphereCSSCoupledBimodal
-from ._sphereCSSCoupledBimodalHardSphereStructure import SphereCSSCoupledBimodalHSStructure
-from ._sphereCISS import SphereCISS
-
-from ._twoSphereCS import TwoSphereCS
-
-from ._cube import Cube
-from ._cubeCS import CubeCS
-from ._cubeCSCoupled import CubeCSCoupled
-from ._cubeCSCoupledSigD import CubeCSCoupledSigD
-
-from ._superball import Superball
-from ._superballCS import SuperballCS
-from ._superballCSOA import SuperballCSOA
-from ._superballCSCoupled import SuperballCSCoupled
-from ._superballCSCoupledSigD import SuperballCSCoupledSigD
-from ._superballCSSCoupled import SuperballCSSCoupled
-from ._superballCSSCoupledVaryMagShell import SuperballCSSCoupledVaryMagShell
-from ._superballCSSCoupledOA import SuperballCSSCoupledOA
-from ._superballCSSCoupledSigD import SuperballCSSCoupledSigD
-from ._superballCSSCoupledSigDOA import SuperballCSSCoupledSigDOA
-
-from ._superballOptimized import SuperballOptimized
-from ._superballCSOptimized import SuperballCSOptimized
-from ._superballCSOAOptimized import SuperballCSOAOptimized
-
-from._ellipsoid import Ellipsoid
-from._ellipsoidCS import EllipsoidCS
-
-# decorating functions
-from ._instrumentalResolution import InstrumentalResolution
-from ._dataResolution import DataResolution
-from ._magnetic import Magnetic
\ No newline at end of file
+from .._registry import LazyRegistry as _LazyRegistry, lazyModule as _lazyModule
+
+# models and decorations are imported on first access, see LazyRegistry,
+# their fortSAS kernels on their first call, see modelexp.kernels
+_registry = _LazyRegistry(__name__, {
+  'Sphere': '._sphere',
+  'SphereCS': '._sphereCS',
+  'SphereCSS': '._sphereCSS',
+  'SphereCSSDead': '._sphereCSSDead',
+  'SphereCSCoupled': '._sphereCSCoupled',
+  'SphereCSSCoupled': '._sphereCSSCoupled',
+  'SphereCSSCoupledOA': '._sphereCSSCoupledOA',
+  'SphereCSSCoupledDead': '._sphereCSSCoupledDead',
+  'SphereLinHullS': '._sphereLinHullS',
+  'SphereCSBimodal': '._sphereCSBimodal',
+
+  'SphereCSSCoupledHSStructure': '._sphereCSSCoupledHardSphereStructure',
+  'SphereCSOA': '._sphereCSOA',
+  'SphereCSBimodalOA': '._sphereCSBimodalOA',
+  'SphereCSSCoupledBimodal': '._sphereCSSCoupledBimodal',
+  'SphereCSSCoupledBimodalHSStructure': '._sphereCSSCoupledBimodalHardSphereStructure',
+  'SphereCISS': '._sphereCISS',
+
+  'TwoSphereCS': '._twoSphereCS',
+
+  'Cube': '._cube',
+  'CubeCS': '._cubeCS',
+  'CubeCSCoupled': '._cubeCSCoupled',
+  'CubeCSCoupledSigD': '._cubeCSCoupledSigD',
+
+  'Superball': '._superball',
+  'SuperballCS': '._superballCS',
+  'SuperballCSOA': '._superballCSOA',
+  'SuperballCSCoupled': '._superballCSCoupled',
+  'SuperballCSCoupledSigD': '._superballCSCoupledSigD',
+  'SuperballCSSCoupled': '._superballCSSCoupled',
+  'SuperballCSSCoupledVaryMagShell': '._superballCSSCoupledVaryMagShell',
+  'SuperballCSSCoupledOA': '._superballCSSCoupledOA',
+  'SuperballCSSCoupledSigD': '._superballCSSCoupledSigD',
+  'SuperballCSSCoupledSigDOA': '._superballCSSCoupledSigDOA',
+
+  'SuperballOptimized': '._superballOptimized',
+  'SuperballCSOptimized': '._superballCSOptimized',
+  'SuperballCSOAOptimized': '._superballCSOAOptimized',
+
+  'Ellipsoid': '._ellipsoid',
+  'EllipsoidCS': '._ellipsoidCS',
+}, {
+  # decorating functions
+  'InstrumentalResolution': '._instrumentalResolution',
+  'DataResolution': '._dataResolution',
+  'Magnetic': '._magnetic',
+})
+
+__getattr__, __dir__ = _lazyModule(globals(), _registry)
+__all__ = ['SAXSModel'] + _registry.names()
+
+def list_models():
+  """Names of the models available in this package, without importing them
+  """
+  return _registry.listModels()
@@ -1,7 +1,6 @@
 from ._saxsModel import SAXSModel
-from fortSAS import cube_cs_coupled
-from numpy.polynomial.hermite import hermgauss
-from numpy.polynomial.legendre import leggauss
+from modelexp.kernels.sas import cube_cs_coupled
+from modelexp.kernels import gauss
 
 class CubeCSCoupled(SAXSModel):
   def initParameters(self):
@@ -13,8 +12,8 @@ class CubeCSCoupled(SAXSModel):
     self.params.add('sigParticleSize', 0., min=0)
     self.params.add('i0', 1, min=0)
     self.params.add('bg', 1e-6, min=0)
-    self.params.add('orderHermite', 15, min=1)
-    self.params.add('orderLegendre', 15, min=1)
+    self.params.add('orderHermite', 15, min=0) # 0 is chosen adaptively
+    self.params.add('orderLegendre', 15, min=0)
     self.addConstantParam('orderHermite')
     self.addConstantParam('orderLegendre')
 
@@ -27,62 +26,56 @@ class CubeCSCoupled(SAXSModel):
     self.addConstantParam('magSldSolvent')
 
 
-  def calcModel(self):
-    self.x_herm, self.w_herm = hermgauss(int(self.params['orderHermite']))
-    self.x_leg, self.w_leg = leggauss(int(self.params['orderLegendre']))
+  @classmethod
+  def evaluate(cls, q, theta):
+    return cls.scaleIntensity(theta, gauss(cube_cs_coupled.formfactor, theta['orderHermite'], theta['orderLegendre'])(
+      q,
+      theta['particleSize'],
+      theta['d'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSolvent'],
+      theta['sigParticleSize']
+    ))
 
-    self.I = self.params['i0'] * cube_cs_coupled.formfactor(
-      self.q,
-      self.params['particleSize'],
-      self.params['d'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSolvent'],
-      self.params['sigParticleSize'],
-      self.x_herm, self.w_herm, self.x_leg, self.w_leg
-    ) + self.params['bg']
+  @classmethod
+  def evaluateMagnetic(cls, q, theta):
+    return cls.scaleIntensity(theta, gauss(cube_cs_coupled.magnetic_formfactor, theta['orderHermite'], theta['orderLegendre'])(
+      q,
+      theta['particleSize'],
+      theta['d'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSolvent'],
+      theta['sigParticleSize'],
+      theta['magSldCore'],
+      theta['magSldShell'],
+      theta['magSldSolvent'],
+      theta['xi'],
+      theta['sin2alpha'],
+      theta['polarization']
+    ))
 
-    self.r, self.sld = cube_cs_coupled.sld(
-      self.params['particleSize'],
-      self.params['d'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSolvent']
+  @classmethod
+  def profile(cls, theta):
+    r, sld = cube_cs_coupled.sld(
+      theta['particleSize'],
+      theta['d'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSolvent']
     )
+    return {'r': r, 'sld': sld}
 
-  def calcMagneticModel(self):
-    self.x_herm, self.w_herm = hermgauss(int(self.params['orderHermite']))
-    self.x_leg, self.w_leg = leggauss(int(self.params['orderLegendre']))
-
-    self.I = self.params['i0'] * cube_cs_coupled.magnetic_formfactor(
-      self.q,
-      self.params['particleSize'],
-      self.params['d'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSolvent'],
-      self.params['sigParticleSize'],
-      self.params['magSldCore'],
-      self.params['magSldShell'],
-      self.params['magSldSolvent'],
-      self.params['xi'],
-      self.params['sin2alpha'],
-      self.params['polarization'],
-      self.x_herm, self.w_herm, self.x_leg, self.w_leg
-    ) + self.params['bg']
-
-    self.r, self.sld = cube_cs_coupled.sld(
-      self.params['particleSize'],
-      self.params['d'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSolvent']
-    )
-
-    self.rMag, self.sldMag = cube_cs_coupled.sld(
-      self.params['particleSize'],
-      self.params['d'],
-      self.params['magSldCore'],
-      self.params['magSldShell'],
-      self.params['magSldSolvent']
+  @classmethod
+  def magneticProfile(cls, theta):
+    profile = cls.profile(theta)
+    rMag, sldMag = cube_cs_coupled.sld(
+      theta['particleSize'],
+      theta['d'],
+      theta['magSldCore'],
+      theta['magSldShell'],
+      theta['magSldSolvent']
     )
+    profile.update({'rMag': rMag, 'sldMag': sldMag})
+    return profile
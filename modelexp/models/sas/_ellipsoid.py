@@ -1,5 +1,5 @@
 from modelexp.models.sas import SAXSModel
-from fortSAS import ellipsoid
+from modelexp.kernels.sas import ellipsoid
 
 class Ellipsoid(SAXSModel):
   def initParameters(self):
@@ -20,51 +20,55 @@ class Ellipsoid(SAXSModel):
 
     self.addConstantParam('magSldSolvent')
 
-  def calcModel(self):
-    self.I = self.params['i0'] * ellipsoid.formfactor(
-      self.q,
-      self.params['l'],
-      self.params['r'],
-      self.params['alpha'],
-      self.params['sldEllipsoid'],
-      self.params['sldSolvent'],
-      self.params['sigL'],
-      self.params['sigR'],
-      self.params['sigAlpha'],
-    ) + self.params['bg']
+  @classmethod
+  def evaluate(cls, q, theta):
+    return cls.scaleIntensity(theta, ellipsoid.formfactor(
+      q,
+      theta['l'],
+      theta['r'],
+      theta['alpha'],
+      theta['sldEllipsoid'],
+      theta['sldSolvent'],
+      theta['sigL'],
+      theta['sigR'],
+      theta['sigAlpha'],
+    ))
 
-    self.r, self.sld = ellipsoid.sld(
-      self.params['l'],
-      self.params['sldEllipsoid'],
-      self.params['sldSolvent']
-    )
-
-  def calcMagneticModel(self):
-    self.I = self.params['i0'] * ellipsoid.magnetic_formfactor(
-      self.q,
-      self.params['l'],
-      self.params['r'],
-      self.params['alpha'],
-      self.params['sldEllipsoid'],
-      self.params['sldSolvent'],
-      self.params['sigL'],
-      self.params['sigR'],
-      self.params['sigAlpha'],
-      self.params['magSldEllipsoid'],
-      self.params['magSldSolvent'],
-      self.params['xi'],
-      self.params['sin2alpha'],
-      self.params['polarization']
-    ) + self.params['bg']
+  @classmethod
+  def evaluateMagnetic(cls, q, theta):
+    return cls.scaleIntensity(theta, ellipsoid.magnetic_formfactor(
+      q,
+      theta['l'],
+      theta['r'],
+      theta['alpha'],
+      theta['sldEllipsoid'],
+      theta['sldSolvent'],
+      theta['sigL'],
+      theta['sigR'],
+      theta['sigAlpha'],
+      theta['magSldEllipsoid'],
+      theta['magSldSolvent'],
+      theta['xi'],
+      theta['sin2alpha'],
+      theta['polarization']
+    ))
 
-    self.r, self.sld = ellipsoid.sld(
-      self.params['l'],
-      self.params['sldEllipsoid'],
-      self.params['sldSolvent']
+  @classmethod
+  def profile(cls, theta):
+    r, sld = ellipsoid.sld(
+      theta['l'],
+      theta['sldEllipsoid'],
+      theta['sldSolvent']
     )
+    return {'r': r, 'sld': sld}
 
-    self.rMag, self.sldMag = ellipsoid.sld(
-      self.params['l'],
-      self.params['magSldEllipsoid'],
-      self.params['magSldSolvent'],
+  @classmethod
+  def magneticProfile(cls, theta):
+    profile = cls.profile(theta)
+    rMag, sldMag = ellipsoid.sld(
+      theta['l'],
+      theta['magSldEllipsoid'],
+      theta['magSldSolvent'],
     )
+    profile.update({'rMag': rMag, 'sldMag': sldMag})
+    return profile
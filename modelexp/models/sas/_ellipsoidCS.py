@@ -1,5 +1,5 @@
 from modelexp.models.sas import SAXSModel
-from fortSAS import ellipsoid_cs
+from modelexp.kernels.sas import ellipsoid_cs
 
 class EllipsoidCS(SAXSModel):
   def initParameters(self):
@@ -22,55 +22,63 @@ class EllipsoidCS(SAXSModel):
 
     self.addConstantParam('magSldSolvent')
 
-  def calcModel(self):
-    self.I = self.params['i0'] * ellipsoid_cs.formfactor(
-      self.q,
-      self.params['R_z'],
-      self.params['R_r'],
-      self.params['d_s'],
-      self.params['alpha'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSolvent'],
-      self.params['sigR_r'],
-      self.params['sigd_s'],
-      self.params['sigAlpha'],
-    ) + self.params['bg']
+  @classmethod
+  def evaluate(cls, q, theta):
+    return cls.scaleIntensity(theta, ellipsoid_cs.formfactor(
+      q,
+      theta['R_z'],
+      theta['R_r'],
+      theta['d_s'],
+      theta['alpha'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSolvent'],
+      theta['sigR_r'],
+      theta['sigd_s'],
+      theta['sigAlpha'],
+    ))
 
-    self.r, self.sld = ellipsoid_cs.sld(
-      self.params['R_z'],
-      self.params['d_s'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSolvent']
-    )
+  @classmethod
+  def evaluateMagnetic(cls, q, theta):
+    return cls.scaleIntensity(theta, ellipsoid_cs.magnetic_formfactor(
+      q,
+      theta['l'],
+      theta['r'],
+      theta['alpha'],
+      theta['sldEllipsoid'],
+      theta['sldSolvent'],
+      theta['sigL'],
+      theta['sigR'],
+      theta['sigAlpha'],
+      theta['magSldEllipsoid'],
+      theta['magSldSolvent'],
+      theta['xi'],
+      theta['sin2alpha'],
+      theta['polarization']
+    ))
 
-  def calcMagneticModel(self):
-    self.I = self.params['i0'] * ellipsoid_cs.magnetic_formfactor(
-      self.q,
-      self.params['l'],
-      self.params['r'],
-      self.params['alpha'],
-      self.params['sldEllipsoid'],
-      self.params['sldSolvent'],
-      self.params['sigL'],
-      self.params['sigR'],
-      self.params['sigAlpha'],
-      self.params['magSldEllipsoid'],
-      self.params['magSldSolvent'],
-      self.params['xi'],
-      self.params['sin2alpha'],
-      self.params['polarization']
-    ) + self.params['bg']
+  @classmethod
+  def profile(cls, theta):
+    r, sld = ellipsoid_cs.sld(
+      theta['R_z'],
+      theta['d_s'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSolvent']
+    )
+    return {'r': r, 'sld': sld}
 
-    self.r, self.sld = ellipsoid.sld(
-      self.params['l'],
-      self.params['sldEllipsoid'],
-      self.params['sldSolvent']
+  @classmethod
+  def magneticProfile(cls, theta):
+    r, sld = ellipsoid.sld(
+      theta['l'],
+      theta['sldEllipsoid'],
+      theta['sldSolvent']
     )
 
-    self.rMag, self.sldMag = ellipsoid.sld(
-      self.params['l'],
-      self.params['magSldEllipsoid'],
-      self.params['magSldSolvent'],
+    rMag, sldMag = ellipsoid.sld(
+      theta['l'],
+      theta['magSldEllipsoid'],
+      theta['magSldSolvent'],
     )
+    return {'r': r, 'sld': sld, 'rMag': rMag, 'sldMag': sldMag}
@@ -35,6 +35,16 @@ class Magnetic(Decoration):
     else:
       self.ptrModel.calcModel()
 
+  def kernelName(self, kernel, theta):
+    if kernel == 'evaluate' and 'polarization' in theta:
+      return 'evaluateMagnetic'
+    return kernel
+
+  def evaluate(self, domain, theta):
+    if 'polarization' in theta:
+      return self.ptrModel.evaluateMagnetic(domain, theta)
+    return self.ptrModel.evaluate(domain, theta)
+
   def plotModel(self):
     if hasattr(self.ptrModel, 'rMag'):
       if self.sldMagPlot:
@@ -1,5 +1,7 @@
-from .._model import Model
+import numpy as np
+from .._model import Model, parameterValues
 from .._decoration import Decoration
+from .._workspace import activeWorkspace
 class SAXSModel(Model):
   """Class for models that are defined over one dimension
 
@@ -8,6 +10,9 @@ class SAXSModel(Model):
   Model : Model
     Base Abstract class
   """
+  profileAttributes = ('r', 'sld', 'rMag', 'sldMag')
+  linearParameters = ('i0', 'bg')
+
   def __init__(self, parent):
     self.q = None
     self.I = None
@@ -45,6 +50,33 @@ class SAXSModel(Model):
   def setValues(self, I):
     self.I = I
 
+  @staticmethod
+  def scaleIntensity(theta, formfactor):
+    '''
+    i0 * formfactor + bg, written into the intensity array of the active
+    Workspace of the modelset, see DecorationPlan. The formfactor itself
+    is never modified, it may be shared, e.g. read only component output.
+    '''
+    workspace = activeWorkspace()
+    if workspace is None:
+      return theta['i0'] * formfactor + theta['bg']
+    formfactor = np.asarray(formfactor)
+    out = workspace.get('intensity', formfactor.shape, formfactor.dtype)
+    np.multiply(formfactor, float(theta['i0']), out=out)
+    out += float(theta['bg'])
+    return out
+
+  def calcModel(self):
+    self.I = self.evaluate(self.q, self.params)
+    # the profile is only calculated when it is plotted or saved
+    theta = parameterValues(self.params)
+    self.deferProfile(self.profileAttributes, lambda: type(self).profile(theta))
+
+  def calcMagneticModel(self):
+    self.I = self.evaluateMagnetic(self.q, self.params)
+    theta = parameterValues(self.params)
+    self.deferProfile(self.profileAttributes, lambda: type(self).magneticProfile(theta))
+
   def calcDecoratedModel(self):
     if isinstance(self.decoration, Decoration):
       self.decoration.calcModel()
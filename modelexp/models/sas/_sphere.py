@@ -1,5 +1,5 @@
 from ._saxsModel import SAXSModel
-from fortSAS import sphere
+from modelexp.kernels.sas import sphere
 
 class Sphere(SAXSModel):
   '''
@@ -19,43 +19,47 @@ class Sphere(SAXSModel):
 
     self.addConstantParam('magSldSolvent')
 
-  def calcModel(self):
-    self.I = self.params['i0'] * sphere.formfactor(
-      self.q,
-      self.params['r'],
-      self.params['sldCore'],
-      self.params['sldSolvent'],
-      self.params['sigR']
-    ) + self.params['bg']
+  @classmethod
+  def evaluate(cls, q, theta):
+    return cls.scaleIntensity(theta, sphere.formfactor(
+      q,
+      theta['r'],
+      theta['sldCore'],
+      theta['sldSolvent'],
+      theta['sigR']
+    ))
 
-    self.r, self.sld = sphere.sld(
-      self.params['r'],
-      self.params['sldCore'],
-      self.params['sldSolvent']
-    )
-
-  def calcMagneticModel(self):
-    self.I = self.params['i0'] * sphere.magnetic_formfactor(
-      self.q,
-      self.params['r'],
-      self.params['sldCore'],
-      self.params['sldSolvent'],
-      self.params['sigR'],
-      self.params['magSldCore'],
-      self.params['magSldSolvent'],
-      self.params['xi'],
-      self.params['sin2alpha'],
-      self.params['polarization'],
-    ) + self.params['bg']
+  @classmethod
+  def evaluateMagnetic(cls, q, theta):
+    return cls.scaleIntensity(theta, sphere.magnetic_formfactor(
+      q,
+      theta['r'],
+      theta['sldCore'],
+      theta['sldSolvent'],
+      theta['sigR'],
+      theta['magSldCore'],
+      theta['magSldSolvent'],
+      theta['xi'],
+      theta['sin2alpha'],
+      theta['polarization'],
+    ))
 
-    self.r, self.sld = sphere.sld(
-      self.params['r'],
-      self.params['sldCore'],
-      self.params['sldSolvent']
+  @classmethod
+  def profile(cls, theta):
+    r, sld = sphere.sld(
+      theta['r'],
+      theta['sldCore'],
+      theta['sldSolvent']
     )
+    return {'r': r, 'sld': sld}
 
-    self.rMag, self.sldMag = sphere.sld(
-      self.params['r'],
-      self.params['magSldCore'],
-      self.params['magSldMatrix']
+  @classmethod
+  def magneticProfile(cls, theta):
+    profile = cls.profile(theta)
+    rMag, sldMag = sphere.sld(
+      theta['r'],
+      theta['magSldCore'],
+      theta['magSldMatrix']
     )
+    profile.update({'rMag': rMag, 'sldMag': sldMag})
+    return profile
@@ -1,5 +1,5 @@
 from modelexp.models.sas import SAXSModel
-from fortSAS import sphere_ciss
+from modelexp.kernels.sas import sphere_ciss
 
 class SphereCISS(SAXSModel):
   def initParameters(self):
@@ -29,80 +29,78 @@ class SphereCISS(SAXSModel):
     self.addConstantParam('magSldSurfactant')
     self.addConstantParam('magSldSolvent')
 
-  def calcModel(self):
-    self.I = self.params['i0'] * sphere_ciss.formfactor(
-      self.q,
-      self.params['r'],
-      self.params['dInterlayer'],
-      self.params['dShell'],
-      self.params['dSurfactant'],
-      self.params['sldCore'],
-      self.params['sldInterlayer'],
-      self.params['sldShell'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
-      self.params['sigR'],
-      self.params['sigDInterlayer'],
-      self.params['sigDShell'],
-    ) + self.params['bg']
+  @classmethod
+  def evaluate(cls, q, theta):
+    return cls.scaleIntensity(theta, sphere_ciss.formfactor(
+      q,
+      theta['r'],
+      theta['dInterlayer'],
+      theta['dShell'],
+      theta['dSurfactant'],
+      theta['sldCore'],
+      theta['sldInterlayer'],
+      theta['sldShell'],
+      theta['sldSurfactant'],
+      theta['sldSolvent'],
+      theta['sigR'],
+      theta['sigDInterlayer'],
+      theta['sigDShell'],
+    ))
 
-    self.r, self.sld = sphere_ciss.sld(
-      self.params['r'],
-      self.params['dInterlayer'],
-      self.params['dShell'],
-      self.params['dSurfactant'],
-      self.params['sldCore'],
-      self.params['sldInterlayer'],
-      self.params['sldShell'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
-    )
-
-  def calcMagneticModel(self):
-    self.I = self.params['i0'] * sphere_ciss.magnetic_formfactor(
-      self.q,
-      self.params['r'],
-      self.params['dInterlayer'],
-      self.params['dShell'],
-      self.params['dSurfactant'],
-      self.params['sldCore'],
-      self.params['sldInterlayer'],
-      self.params['sldShell'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
-      self.params['sigR'],
-      self.params['sigDInterlayer'],
-      self.params['sigDShell'],
-      self.params['magSldCore'],
-      self.params['magSldInterlayer'],
-      self.params['magSldShell'],
-      self.params['magSldSurfactant'],
-      self.params['magSldSolvent'],
-      self.params['xi'],
-      self.params['sin2alpha'],
-      self.params['polarization'],
-    ) + self.params['bg']
+  @classmethod
+  def evaluateMagnetic(cls, q, theta):
+    return cls.scaleIntensity(theta, sphere_ciss.magnetic_formfactor(
+      q,
+      theta['r'],
+      theta['dInterlayer'],
+      theta['dShell'],
+      theta['dSurfactant'],
+      theta['sldCore'],
+      theta['sldInterlayer'],
+      theta['sldShell'],
+      theta['sldSurfactant'],
+      theta['sldSolvent'],
+      theta['sigR'],
+      theta['sigDInterlayer'],
+      theta['sigDShell'],
+      theta['magSldCore'],
+      theta['magSldInterlayer'],
+      theta['magSldShell'],
+      theta['magSldSurfactant'],
+      theta['magSldSolvent'],
+      theta['xi'],
+      theta['sin2alpha'],
+      theta['polarization'],
+    ))
 
-    self.r, self.sld = sphere_ciss.sld(
-      self.params['r'],
-      self.params['dInterlayer'],
-      self.params['dShell'],
-      self.params['dSurfactant'],
-      self.params['sldCore'],
-      self.params['sldInterlayer'],
-      self.params['sldShell'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
+  @classmethod
+  def profile(cls, theta):
+    r, sld = sphere_ciss.sld(
+      theta['r'],
+      theta['dInterlayer'],
+      theta['dShell'],
+      theta['dSurfactant'],
+      theta['sldCore'],
+      theta['sldInterlayer'],
+      theta['sldShell'],
+      theta['sldSurfactant'],
+      theta['sldSolvent'],
     )
+    return {'r': r, 'sld': sld}
 
-    self.rMag, self.sldMag = sphere_ciss.sld(
-      self.params['r'],
-      self.params['dInterlayer'],
-      self.params['dShell'],
-      self.params['dSurfactant'],
-      self.params['magSldCore'],
-      self.params['magSldInterlayer'],
-      self.params['magSldShell'],
-      self.params['magSldSurfactant'],
-      self.params['magSldSolvent'],
+  @classmethod
+  def magneticProfile(cls, theta):
+    profile = cls.profile(theta)
+    rMag, sldMag = sphere_ciss.sld(
+      theta['r'],
+      theta['dInterlayer'],
+      theta['dShell'],
+      theta['dSurfactant'],
+      theta['magSldCore'],
+      theta['magSldInterlayer'],
+      theta['magSldShell'],
+      theta['magSldSurfactant'],
+      theta['magSldSolvent'],
     )
+    profile.update({'rMag': rMag, 'sldMag': sldMag})
+    return profile
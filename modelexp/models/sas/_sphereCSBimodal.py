@@ -1,8 +1,10 @@
 from modelexp.models.sas import SAXSModel
-from fortSAS import sphere_cs
+from modelexp.kernels.sas import sphere_cs
 import numpy as np
 
 class SphereCSBimodal(SAXSModel):
+  linearParameters = ('i0', 'fraction', 'bg')
+
   def initParameters(self):
     self.params.add('r1', 100)
     self.params.add('r2', 70)
@@ -29,115 +31,122 @@ class SphereCSBimodal(SAXSModel):
 
 
 
-  def calcModel(self):
-    self.I = self.params['i0'] * (
-      (1-self.params['fraction']) * sphere_cs.formfactor(
-        self.q,
-        self.params['r1'],
-        self.params['d'],
-        self.params['sldCore'],
-        self.params['sldShell'],
-        self.params['sldSolvent'],
-        self.params['sigR1'],
-        self.params['sigD']
-    ) + self.params['fraction'] * sphere_cs.formfactor(
-        self.q,
-        self.params['r2'],
-        self.params['d'],
-        self.params['sldCore'],
-        self.params['sldShell'],
-        self.params['sldSolvent'],
-        self.params['sigR2'],
-        self.params['sigD']
-    )) + self.params['bg']
+  @classmethod
+  def evaluate(cls, q, theta):
+    return theta['i0'] * (
+      (1-theta['fraction']) * sphere_cs.formfactor(
+        q,
+        theta['r1'],
+        theta['d'],
+        theta['sldCore'],
+        theta['sldShell'],
+        theta['sldSolvent'],
+        theta['sigR1'],
+        theta['sigD']
+    ) + theta['fraction'] * sphere_cs.formfactor(
+        q,
+        theta['r2'],
+        theta['d'],
+        theta['sldCore'],
+        theta['sldShell'],
+        theta['sldSolvent'],
+        theta['sigR2'],
+        theta['sigD']
+    )) + theta['bg']
+
+  @classmethod
+  def evaluateMagnetic(cls, q, theta):
+    return theta['i0'] * (
+      (1-theta['fraction']) * sphere_cs.magnetic_formfactor(
+        q,
+        theta['r1'],
+        theta['d'],
+        theta['sldCore'],
+        theta['sldShell'],
+        theta['sldSolvent'],
+        theta['sigR1'],
+        theta['sigD'],
+        theta['dDead1'],
+        theta['magSldCore'],
+        theta['magSldShell'],
+        theta['magSldSolvent'],
+        theta['xi'],
+        theta['sin2alpha'],
+        theta['polarization'],
+    ) + theta['fraction'] * sphere_cs.magnetic_formfactor(
+        q,
+        theta['r2'],
+        theta['d'],
+        theta['sldCore'],
+        theta['sldShell'],
+        theta['sldSolvent'],
+        theta['sigR2'],
+        theta['sigD'],
+        theta['dDead2'],
+        theta['magSldCore'],
+        theta['magSldShell'],
+        theta['magSldSolvent'],
+        theta['xi'],
+        theta['sin2alpha'],
+        theta['polarization'],
+    )) + theta['bg']
 
+  @classmethod
+  def profile(cls, theta):
     r1, sld1 = sphere_cs.sld(
-      self.params['r1'],
-      self.params['d'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSolvent']
+      theta['r1'],
+      theta['d'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSolvent']
     )
 
     r2, sld2 = sphere_cs.sld(
-      self.params['r2'],
-      self.params['d'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSolvent']
+      theta['r2'],
+      theta['d'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSolvent']
     )
-    self.r = np.concatenate([r1, r1[::-1], r2])
-    self.sld = np.concatenate([sld1, sld1[::-1], sld2])
-
-  def calcMagneticModel(self):
-    self.I = self.params['i0'] * (
-      (1-self.params['fraction']) * sphere_cs.magnetic_formfactor(
-        self.q,
-        self.params['r1'],
-        self.params['d'],
-        self.params['sldCore'],
-        self.params['sldShell'],
-        self.params['sldSolvent'],
-        self.params['sigR1'],
-        self.params['sigD'],
-        self.params['dDead1'],
-        self.params['magSldCore'],
-        self.params['magSldShell'],
-        self.params['magSldSolvent'],
-        self.params['xi'],
-        self.params['sin2alpha'],
-        self.params['polarization'],
-    ) + self.params['fraction'] * sphere_cs.magnetic_formfactor(
-        self.q,
-        self.params['r2'],
-        self.params['d'],
-        self.params['sldCore'],
-        self.params['sldShell'],
-        self.params['sldSolvent'],
-        self.params['sigR2'],
-        self.params['sigD'],
-        self.params['dDead2'],
-        self.params['magSldCore'],
-        self.params['magSldShell'],
-        self.params['magSldSolvent'],
-        self.params['xi'],
-        self.params['sin2alpha'],
-        self.params['polarization'],
-    )) + self.params['bg']
-
+    r = np.concatenate([r1, r1[::-1], r2])
+    sld = np.concatenate([sld1, sld1[::-1], sld2])
+    return {'r': r, 'sld': sld}
 
+  @classmethod
+  def magneticProfile(cls, theta):
     r1, sld1 = sphere_cs.sld(
-      self.params['r1'],
-      self.params['d'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSolvent']
+      theta['r1'],
+      theta['d'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSolvent']
     )
 
     r2, sld2 = sphere_cs.sld(
-      self.params['r2'],
-      self.params['d'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSolvent']
+      theta['r2'],
+      theta['d'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSolvent']
     )
-    self.r = np.concatenate([r1, r1[::-1], r2])
-    self.sld = np.concatenate([sld1, sld1[::-1], sld2])
+    r = np.concatenate([r1, r1[::-1], r2])
+    sld = np.concatenate([sld1, sld1[::-1], sld2])
 
     rMag1, sldMag1 = sphere_cs.sld(
-      self.params['r1']-self.params['dDead1'],
-      self.params['d'],
-      self.params['magSldCore'],
-      self.params['magSldShell'],
-      self.params['magSldSolvent']
+      theta['r1']-theta['dDead1'],
+      theta['d'],
+      theta['magSldCore'],
+      theta['magSldShell'],
+      theta['magSldSolvent']
     )
 
     rMag2, sldMag2 = sphere_cs.sld(
-      self.params['r2']-self.params['dDead2'],
-      self.params['d'],
-      self.params['magSldCore'],
-      self.params['magSldShell'],
-      self.params['magSldSolvent']
+      theta['r2']-theta['dDead2'],
+      theta['d'],
+      theta['magSldCore'],
+      theta['magSldShell'],
+      theta['magSldSolvent']
     )
-    self.rMag = np.concatenate([rMag1, rMag1[::-1], rMag2])
-    self.sldMag = np.concatenate([sldMag1, sldMag1[::-1], sldMag2])
+    rMag = np.concatenate([rMag1, rMag1[::-1], rMag2])
+    sldMag = np.concatenate([sldMag1, sldMag1[::-1], sldMag2])
+    return {'r': r, 'sld': sld, 'rMag': rMag, 'sldMag': sldMag}
@@ -1,8 +1,10 @@
 from modelexp.models.sas import SAXSModel
-from fortSAS import sphere_cs, sphere
+from modelexp.kernels.sas import sphere_cs, sphere
 import numpy as np
 
 class SphereCSBimodalOA(SAXSModel):
+  linearParameters = ('i0', 'i0Oleic', 'fraction', 'bg')
+
   def initParameters(self):
     self.params.add('r1', 100)
     self.params.add('r2', 70)
@@ -31,131 +33,138 @@ class SphereCSBimodalOA(SAXSModel):
 
 
 
-  def calcModel(self):
-    self.I = self.params['i0'] * (
-      self.params['fraction'] * sphere_cs.formfactor(
-        self.q,
-        self.params['r1'],
-        self.params['d'],
-        self.params['sldCore'],
-        self.params['sldShell'],
-        self.params['sldSolvent'],
-        self.params['sigR1'],
-        self.params['sigD']
-    ) + (1-self.params['fraction']) * sphere_cs.formfactor(
-        self.q,
-        self.params['r2'],
-        self.params['d'],
-        self.params['sldCore'],
-        self.params['sldShell'],
-        self.params['sldSolvent'],
-        self.params['sigR2'],
-        self.params['sigD']
-    )) + self.params['i0Oleic'] * sphere.formfactor(
-      self.q,
-      self.params['d'],
-      self.params['sldOleic'],
-      self.params['sldSolvent'],
+  @classmethod
+  def evaluate(cls, q, theta):
+    return theta['i0'] * (
+      theta['fraction'] * sphere_cs.formfactor(
+        q,
+        theta['r1'],
+        theta['d'],
+        theta['sldCore'],
+        theta['sldShell'],
+        theta['sldSolvent'],
+        theta['sigR1'],
+        theta['sigD']
+    ) + (1-theta['fraction']) * sphere_cs.formfactor(
+        q,
+        theta['r2'],
+        theta['d'],
+        theta['sldCore'],
+        theta['sldShell'],
+        theta['sldSolvent'],
+        theta['sigR2'],
+        theta['sigD']
+    )) + theta['i0Oleic'] * sphere.formfactor(
+      q,
+      theta['d'],
+      theta['sldOleic'],
+      theta['sldSolvent'],
       0
-    ) + self.params['bg']
+    ) + theta['bg']
+
+  @classmethod
+  def evaluateMagnetic(cls, q, theta):
+    return theta['i0'] * (
+      theta['fraction'] * sphere_cs.magnetic_formfactor(
+        q,
+        theta['r1'],
+        theta['d'],
+        theta['sldCore'],
+        theta['sldShell'],
+        theta['sldSolvent'],
+        theta['sigR1'],
+        theta['sigD'],
+        theta['dDead1'],
+        theta['magSldCore'],
+        theta['magSldShell'],
+        theta['magSldSolvent'],
+        theta['xi'],
+        theta['sin2alpha'],
+        theta['polarization'],
+    ) + (1 - theta['fraction']) * sphere_cs.magnetic_formfactor(
+        q,
+        theta['r2'],
+        theta['d'],
+        theta['sldCore'],
+        theta['sldShell'],
+        theta['sldSolvent'],
+        theta['sigR2'],
+        theta['sigD'],
+        theta['dDead2'],
+        theta['magSldCore'],
+        theta['magSldShell'],
+        theta['magSldSolvent'],
+        theta['xi'],
+        theta['sin2alpha'],
+        theta['polarization'],
+    )) + theta['i0Oleic'] * sphere.magnetic_formfactor(
+      q,
+      theta['d'],
+      theta['sldOleic'],
+      theta['sldSolvent'],
+      0,
+      0,
+      0,
+      theta['xi'],
+      theta['sin2alpha'],
+      theta['polarization']
+    ) + theta['bg']
 
+  @classmethod
+  def profile(cls, theta):
     r1, sld1 = sphere_cs.sld(
-      self.params['r1'],
-      self.params['d'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSolvent']
+      theta['r1'],
+      theta['d'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSolvent']
     )
 
     r2, sld2 = sphere_cs.sld(
-      self.params['r2'],
-      self.params['d'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSolvent']
+      theta['r2'],
+      theta['d'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSolvent']
     )
 
     r3, sld3 = sphere.sld(
-      self.params['d'],
-      self.params['sldOleic'],
-      self.params['sldSolvent']
+      theta['d'],
+      theta['sldOleic'],
+      theta['sldSolvent']
     )
-    self.r = np.concatenate([r1, r1[::-1], r2, r2[::-1], r3])
-    self.sld = np.concatenate([sld1, sld1[::-1], sld2, sld2[::-1], sld3])
-
-  def calcMagneticModel(self):
-    self.I = self.params['i0'] * (
-      self.params['fraction'] * sphere_cs.magnetic_formfactor(
-        self.q,
-        self.params['r1'],
-        self.params['d'],
-        self.params['sldCore'],
-        self.params['sldShell'],
-        self.params['sldSolvent'],
-        self.params['sigR1'],
-        self.params['sigD'],
-        self.params['dDead1'],
-        self.params['magSldCore'],
-        self.params['magSldShell'],
-        self.params['magSldSolvent'],
-        self.params['xi'],
-        self.params['sin2alpha'],
-        self.params['polarization'],
-    ) + (1 - self.params['fraction']) * sphere_cs.magnetic_formfactor(
-        self.q,
-        self.params['r2'],
-        self.params['d'],
-        self.params['sldCore'],
-        self.params['sldShell'],
-        self.params['sldSolvent'],
-        self.params['sigR2'],
-        self.params['sigD'],
-        self.params['dDead2'],
-        self.params['magSldCore'],
-        self.params['magSldShell'],
-        self.params['magSldSolvent'],
-        self.params['xi'],
-        self.params['sin2alpha'],
-        self.params['polarization'],
-    )) + self.params['i0Oleic'] * sphere.magnetic_formfactor(
-      self.q,
-      self.params['d'],
-      self.params['sldOleic'],
-      self.params['sldSolvent'],
-      0,
-      0,
-      0,
-      self.params['xi'],
-      self.params['sin2alpha'],
-      self.params['polarization']
-    ) + self.params['bg']
+    r = np.concatenate([r1, r1[::-1], r2, r2[::-1], r3])
+    sld = np.concatenate([sld1, sld1[::-1], sld2, sld2[::-1], sld3])
+    return {'r': r, 'sld': sld}
 
+  @classmethod
+  def magneticProfile(cls, theta):
     r1, sld1 = sphere_cs.sld(
-      self.params['r1'],
-      self.params['d'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSolvent']
+      theta['r1'],
+      theta['d'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSolvent']
     )
 
     r2, sld2 = sphere_cs.sld(
-      self.params['r2'],
-      self.params['d'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSolvent']
+      theta['r2'],
+      theta['d'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSolvent']
     )
 
     r3, sld3 = sphere.sld(
-      self.params['d'],
-      self.params['sldOleic'],
-      self.params['sldSolvent']
+      theta['d'],
+      theta['sldOleic'],
+      theta['sldSolvent']
     )
-    self.r = np.concatenate([r1, r1[::-1], r2, r2[::-1], r3])
-    self.sld = np.concatenate([sld1, sld1[::-1], sld2, sld2[::-1], sld3])
+    r = np.concatenate([r1, r1[::-1], r2, r2[::-1], r3])
+    sld = np.concatenate([sld1, sld1[::-1], sld2, sld2[::-1], sld3])
 
-    reducedR1 = self.params['r1']-self.params['dDead1']
-    reducedR2 = self.params['r2']-self.params['dDead2']
+    reducedR1 = theta['r1']-theta['dDead1']
+    reducedR2 = theta['r2']-theta['dDead2']
     if reducedR1 < 0:
       reducedR1 = 0
     if reducedR2 < 0:
@@ -163,24 +172,25 @@ class SphereCSBimodalOA(SAXSModel):
 
     rMag1, sldMag1 = sphere_cs.sld(
       reducedR1,
-      self.params['d'],
-      self.params['magSldCore'],
-      self.params['magSldShell'],
-      self.params['magSldSolvent']
+      theta['d'],
+      theta['magSldCore'],
+      theta['magSldShell'],
+      theta['magSldSolvent']
     )
 
     rMag2, sldMag2 = sphere_cs.sld(
       reducedR2,
-      self.params['d'],
-      self.params['magSldCore'],
-      self.params['magSldShell'],
-      self.params['magSldSolvent']
+      theta['d'],
+      theta['magSldCore'],
+      theta['magSldShell'],
+      theta['magSldSolvent']
     )
 
     rMag3, sldMag3 = sphere.sld(
-      self.params['d'],
+      theta['d'],
       0,
       0
     )
-    self.rMag = np.concatenate([rMag1, rMag1[::-1], rMag2, rMag2[::-1], rMag3])
-    self.sldMag = np.concatenate([sldMag1, sldMag1[::-1], sldMag2, sldMag2[::-1], sldMag3])
+    rMag = np.concatenate([rMag1, rMag1[::-1], rMag2, rMag2[::-1], rMag3])
+    sldMag = np.concatenate([sldMag1, sldMag1[::-1], sldMag2, sldMag2[::-1], sldMag3])
+    return {'r': r, 'sld': sld, 'rMag': rMag, 'sldMag': sldMag}
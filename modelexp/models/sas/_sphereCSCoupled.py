@@ -1,5 +1,5 @@
 from modelexp.models.sas import SAXSModel
-from fortSAS import sphere_cs_coupled
+from modelexp.kernels.sas import sphere_cs_coupled
 
 class SphereCSCoupled(SAXSModel):
   def initParameters(self):
@@ -23,57 +23,59 @@ class SphereCSCoupled(SAXSModel):
     self.addConstantParam('magSldSolvent')
 
 
-  def calcModel(self):
-    self.I = self.params['i0'] * sphere_cs_coupled.formfactor(
-      self.q,
-      self.params['particleSize'],
-      self.params['d'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSolvent'],
-      self.params['sigParticleSize'],
-      self.params['sigD']
-    ) + self.params['bg']
+  @classmethod
+  def evaluate(cls, q, theta):
+    return cls.scaleIntensity(theta, sphere_cs_coupled.formfactor(
+      q,
+      theta['particleSize'],
+      theta['d'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSolvent'],
+      theta['sigParticleSize'],
+      theta['sigD']
+    ))
 
-    self.r, self.sld = sphere_cs_coupled.sld(
-      self.params['particleSize'],
-      self.params['d'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSolvent']
-    )
-
-  def calcMagneticModel(self):
-    self.I = self.params['i0'] * sphere_cs_coupled.magnetic_formfactor(
-      self.q,
-      self.params['particleSize'],
-      self.params['d'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSolvent'],
-      self.params['sigParticleSize'],
-      self.params['sigD'],
-      self.params['dDead'],
-      self.params['magSldCore'],
-      self.params['magSldShell'],
-      self.params['magSldSolvent'],
-      self.params['xi'],
-      self.params['sin2alpha'],
-      self.params['polarization']
-    ) + self.params['bg']
+  @classmethod
+  def evaluateMagnetic(cls, q, theta):
+    return cls.scaleIntensity(theta, sphere_cs_coupled.magnetic_formfactor(
+      q,
+      theta['particleSize'],
+      theta['d'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSolvent'],
+      theta['sigParticleSize'],
+      theta['sigD'],
+      theta['dDead'],
+      theta['magSldCore'],
+      theta['magSldShell'],
+      theta['magSldSolvent'],
+      theta['xi'],
+      theta['sin2alpha'],
+      theta['polarization']
+    ))
 
-    self.r, self.sld = sphere_cs_coupled.sld(
-      self.params['particleSize'],
-      self.params['d'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSolvent']
+  @classmethod
+  def profile(cls, theta):
+    r, sld = sphere_cs_coupled.sld(
+      theta['particleSize'],
+      theta['d'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSolvent']
     )
+    return {'r': r, 'sld': sld}
 
-    self.rMag, self.sldMag = sphere_cs_coupled.sld(
-      self.params['particleSize']-self.params['dDead'],
-      self.params['d'],
-      self.params['magSldCore'],
-      self.params['magSldShell'],
-      self.params['magSldSolvent']
+  @classmethod
+  def magneticProfile(cls, theta):
+    profile = cls.profile(theta)
+    rMag, sldMag = sphere_cs_coupled.sld(
+      theta['particleSize']-theta['dDead'],
+      theta['d'],
+      theta['magSldCore'],
+      theta['magSldShell'],
+      theta['magSldSolvent']
     )
+    profile.update({'rMag': rMag, 'sldMag': sldMag})
+    return profile
@@ -1,9 +1,11 @@
 from modelexp.models.sas import SAXSModel
-from fortSAS import sphere, sphere_cs
+from modelexp.kernels.sas import sphere, sphere_cs
 
 import numpy as np
 
 class SphereCSOA(SAXSModel):
+  linearParameters = ('i0', 'i0Oleic', 'bg')
+
   def initParameters(self):
     self.params.add('r', 100)
     self.params.add('d', 20)
@@ -29,102 +31,95 @@ class SphereCSOA(SAXSModel):
 
 
 
-  def calcModel(self):
-    self.I = self.params['i0'] * sphere_cs.formfactor(
-      self.q,
-      self.params['r'],
-      self.params['d'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSolvent'],
-      self.params['sigR'],
-      self.params['sigD']
-    ) + self.params['i0Oleic'] * sphere.formfactor(
-      self.q,
-      self.params['rOleic'],
-      self.params['sldOleic'],
-      self.params['sldSolvent'],
+  @classmethod
+  def evaluate(cls, q, theta):
+    return theta['i0'] * sphere_cs.formfactor(
+      q,
+      theta['r'],
+      theta['d'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSolvent'],
+      theta['sigR'],
+      theta['sigD']
+    ) + theta['i0Oleic'] * sphere.formfactor(
+      q,
+      theta['rOleic'],
+      theta['sldOleic'],
+      theta['sldSolvent'],
       0
-    ) + self.params['bg']
-
-    r1, sld1 = sphere_cs.sld(
-      self.params['r'],
-      self.params['d'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSolvent']
-    )
-
-    r2, sld2 = sphere.sld(
-      self.params['rOleic'],
-      self.params['sldOleic'],
-      self.params['sldSolvent']
-    )
-    self.r = np.concatenate([r1, r1[::-1], r2])
-    self.sld = np.concatenate([sld1, sld1[::-1], sld2])
-
+    ) + theta['bg']
 
-  def calcMagneticModel(self):
-    self.I = self.params['i0'] * sphere_cs.magnetic_formfactor(
-      self.q,
-      self.params['r'],
-      self.params['d'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSolvent'],
-      self.params['sigR'],
-      self.params['sigD'],
-      self.params['dDead'],
-      self.params['magSldCore'],
-      self.params['magSldShell'],
-      self.params['magSldSolvent'],
-      self.params['xi'],
-      self.params['sin2alpha'],
-      self.params['polarization'],
-    ) + self.params['i0Oleic'] * sphere.magnetic_formfactor(
-      self.q,
-      self.params['rOleic'],
-      self.params['sldOleic'],
-      self.params['sldSolvent'],
+  @classmethod
+  def evaluateMagnetic(cls, q, theta):
+    return theta['i0'] * sphere_cs.magnetic_formfactor(
+      q,
+      theta['r'],
+      theta['d'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSolvent'],
+      theta['sigR'],
+      theta['sigD'],
+      theta['dDead'],
+      theta['magSldCore'],
+      theta['magSldShell'],
+      theta['magSldSolvent'],
+      theta['xi'],
+      theta['sin2alpha'],
+      theta['polarization'],
+    ) + theta['i0Oleic'] * sphere.magnetic_formfactor(
+      q,
+      theta['rOleic'],
+      theta['sldOleic'],
+      theta['sldSolvent'],
       0,
       0,
       0,
-      self.params['xi'],
-      self.params['sin2alpha'],
-      self.params['polarization']
-    ) + self.params['bg']
+      theta['xi'],
+      theta['sin2alpha'],
+      theta['polarization']
+    ) + theta['bg']
 
+  @classmethod
+  def profile(cls, theta):
     r1, sld1 = sphere_cs.sld(
-      self.params['r'],
-      self.params['d'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSolvent']
+      theta['r'],
+      theta['d'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSolvent']
     )
 
     r2, sld2 = sphere.sld(
-      self.params['rOleic'],
-      self.params['sldOleic'],
-      self.params['sldSolvent']
+      theta['rOleic'],
+      theta['sldOleic'],
+      theta['sldSolvent']
     )
-    self.r = np.concatenate([r1, r1[::-1], r2])
-    self.sld = np.concatenate([sld1, sld1[::-1], sld2])
+    r = np.concatenate([r1, r1[::-1], r2])
+    sld = np.concatenate([sld1, sld1[::-1], sld2])
+    return {'r': r, 'sld': sld}
 
-    reducedR = self.params['r'] - self.params['dDead']
+  @classmethod
+  def magneticProfile(cls, theta):
+    profile = cls.profile(theta)
+    reducedR = theta['r'] - theta['dDead']
     if reducedR < 0:
         reducedR = 0
     rMag1, sldMag1 = sphere_cs.sld(
       reducedR,
-      self.params['d'],
-      self.params['magSldCore'],
-      self.params['magSldShell'],
-      self.params['magSldSolvent']
+      theta['d'],
+      theta['magSldCore'],
+      theta['magSldShell'],
+      theta['magSldSolvent']
     )
 
     rMag2, sldMag2 = sphere.sld(
-      self.params['rOleic'],
+      theta['rOleic'],
       0,
       0
     )
-    self.rMag = np.concatenate([rMag1, rMag1[::-1], rMag2])
-    self.sldMag = np.concatenate([sldMag1, sldMag1[::-1], sldMag2])
+    rMag = np.concatenate([rMag1, rMag1[::-1], rMag2])
+    sldMag = np.concatenate([sldMag1, sldMag1[::-1], sldMag2])
+    profile.update({'rMag': rMag, 'sldMag': sldMag})
+    return profile
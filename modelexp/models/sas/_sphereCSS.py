@@ -1,5 +1,5 @@
 from modelexp.models.sas import SAXSModel
-from fortSAS import sphere_css
+from modelexp.kernels.sas import sphere_css
 
 class SphereCSS(SAXSModel):
   def initParameters(self):
@@ -25,69 +25,69 @@ class SphereCSS(SAXSModel):
     self.addConstantParam('magSldSurfactant')
     self.addConstantParam('magSldSolvent')
 
-  def calcModel(self):
-    self.I = self.params['i0'] * sphere_css.formfactor(
-      self.q,
-      self.params['r'],
-      self.params['dShell'],
-      self.params['dSurfactant'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
-      self.params['sigR'],
-      self.params['sigDShell'],
-      self.params['sigDSurfactant']
-    ) + self.params['bg']
+  @classmethod
+  def evaluate(cls, q, theta):
+    return cls.scaleIntensity(theta, sphere_css.formfactor(
+      q,
+      theta['r'],
+      theta['dShell'],
+      theta['dSurfactant'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSurfactant'],
+      theta['sldSolvent'],
+      theta['sigR'],
+      theta['sigDShell'],
+      theta['sigDSurfactant']
+    ))
 
-    self.r, self.sld = sphere_css.sld(
-      self.params['r'],
-      self.params['dShell'],
-      self.params['dSurfactant'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
-    )
-
-  def calcMagneticModel(self):
-    self.I = self.params['i0'] * sphere_css.magnetic_formfactor(
-      self.q,
-      self.params['r'],
-      self.params['dShell'],
-      self.params['dSurfactant'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
-      self.params['sigR'],
-      self.params['sigDShell'],
-      self.params['sigDSurfactant'],
-      self.params['magSldCore'],
-      self.params['magSldShell'],
-      self.params['magSldSurfactant'],
-      self.params['magSldSolvent'],
-      self.params['xi'],
-      self.params['sin2alpha'],
-      self.params['polarization'],
-    ) + self.params['bg']
+  @classmethod
+  def evaluateMagnetic(cls, q, theta):
+    return cls.scaleIntensity(theta, sphere_css.magnetic_formfactor(
+      q,
+      theta['r'],
+      theta['dShell'],
+      theta['dSurfactant'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSurfactant'],
+      theta['sldSolvent'],
+      theta['sigR'],
+      theta['sigDShell'],
+      theta['sigDSurfactant'],
+      theta['magSldCore'],
+      theta['magSldShell'],
+      theta['magSldSurfactant'],
+      theta['magSldSolvent'],
+      theta['xi'],
+      theta['sin2alpha'],
+      theta['polarization'],
+    ))
 
-    self.r, self.sld = sphere_css.sld(
-      self.params['r'],
-      self.params['dShell'],
-      self.params['dSurfactant'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
+  @classmethod
+  def profile(cls, theta):
+    r, sld = sphere_css.sld(
+      theta['r'],
+      theta['dShell'],
+      theta['dSurfactant'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSurfactant'],
+      theta['sldSolvent'],
     )
+    return {'r': r, 'sld': sld}
 
-    self.rMag, self.sldMag = sphere_css.sld(
-      self.params['r'],
-      self.params['dShell'],
-      self.params['dSurfactant'],
-      self.params['magSldCore'],
-      self.params['magSldShell'],
-      self.params['magSldSurfactant'],
-      self.params['magSldSolvent'],
+  @classmethod
+  def magneticProfile(cls, theta):
+    profile = cls.profile(theta)
+    rMag, sldMag = sphere_css.sld(
+      theta['r'],
+      theta['dShell'],
+      theta['dSurfactant'],
+      theta['magSldCore'],
+      theta['magSldShell'],
+      theta['magSldSurfactant'],
+      theta['magSldSolvent'],
     )
+    profile.update({'rMag': rMag, 'sldMag': sldMag})
+    return profile
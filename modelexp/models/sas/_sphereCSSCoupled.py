@@ -1,5 +1,5 @@
 from modelexp.models.sas import SAXSModel
-from fortSAS import sphere_css_coupled
+from modelexp.kernels.sas import sphere_css_coupled
 
 class SphereCSSCoupled(SAXSModel):
   def initParameters(self):
@@ -24,67 +24,67 @@ class SphereCSSCoupled(SAXSModel):
     self.addConstantParam('magSldSurfactant')
     self.addConstantParam('magSldSolvent')
 
-  def calcModel(self):
-    self.I = self.params['i0'] * sphere_css_coupled.formfactor(
-      self.q,
-      self.params['particleSize'],
-      self.params['dShell'],
-      self.params['dSurfactant'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
-      self.params['sigParticleSize'],
-      self.params['sigD']
-    ) + self.params['bg']
+  @classmethod
+  def evaluate(cls, q, theta):
+    return cls.scaleIntensity(theta, sphere_css_coupled.formfactor(
+      q,
+      theta['particleSize'],
+      theta['dShell'],
+      theta['dSurfactant'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSurfactant'],
+      theta['sldSolvent'],
+      theta['sigParticleSize'],
+      theta['sigD']
+    ))
 
-    self.r, self.sld = sphere_css_coupled.sld(
-      self.params['particleSize'],
-      self.params['dShell'],
-      self.params['dSurfactant'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
-    )
-
-  def calcMagneticModel(self):
-    self.I = self.params['i0'] * sphere_css_coupled.magnetic_formfactor(
-      self.q,
-      self.params['particleSize'],
-      self.params['dShell'],
-      self.params['dSurfactant'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
-      self.params['sigParticleSize'],
-      self.params['sigD'],
-      self.params['magSldCore'],
-      self.params['magSldShell'],
-      self.params['magSldSurfactant'],
-      self.params['magSldSolvent'],
-      self.params['xi'],
-      self.params['sin2alpha'],
-      self.params['polarization']
-    ) + self.params['bg']
+  @classmethod
+  def evaluateMagnetic(cls, q, theta):
+    return cls.scaleIntensity(theta, sphere_css_coupled.magnetic_formfactor(
+      q,
+      theta['particleSize'],
+      theta['dShell'],
+      theta['dSurfactant'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSurfactant'],
+      theta['sldSolvent'],
+      theta['sigParticleSize'],
+      theta['sigD'],
+      theta['magSldCore'],
+      theta['magSldShell'],
+      theta['magSldSurfactant'],
+      theta['magSldSolvent'],
+      theta['xi'],
+      theta['sin2alpha'],
+      theta['polarization']
+    ))
 
-    self.r, self.sld = sphere_css_coupled.sld(
-      self.params['particleSize'],
-      self.params['dShell'],
-      self.params['dSurfactant'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
+  @classmethod
+  def profile(cls, theta):
+    r, sld = sphere_css_coupled.sld(
+      theta['particleSize'],
+      theta['dShell'],
+      theta['dSurfactant'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSurfactant'],
+      theta['sldSolvent'],
     )
+    return {'r': r, 'sld': sld}
 
-    self.rMag, self.sldMag = sphere_css_coupled.sld(
-      self.params['particleSize'],
-      self.params['dShell'],
-      self.params['dSurfactant'],
-      self.params['magSldCore'],
-      self.params['magSldShell'],
-      self.params['magSldSurfactant'],
-      self.params['magSldSolvent'],
+  @classmethod
+  def magneticProfile(cls, theta):
+    profile = cls.profile(theta)
+    rMag, sldMag = sphere_css_coupled.sld(
+      theta['particleSize'],
+      theta['dShell'],
+      theta['dSurfactant'],
+      theta['magSldCore'],
+      theta['magSldShell'],
+      theta['magSldSurfactant'],
+      theta['magSldSolvent'],
     )
+    profile.update({'rMag': rMag, 'sldMag': sldMag})
+    return profile
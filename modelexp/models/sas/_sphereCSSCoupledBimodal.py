@@ -1,8 +1,10 @@
 from modelexp.models.sas import SAXSModel
-from fortSAS import sphere_css_coupled
+from modelexp.kernels.sas import sphere_css_coupled
 import numpy as np
 
 class SphereCSSCoupledBimodal(SAXSModel):
+  linearParameters = ('i0', 'fraction', 'bg')
+
   def initParameters(self):
     self.params.add('particleSize1', 100)
     self.params.add('particleSize2', 70)
@@ -32,135 +34,123 @@ class SphereCSSCoupledBimodal(SAXSModel):
     self.addConstantParam('magSldSurfactant')
     self.addConstantParam('magSldSolvent')
 
-  def calcModel(self):
-    self.I = self.params['i0'] * (
-      (1-self.params['fraction']) * sphere_css_coupled.formfactor(
-        self.q,
-        self.params['particleSize1'],
-        self.params['dShell1'],
-        self.params['dSurfactant1'],
-        self.params['sldCore'],
-        self.params['sldShell'],
-        self.params['sldSurfactant'],
-        self.params['sldSolvent'],
-        self.params['sigParticleSize1'],
-        self.params['sigD1']
-      ) + self.params['fraction'] * sphere_css_coupled.formfactor(
-        self.q,
-        self.params['particleSize2'],
-        self.params['dShell2'],
-        self.params['dSurfactant2'],
-        self.params['sldCore'],
-        self.params['sldShell'],
-        self.params['sldSurfactant'],
-        self.params['sldSolvent'],
-        self.params['sigParticleSize2'],
-        self.params['sigD2']
+  @classmethod
+  def evaluate(cls, q, theta):
+    return theta['i0'] * (
+      (1-theta['fraction']) * sphere_css_coupled.formfactor(
+        q,
+        theta['particleSize1'],
+        theta['dShell1'],
+        theta['dSurfactant1'],
+        theta['sldCore'],
+        theta['sldShell'],
+        theta['sldSurfactant'],
+        theta['sldSolvent'],
+        theta['sigParticleSize1'],
+        theta['sigD1']
+      ) + theta['fraction'] * sphere_css_coupled.formfactor(
+        q,
+        theta['particleSize2'],
+        theta['dShell2'],
+        theta['dSurfactant2'],
+        theta['sldCore'],
+        theta['sldShell'],
+        theta['sldSurfactant'],
+        theta['sldSolvent'],
+        theta['sigParticleSize2'],
+        theta['sigD2']
       )
-    )  + self.params['bg']
-
-    r1, sld1 = sphere_css_coupled.sld(
-      self.params['particleSize1'],
-      self.params['dShell1'],
-      self.params['dSurfactant1'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
-    )
-
-    r2, sld2 = sphere_css_coupled.sld(
-      self.params['particleSize2'],
-      self.params['dShell2'],
-      self.params['dSurfactant2'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
-    )
-    self.r = np.concatenate([r1, r1[::-1], r2])
-    self.sld = np.concatenate([sld1, sld1[::-1], sld2])
+    )  + theta['bg']
 
-  def calcMagneticModel(self):
-    self.I = self.params['i0'] * ((1-self.params['fraction']) * sphere_css_coupled.magnetic_formfactor(
-        self.q,
-        self.params['particleSize1'],
-        self.params['dShell1'],
-        self.params['dSurfactant1'],
-        self.params['sldCore'],
-        self.params['sldShell'],
-        self.params['sldSurfactant'],
-        self.params['sldSolvent'],
-        self.params['sigParticleSize1'],
-        self.params['sigD1'],
-        self.params['magSldCore1'],
-        self.params['magSldShell1'],
-        self.params['magSldSurfactant'],
-        self.params['magSldSolvent'],
-        self.params['xi'],
-        self.params['sin2alpha'],
-        self.params['polarization']
-      ) + self.params['fraction'] * sphere_css_coupled.magnetic_formfactor(
-        self.q,
-        self.params['particleSize2'],
-        self.params['dShell2'],
-        self.params['dSurfactant2'],
-        self.params['sldCore'],
-        self.params['sldShell'],
-        self.params['sldSurfactant'],
-        self.params['sldSolvent'],
-        self.params['sigParticleSize2'],
-        self.params['sigD2'],
-        self.params['magSldCore2'],
-        self.params['magSldShell2'],
-        self.params['magSldSurfactant'],
-        self.params['magSldSolvent'],
-        self.params['xi'],
-        self.params['sin2alpha'],
-        self.params['polarization']
+  @classmethod
+  def evaluateMagnetic(cls, q, theta):
+    return theta['i0'] * ((1-theta['fraction']) * sphere_css_coupled.magnetic_formfactor(
+        q,
+        theta['particleSize1'],
+        theta['dShell1'],
+        theta['dSurfactant1'],
+        theta['sldCore'],
+        theta['sldShell'],
+        theta['sldSurfactant'],
+        theta['sldSolvent'],
+        theta['sigParticleSize1'],
+        theta['sigD1'],
+        theta['magSldCore1'],
+        theta['magSldShell1'],
+        theta['magSldSurfactant'],
+        theta['magSldSolvent'],
+        theta['xi'],
+        theta['sin2alpha'],
+        theta['polarization']
+      ) + theta['fraction'] * sphere_css_coupled.magnetic_formfactor(
+        q,
+        theta['particleSize2'],
+        theta['dShell2'],
+        theta['dSurfactant2'],
+        theta['sldCore'],
+        theta['sldShell'],
+        theta['sldSurfactant'],
+        theta['sldSolvent'],
+        theta['sigParticleSize2'],
+        theta['sigD2'],
+        theta['magSldCore2'],
+        theta['magSldShell2'],
+        theta['magSldSurfactant'],
+        theta['magSldSolvent'],
+        theta['xi'],
+        theta['sin2alpha'],
+        theta['polarization']
       )
-    )  + self.params['bg']
+    )  + theta['bg']
 
+  @classmethod
+  def profile(cls, theta):
     r1, sld1 = sphere_css_coupled.sld(
-      self.params['particleSize1'],
-      self.params['dShell1'],
-      self.params['dSurfactant1'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
+      theta['particleSize1'],
+      theta['dShell1'],
+      theta['dSurfactant1'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSurfactant'],
+      theta['sldSolvent'],
     )
 
     r2, sld2 = sphere_css_coupled.sld(
-      self.params['particleSize2'],
-      self.params['dShell2'],
-      self.params['dSurfactant2'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
+      theta['particleSize2'],
+      theta['dShell2'],
+      theta['dSurfactant2'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSurfactant'],
+      theta['sldSolvent'],
     )
-    self.r = np.concatenate([r1, r1[::-1], r2])
-    self.sld = np.concatenate([sld1, sld1[::-1], sld2])
+    r = np.concatenate([r1, r1[::-1], r2])
+    sld = np.concatenate([sld1, sld1[::-1], sld2])
+    return {'r': r, 'sld': sld}
 
+  @classmethod
+  def magneticProfile(cls, theta):
+    profile = cls.profile(theta)
     r1Mag, sld1Mag = sphere_css_coupled.sld(
-      self.params['particleSize1'],
-      self.params['dShell1'],
-      self.params['dSurfactant1'],
-      self.params['magSldCore1'],
-      self.params['magSldShell1'],
-      self.params['magSldSurfactant'],
-      self.params['magSldSolvent'],
+      theta['particleSize1'],
+      theta['dShell1'],
+      theta['dSurfactant1'],
+      theta['magSldCore1'],
+      theta['magSldShell1'],
+      theta['magSldSurfactant'],
+      theta['magSldSolvent'],
     )
 
     r2Mag, sld2Mag = sphere_css_coupled.sld(
-      self.params['particleSize2'],
-      self.params['dShell2'],
-      self.params['dSurfactant2'],
-      self.params['magSldCore2'],
-      self.params['magSldShell2'],
-      self.params['magSldSurfactant'],
-      self.params['magSldSolvent'],
+      theta['particleSize2'],
+      theta['dShell2'],
+      theta['dSurfactant2'],
+      theta['magSldCore2'],
+      theta['magSldShell2'],
+      theta['magSldSurfactant'],
+      theta['magSldSolvent'],
     )
-    self.rMag = np.concatenate([r1Mag, r1Mag[::-1], r2Mag])
-    self.sldMag = np.concatenate([sld1Mag, sld1Mag[::-1], sld2Mag])
+    rMag = np.concatenate([r1Mag, r1Mag[::-1], r2Mag])
+    sldMag = np.concatenate([sld1Mag, sld1Mag[::-1], sld2Mag])
+    profile.update({'rMag': rMag, 'sldMag': sldMag})
+    return profile
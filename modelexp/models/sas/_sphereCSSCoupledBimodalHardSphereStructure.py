@@ -1,8 +1,12 @@
 from modelexp.models.sas import SAXSModel
-from fortSAS import sphere_css_coupled
+from modelexp.kernels.sas import sphere_css_coupled
+from .._components import component
+from ._structureFactor import hardSphereStructureFactor
 import numpy as np
 
 class SphereCSSCoupledBimodalHSStructure(SAXSModel):
+  linearParameters = ('i0', 'fraction', 'bg')
+
   def initParameters(self):
     self.params.add('particleSize1', 100)
     self.params.add('particleSize2', 70)
@@ -34,151 +38,120 @@ class SphereCSSCoupledBimodalHSStructure(SAXSModel):
     self.addConstantParam('magSldSurfactant')
     self.addConstantParam('magSldSolvent')
 
-  def calcModel(self):
-    formfactor = (
-      (1-self.params['fraction']) * sphere_css_coupled.formfactor(
-        self.q,
-        self.params['particleSize1'],
-        self.params['dShell1'],
-        self.params['dSurfactant1'],
-        self.params['sldCore'],
-        self.params['sldShell'],
-        self.params['sldSurfactant'],
-        self.params['sldSolvent'],
-        self.params['sigParticleSize1'],
-        self.params['sigD1']
-      ) + self.params['fraction'] * sphere_css_coupled.formfactor(
-        self.q,
-        self.params['particleSize2'],
-        self.params['dShell2'],
-        self.params['dSurfactant2'],
-        self.params['sldCore'],
-        self.params['sldShell'],
-        self.params['sldSurfactant'],
-        self.params['sldSolvent'],
-        self.params['sigParticleSize2'],
-        self.params['sigD2']
-      )
+  @component('particleSize1', 'dShell1', 'dSurfactant1', 'sldCore', 'sldShell', 'sldSurfactant', 'sldSolvent', 'sigParticleSize1', 'sigD1')
+  def formfactor1(q, particleSize, dShell, dSurfactant, sldCore, sldShell, sldSurfactant, sldSolvent, sigParticleSize, sigD):
+    return sphere_css_coupled.formfactor(
+      q, particleSize, dShell, dSurfactant,
+      sldCore, sldShell, sldSurfactant, sldSolvent,
+      sigParticleSize, sigD
     )
 
-    eta = self.params['eta']
-    alpha = (1+2*eta)**2 / (1-eta)**4
-    beta = -6*eta*(1+eta/2.)**2 / (1-eta)**4
-    gamma = eta*alpha/2.
-
-    x = 2*self.q*self.params['hardSphereRadius'].value
-    sinx = np.sin(x)
-    cosx = np.cos(x)
-    G = alpha/x**2 * (sinx - x*cosx) +\
-        beta/x**3 * (2*x*sinx + (2-x**2)*cosx - 2) +\
-        gamma/x**5 * (-x**4*cosx + 4*((3*x**2-6)*cosx +\
-        (x**3 - 6*x)*sinx + 6))
+  @component('particleSize2', 'dShell2', 'dSurfactant2', 'sldCore', 'sldShell', 'sldSurfactant', 'sldSolvent', 'sigParticleSize2', 'sigD2')
+  def formfactor2(q, particleSize, dShell, dSurfactant, sldCore, sldShell, sldSurfactant, sldSolvent, sigParticleSize, sigD):
+    return sphere_css_coupled.formfactor(
+      q, particleSize, dShell, dSurfactant,
+      sldCore, sldShell, sldSurfactant, sldSolvent,
+      sigParticleSize, sigD
+    )
 
-    structurefactor = 1/(1+ 24*eta*G/x)
-    self.I = self.params['i0'] * formfactor * structurefactor + self.params['bg']
+  @classmethod
+  def evaluate(cls, q, theta):
+    return (
+      (1-theta['fraction']) * cls.formfactor1(q, theta)
+      + theta['fraction'] * cls.formfactor2(q, theta)
+    ) * theta['i0'] * hardSphereStructureFactor(q, theta) + theta['bg']
 
-    r1, sld1 = sphere_css_coupled.sld(
-      self.params['particleSize1'],
-      self.params['dShell1'],
-      self.params['dSurfactant1'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
+  @component(
+    'particleSize1', 'dShell1', 'dSurfactant1', 'sldCore', 'sldShell', 'sldSurfactant', 'sldSolvent',
+    'sigParticleSize1', 'sigD1', 'magSldCore1', 'magSldShell1', 'magSldSurfactant', 'magSldSolvent',
+    'xi', 'sin2alpha', 'polarization'
+  )
+  def magneticFormfactor1(
+    q, particleSize, dShell, dSurfactant, sldCore, sldShell, sldSurfactant, sldSolvent,
+    sigParticleSize, sigD, magSldCore, magSldShell, magSldSurfactant, magSldSolvent,
+    xi, sin2alpha, polarization
+  ):
+    return sphere_css_coupled.magnetic_formfactor(
+      q, particleSize, dShell, dSurfactant,
+      sldCore, sldShell, sldSurfactant, sldSolvent,
+      sigParticleSize, sigD,
+      magSldCore, magSldShell, magSldSurfactant, magSldSolvent,
+      xi, sin2alpha, polarization
     )
 
-    r2, sld2 = sphere_css_coupled.sld(
-      self.params['particleSize2'],
-      self.params['dShell2'],
-      self.params['dSurfactant2'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
+  @component(
+    'particleSize2', 'dShell2', 'dSurfactant2', 'sldCore', 'sldShell', 'sldSurfactant', 'sldSolvent',
+    'sigParticleSize2', 'sigD2', 'magSldCore2', 'magSldShell2', 'magSldSurfactant', 'magSldSolvent',
+    'xi', 'sin2alpha', 'polarization'
+  )
+  def magneticFormfactor2(
+    q, particleSize, dShell, dSurfactant, sldCore, sldShell, sldSurfactant, sldSolvent,
+    sigParticleSize, sigD, magSldCore, magSldShell, magSldSurfactant, magSldSolvent,
+    xi, sin2alpha, polarization
+  ):
+    return sphere_css_coupled.magnetic_formfactor(
+      q, particleSize, dShell, dSurfactant,
+      sldCore, sldShell, sldSurfactant, sldSolvent,
+      sigParticleSize, sigD,
+      magSldCore, magSldShell, magSldSurfactant, magSldSolvent,
+      xi, sin2alpha, polarization
     )
-    self.r = np.concatenate([r1, r1[::-1], r2])
-    self.sld = np.concatenate([sld1, sld1[::-1], sld2])
 
-  def calcMagneticModel(self):
-    self.I = self.params['i0'] * ((1-self.params['fraction']) * sphere_css_coupled.magnetic_formfactor(
-        self.q,
-        self.params['particleSize1'],
-        self.params['dShell1'],
-        self.params['dSurfactant1'],
-        self.params['sldCore'],
-        self.params['sldShell'],
-        self.params['sldSurfactant'],
-        self.params['sldSolvent'],
-        self.params['sigParticleSize1'],
-        self.params['sigD1'],
-        self.params['magSldCore1'],
-        self.params['magSldShell1'],
-        self.params['magSldSurfactant'],
-        self.params['magSldSolvent'],
-        self.params['xi'],
-        self.params['sin2alpha'],
-        self.params['polarization']
-      ) + self.params['fraction'] * sphere_css_coupled.magnetic_formfactor(
-        self.q,
-        self.params['particleSize2'],
-        self.params['dShell2'],
-        self.params['dSurfactant2'],
-        self.params['sldCore'],
-        self.params['sldShell'],
-        self.params['sldSurfactant'],
-        self.params['sldSolvent'],
-        self.params['sigParticleSize2'],
-        self.params['sigD2'],
-        self.params['magSldCore2'],
-        self.params['magSldShell2'],
-        self.params['magSldSurfactant'],
-        self.params['magSldSolvent'],
-        self.params['xi'],
-        self.params['sin2alpha'],
-        self.params['polarization']
-      )
-    )  + self.params['bg']
+  @classmethod
+  def evaluateMagnetic(cls, q, theta):
+    return theta['i0'] * (
+      (1-theta['fraction']) * cls.magneticFormfactor1(q, theta)
+      + theta['fraction'] * cls.magneticFormfactor2(q, theta)
+    ) + theta['bg']
 
+  @classmethod
+  def profile(cls, theta):
     r1, sld1 = sphere_css_coupled.sld(
-      self.params['particleSize1'],
-      self.params['dShell1'],
-      self.params['dSurfactant1'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
+      theta['particleSize1'],
+      theta['dShell1'],
+      theta['dSurfactant1'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSurfactant'],
+      theta['sldSolvent'],
     )
 
     r2, sld2 = sphere_css_coupled.sld(
-      self.params['particleSize2'],
-      self.params['dShell2'],
-      self.params['dSurfactant2'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
+      theta['particleSize2'],
+      theta['dShell2'],
+      theta['dSurfactant2'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSurfactant'],
+      theta['sldSolvent'],
     )
-    self.r = np.concatenate([r1, r1[::-1], r2])
-    self.sld = np.concatenate([sld1, sld1[::-1], sld2])
+    r = np.concatenate([r1, r1[::-1], r2])
+    sld = np.concatenate([sld1, sld1[::-1], sld2])
+    return {'r': r, 'sld': sld}
 
+  @classmethod
+  def magneticProfile(cls, theta):
+    profile = cls.profile(theta)
     r1Mag, sld1Mag = sphere_css_coupled.sld(
-      self.params['particleSize1'],
-      self.params['dShell1'],
-      self.params['dSurfactant1'],
-      self.params['magSldCore1'],
-      self.params['magSldShell1'],
-      self.params['magSldSurfactant'],
-      self.params['magSldSolvent'],
+      theta['particleSize1'],
+      theta['dShell1'],
+      theta['dSurfactant1'],
+      theta['magSldCore1'],
+      theta['magSldShell1'],
+      theta['magSldSurfactant'],
+      theta['magSldSolvent'],
     )
 
     r2Mag, sld2Mag = sphere_css_coupled.sld(
-      self.params['particleSize2'],
-      self.params['dShell2'],
-      self.params['dSurfactant2'],
-      self.params['magSldCore2'],
-      self.params['magSldShell2'],
-      self.params['magSldSurfactant'],
-      self.params['magSldSolvent'],
+      theta['particleSize2'],
+      theta['dShell2'],
+      theta['dSurfactant2'],
+      theta['magSldCore2'],
+      theta['magSldShell2'],
+      theta['magSldSurfactant'],
+      theta['magSldSolvent'],
     )
-    self.rMag = np.concatenate([r1Mag, r1Mag[::-1], r2Mag])
-    self.sldMag = np.concatenate([sld1Mag, sld1Mag[::-1], sld2Mag])
+    rMag = np.concatenate([r1Mag, r1Mag[::-1], r2Mag])
+    sldMag = np.concatenate([sld1Mag, sld1Mag[::-1], sld2Mag])
+    profile.update({'rMag': rMag, 'sldMag': sldMag})
+    return profile
@@ -1,7 +1,12 @@
 from modelexp.models.sas import SAXSModel
-from fortSAS import sphere_css_coupled
+from modelexp.kernels.sas import sphere_css_coupled
+from .._components import component
+from ._structureFactor import hardSphereStructureFactor
 import numpy as np
+
 class SphereCSSCoupledHSStructure(SAXSModel):
+  stackable = False # calcMagneticModel does not use evaluateMagnetic
+
   def initParameters(self):
     self.params.add('particleSize', 100)
     self.params.add('dShell', 30)
@@ -26,45 +31,37 @@ class SphereCSSCoupledHSStructure(SAXSModel):
     self.addConstantParam('magSldSurfactant')
     self.addConstantParam('magSldSolvent')
 
-  def calcModel(self):
-    formfactor = sphere_css_coupled.formfactor(
-      self.q,
-      self.params['particleSize'],
-      self.params['dShell'],
-      self.params['dSurfactant'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
-      self.params['sigParticleSize'],
-      self.params['sigD']
+  @component('particleSize', 'dShell', 'dSurfactant', 'sldCore', 'sldShell', 'sldSurfactant', 'sldSolvent', 'sigParticleSize', 'sigD')
+  def formfactor(q, particleSize, dShell, dSurfactant, sldCore, sldShell, sldSurfactant, sldSolvent, sigParticleSize, sigD):
+    return sphere_css_coupled.formfactor(
+      q,
+      particleSize,
+      dShell,
+      dSurfactant,
+      sldCore,
+      sldShell,
+      sldSurfactant,
+      sldSolvent,
+      sigParticleSize,
+      sigD
     )
-    eta = self.params['eta']
-    alpha = (1+2*eta)**2 / (1-eta)**4
-    beta = -6*eta*(1+eta/2.)**2 / (1-eta)**4
-    gamma = eta*alpha/2.
-
-    x = 2*self.q*self.params['hardSphereRadius'].value
-    sinx = np.sin(x)
-    cosx = np.cos(x)
-    G = alpha/x**2 * (sinx - x*cosx) +\
-        beta/x**3 * (2*x*sinx + (2-x**2)*cosx - 2) +\
-        gamma/x**5 * (-x**4*cosx + 4*((3*x**2-6)*cosx +\
-        (x**3 - 6*x)*sinx + 6))
-
-    structurefactor = 1/(1+ 24*eta*G/x)
 
-    self.I = self.params['i0'] * formfactor * structurefactor + self.params['bg']
+  @classmethod
+  def evaluate(cls, q, theta):
+    return theta['i0'] * cls.formfactor(q, theta) * hardSphereStructureFactor(q, theta) + theta['bg']
 
-    self.r, self.sld = sphere_css_coupled.sld(
-      self.params['particleSize'],
-      self.params['dShell'],
-      self.params['dSurfactant'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
+  @classmethod
+  def profile(cls, theta):
+    r, sld = sphere_css_coupled.sld(
+      theta['particleSize'],
+      theta['dShell'],
+      theta['dSurfactant'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSurfactant'],
+      theta['sldSolvent'],
     )
+    return {'r': r, 'sld': sld}
 
   def calcMagneticModel(self):
     pass
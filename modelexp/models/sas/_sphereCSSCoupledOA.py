@@ -1,7 +1,9 @@
 from modelexp.models.sas import SAXSModel
-from fortSAS import sphere_css_coupled, sphere
+from modelexp.kernels.sas import sphere_css_coupled, sphere
 
 class SphereCSSCoupledOA(SAXSModel):
+  linearParameters = ('i0', 'i0Oleic', 'bg')
+
   def initParameters(self):
     self.params.add('particleSize', 100)
     self.params.add('dShell', 30)
@@ -26,79 +28,79 @@ class SphereCSSCoupledOA(SAXSModel):
     self.addConstantParam('magSldSurfactant')
     self.addConstantParam('magSldSolvent')
 
-  def calcModel(self):
-    self.I = self.params['i0'] * sphere_css_coupled.formfactor(
-      self.q,
-      self.params['particleSize'],
-      self.params['dShell'],
-      self.params['dSurfactant'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
-      self.params['sigParticleSize'],
-      self.params['sigD']
-    ) + self.params['i0Oleic'] * sphere.formfactor(
-      self.q,
-      self.params['rOleic'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
+  @classmethod
+  def evaluate(cls, q, theta):
+    return theta['i0'] * sphere_css_coupled.formfactor(
+      q,
+      theta['particleSize'],
+      theta['dShell'],
+      theta['dSurfactant'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSurfactant'],
+      theta['sldSolvent'],
+      theta['sigParticleSize'],
+      theta['sigD']
+    ) + theta['i0Oleic'] * sphere.formfactor(
+      q,
+      theta['rOleic'],
+      theta['sldSurfactant'],
+      theta['sldSolvent'],
       0.
-    ) + self.params['bg']
-
-    self.r, self.sld = sphere_css_coupled.sld(
-      self.params['particleSize'],
-      self.params['dShell'],
-      self.params['dSurfactant'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
-    )
+    ) + theta['bg']
 
-  def calcMagneticModel(self):
-    self.I = self.params['i0'] * sphere_css_coupled.magnetic_formfactor(
-      self.q,
-      self.params['particleSize'],
-      self.params['dShell'],
-      self.params['dSurfactant'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
-      self.params['sigParticleSize'],
-      self.params['sigD'],
-      self.params['magSldCore'],
-      self.params['magSldShell'],
-      self.params['magSldSurfactant'],
-      self.params['magSldSolvent'],
-      self.params['xi'],
-      self.params['sin2alpha'],
-      self.params['polarization']
-    ) + self.params['i0Oleic'] * sphere.formfactor(
-      self.q,
-      self.params['rOleic'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
+  @classmethod
+  def evaluateMagnetic(cls, q, theta):
+    return theta['i0'] * sphere_css_coupled.magnetic_formfactor(
+      q,
+      theta['particleSize'],
+      theta['dShell'],
+      theta['dSurfactant'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSurfactant'],
+      theta['sldSolvent'],
+      theta['sigParticleSize'],
+      theta['sigD'],
+      theta['magSldCore'],
+      theta['magSldShell'],
+      theta['magSldSurfactant'],
+      theta['magSldSolvent'],
+      theta['xi'],
+      theta['sin2alpha'],
+      theta['polarization']
+    ) + theta['i0Oleic'] * sphere.formfactor(
+      q,
+      theta['rOleic'],
+      theta['sldSurfactant'],
+      theta['sldSolvent'],
       0.
-    ) + self.params['bg']
+    ) + theta['bg']
 
-    self.r, self.sld = sphere_css_coupled.sld(
-      self.params['particleSize'],
-      self.params['dShell'],
-      self.params['dSurfactant'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
+  @classmethod
+  def profile(cls, theta):
+    r, sld = sphere_css_coupled.sld(
+      theta['particleSize'],
+      theta['dShell'],
+      theta['dSurfactant'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSurfactant'],
+      theta['sldSolvent'],
     )
+    return {'r': r, 'sld': sld}
 
-    self.rMag, self.sldMag = sphere_css_coupled.sld(
-      self.params['particleSize'],
-      self.params['dShell'],
-      self.params['dSurfactant'],
-      self.params['magSldCore'],
-      self.params['magSldShell'],
-      self.params['magSldSurfactant'],
-      self.params['magSldSolvent'],
+  @classmethod
+  def magneticProfile(cls, theta):
+    profile = cls.profile(theta)
+    rMag, sldMag = sphere_css_coupled.sld(
+      theta['particleSize'],
+      theta['dShell'],
+      theta['dSurfactant'],
+      theta['magSldCore'],
+      theta['magSldShell'],
+      theta['magSldSurfactant'],
+      theta['magSldSolvent'],
     )
+    profile.update({'rMag': rMag, 'sldMag': sldMag})
+    return profile
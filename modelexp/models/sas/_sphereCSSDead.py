@@ -1,5 +1,5 @@
 from modelexp.models.sas import SAXSModel
-from fortSAS import sphere_css_dead
+from modelexp.kernels.sas import sphere_css_dead
 
 class SphereCSSDead(SAXSModel):
   def initParameters(self):
@@ -19,65 +19,64 @@ class SphereCSSDead(SAXSModel):
     self.params.add('magSldCore', 1e-6)
     self.params.add('magSldShell', 2e-6)
 
-  def calcModel(self):
-    self.I = self.params['i0'] * sphere_css_dead.formfactor(
-      self.q,
-      self.params['r'],
-      self.params['dShell'],
-      self.params['dDead'],
-      self.params['dSurfactant'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
-      self.params['sigR'],
-    ) + self.params['bg']
+  @classmethod
+  def evaluate(cls, q, theta):
+    return cls.scaleIntensity(theta, sphere_css_dead.formfactor(
+      q,
+      theta['r'],
+      theta['dShell'],
+      theta['dDead'],
+      theta['dSurfactant'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSurfactant'],
+      theta['sldSolvent'],
+      theta['sigR'],
+    ))
 
+  @classmethod
+  def evaluateMagnetic(cls, q, theta):
+    return cls.scaleIntensity(theta, sphere_css_dead.magnetic_formfactor(
+      q,
+      theta['r'],
+      theta['dShell'],
+      theta['dDead'],
+      theta['dSurfactant'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSurfactant'],
+      theta['sldSolvent'],
+      theta['sigR'],
+      theta['magSldCore'],
+      theta['magSldShell'],
+      theta['xi'],
+      theta['sin2alpha'],
+      theta['polarization']
+    ))
 
-    self.r, self.sld = sphere_css_dead.sld(
-      self.params['r'],
-      self.params['dShell'],
-      self.params['dSurfactant'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
+  @classmethod
+  def profile(cls, theta):
+    r, sld = sphere_css_dead.sld(
+      theta['r'],
+      theta['dShell'],
+      theta['dSurfactant'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSurfactant'],
+      theta['sldSolvent'],
     )
+    return {'r': r, 'sld': sld}
 
-  def calcMagneticModel(self):
-    self.I = self.params['i0'] * sphere_css_dead.magnetic_formfactor(
-      self.q,
-      self.params['r'],
-      self.params['dShell'],
-      self.params['dDead'],
-      self.params['dSurfactant'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
-      self.params['sigR'],
-      self.params['magSldCore'],
-      self.params['magSldShell'],
-      self.params['xi'],
-      self.params['sin2alpha'],
-      self.params['polarization']
-    ) + self.params['bg']
-
-    self.r, self.sld = sphere_css_dead.sld(
-      self.params['r'],
-      self.params['dShell'],
-      self.params['dSurfactant'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
-    )
-
-    self.rMag, self.sldMag = sphere_css_dead.magnetic_sld(
-      self.params['r'],
-      self.params['dShell'],
-      self.params['dDead'],
-      self.params['dSurfactant'],
-      self.params['magSldCore'],
-      self.params['magSldShell']
+  @classmethod
+  def magneticProfile(cls, theta):
+    profile = cls.profile(theta)
+    rMag, sldMag = sphere_css_dead.magnetic_sld(
+      theta['r'],
+      theta['dShell'],
+      theta['dDead'],
+      theta['dSurfactant'],
+      theta['magSldCore'],
+      theta['magSldShell']
     )
+    profile.update({'rMag': rMag, 'sldMag': sldMag})
+    return profile
@@ -1,5 +1,5 @@
 from modelexp.models.sas import SAXSModel
-from fortSAS import sphere_linhulls
+from modelexp.kernels.sas import sphere_linhulls
 
 class SphereLinHullS(SAXSModel):
   def initParameters(self):
@@ -25,67 +25,65 @@ class SphereLinHullS(SAXSModel):
     self.addConstantParam('magSldSolvent')
 
 
-  def calcModel(self):
-    self.I = self.params['i0'] * sphere_linhulls.formfactor(
-      self.q,
-      self.params['r'],
-      self.params['dHull'],
-      self.params['dSurfactant'],
-      self.params['sldCore'],
-      self.params['sldHull'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
-      self.params['sigR'],
-      self.params['sigDHull'],
-    ) + self.params['bg']
+  @classmethod
+  def evaluate(cls, q, theta):
+    return cls.scaleIntensity(theta, sphere_linhulls.formfactor(
+      q,
+      theta['r'],
+      theta['dHull'],
+      theta['dSurfactant'],
+      theta['sldCore'],
+      theta['sldHull'],
+      theta['sldSurfactant'],
+      theta['sldSolvent'],
+      theta['sigR'],
+      theta['sigDHull'],
+    ))
 
+  @classmethod
+  def evaluateMagnetic(cls, q, theta):
+    return cls.scaleIntensity(theta, sphere_linhulls.magnetic_formfactor(
+      q,
+      theta['r'],
+      theta['dHull'],
+      theta['dSurfactant'],
+      theta['sldCore'],
+      theta['sldHull'],
+      theta['sldSurfactant'],
+      theta['sldSolvent'],
+      theta['sigR'],
+      theta['sigDHull'],
+      theta['magSldCore'],
+      theta['magSldHull'],
+      theta['magSldSurfactant'],
+      theta['magSldSolvent'],
+      theta['xi'],
+      theta['sin2alpha'],
+      theta['polarization']
+    ))
 
-    self.r, self.sld = sphere_linhulls.sld(
-      self.params['r'],
-      self.params['dHull'],
-      self.params['dSurfactant'],
-      self.params['sldCore'],
-      self.params['sldHull'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
+  @classmethod
+  def profile(cls, theta):
+    r, sld = sphere_linhulls.sld(
+      theta['r'],
+      theta['dHull'],
+      theta['dSurfactant'],
+      theta['sldCore'],
+      theta['sldHull'],
+      theta['sldSurfactant'],
+      theta['sldSolvent'],
     )
+    return {'r': r, 'sld': sld}
 
-
-  def calcMagneticModel(self):
-    self.I = self.params['i0'] * sphere_linhulls.magnetic_formfactor(
-      self.q,
-      self.params['r'],
-      self.params['dHull'],
-      self.params['dSurfactant'],
-      self.params['sldCore'],
-      self.params['sldHull'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
-      self.params['sigR'],
-      self.params['sigDHull'],
-      self.params['magSldCore'],
-      self.params['magSldHull'],
-      self.params['magSldSurfactant'],
-      self.params['magSldSolvent'],
-      self.params['xi'],
-      self.params['sin2alpha'],
-      self.params['polarization']
-    ) + self.params['bg']
-
-    self.r, self.sld = sphere_linhulls.sld(
-      self.params['r'],
-      self.params['dHull'],
-      self.params['dSurfactant'],
-      self.params['sldCore'],
-      self.params['sldHull'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
-    )
-
-    self.rMag, self.sldMag = sphere_linhulls.magnetic_sld(
-      self.params['r'],
-      self.params['dHull'],
-      self.params['dSurfactant'],
-      self.params['magSldCore'],
-      self.params['magSldHull']
+  @classmethod
+  def magneticProfile(cls, theta):
+    profile = cls.profile(theta)
+    rMag, sldMag = sphere_linhulls.magnetic_sld(
+      theta['r'],
+      theta['dHull'],
+      theta['dSurfactant'],
+      theta['magSldCore'],
+      theta['magSldHull']
     )
+    profile.update({'rMag': rMag, 'sldMag': sldMag})
+    return profile
@@ -0,0 +1,21 @@
+import numpy as np
+from .._components import component
+
+@component('eta', 'hardSphereRadius')
+def hardSphereStructureFactor(q, eta, hardSphereRadius):
+  '''
+  Percus-Yevick structure factor of hard spheres with volume fraction eta
+  '''
+  alpha = (1+2*eta)**2 / (1-eta)**4
+  beta = -6*eta*(1+eta/2.)**2 / (1-eta)**4
+  gamma = eta*alpha/2.
+
+  x = 2*q*hardSphereRadius
+  sinx = np.sin(x)
+  cosx = np.cos(x)
+  G = alpha/x**2 * (sinx - x*cosx) +\
+      beta/x**3 * (2*x*sinx + (2-x**2)*cosx - 2) +\
+      gamma/x**5 * (-x**4*cosx + 4*((3*x**2-6)*cosx +\
+      (x**3 - 6*x)*sinx + 6))
+
+  return 1/(1+ 24*eta*G/x)
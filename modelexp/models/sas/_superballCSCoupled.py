@@ -1,8 +1,7 @@
 from modelexp.models.sas import SAXSModel
-from fortSAS import superball_cs_coupled
+from modelexp.kernels.sas import superball_cs_coupled
 
-from numpy.polynomial.hermite import hermgauss
-from numpy.polynomial.legendre import leggauss
+from modelexp.kernels import gauss
 
 class SuperballCSCoupled(SAXSModel):
   def initParameters(self):
@@ -28,64 +27,58 @@ class SuperballCSCoupled(SAXSModel):
     self.addConstantParam('magSldShell')
     self.addConstantParam('magSldSolvent')
 
-  def calcModel(self):
-    self.x_herm, self.w_herm = hermgauss(int(self.params['orderHermite']))
-    self.x_leg, self.w_leg = leggauss(int(self.params['orderLegendre']))
+  @classmethod
+  def evaluate(cls, q, theta):
+    return cls.scaleIntensity(theta, gauss(superball_cs_coupled.formfactor, theta['orderHermite'], theta['orderLegendre'])(
+      q,
+      theta['particleSize'],
+      theta['d'],
+      theta['pVal'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSolvent'],
+      theta['sigParticleSize']
+    ))
 
-    self.I = self.params['i0'] * superball_cs_coupled.formfactor(
-      self.q,
-      self.params['particleSize'],
-      self.params['d'],
-      self.params['pVal'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSolvent'],
-      self.params['sigParticleSize'],
-      self.x_herm, self.w_herm, self.x_leg, self.w_leg
-    ) + self.params['bg']
+  @classmethod
+  def evaluateMagnetic(cls, q, theta):
+    return cls.scaleIntensity(theta, gauss(superball_cs_coupled.magnetic_formfactor, theta['orderHermite'], theta['orderLegendre'])(
+      q,
+      theta['particleSize'],
+      theta['d'],
+      theta['pVal'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSolvent'],
+      theta['sigParticleSize'],
+      theta['magSldCore'],
+      theta['magSldShell'],
+      theta['magSldSolvent'],
+      theta['xi'],
+      theta['sin2alpha'],
+      theta['polarization']
+    ))
 
-    self.r, self.sld = superball_cs_coupled.sld(
-      self.params['particleSize'],
-      self.params['d'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSolvent']
+  @classmethod
+  def profile(cls, theta):
+    r, sld = superball_cs_coupled.sld(
+      theta['particleSize'],
+      theta['d'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSolvent']
     )
+    return {'r': r, 'sld': sld}
 
-  def calcMagneticModel(self):
-    self.x_herm, self.w_herm = hermgauss(int(self.params['orderHermite']))
-    self.x_leg, self.w_leg = leggauss(int(self.params['orderLegendre']))
-
-    self.I = self.params['i0'] * superball_cs_coupled.magnetic_formfactor(
-      self.q,
-      self.params['particleSize'],
-      self.params['d'],
-      self.params['pVal'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSolvent'],
-      self.params['sigParticleSize'],
-      self.params['magSldCore'],
-      self.params['magSldShell'],
-      self.params['magSldSolvent'],
-      self.params['xi'],
-      self.params['sin2alpha'],
-      self.params['polarization'],
-      self.x_herm, self.w_herm, self.x_leg, self.w_leg
-    ) + self.params['bg']
-
-    self.r, self.sld = superball_cs_coupled.sld(
-      self.params['particleSize'],
-      self.params['d'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSolvent']
-    )
-
-    self.rMag, self.sldMag = superball_cs_coupled.sld(
-      self.params['particleSize'],
-      self.params['d'],
-      self.params['magSldCore'],
-      self.params['magSldShell'],
-      self.params['magSldSolvent'],
+  @classmethod
+  def magneticProfile(cls, theta):
+    profile = cls.profile(theta)
+    rMag, sldMag = superball_cs_coupled.sld(
+      theta['particleSize'],
+      theta['d'],
+      theta['magSldCore'],
+      theta['magSldShell'],
+      theta['magSldSolvent'],
     )
+    profile.update({'rMag': rMag, 'sldMag': sldMag})
+    return profile
@@ -1,11 +1,13 @@
 from modelexp.models.sas import SAXSModel
-from fortSAS import superball_new_cs, sphere
+from modelexp.kernels.sas import superball_new_cs, sphere
 
 import numpy as np
-from numpy.polynomial.hermite import hermgauss
-from numpy.polynomial.legendre import leggauss
+from modelexp.kernels import gauss
+from .._components import component
 
 class SuperballCSOAOptimized(SAXSModel):
+  linearParameters = ('i0', 'i0Oleic', 'bg')
+
   def initParameters(self):
     self.params.add('r', 100)
     self.params.add('d', 20)
@@ -32,102 +34,103 @@ class SuperballCSOAOptimized(SAXSModel):
     self.addConstantParam('magSldShell')
     self.addConstantParam('magSldSolvent')
 
-  def calcModel(self):
-    self.x_herm, self.w_herm = hermgauss(int(self.params['orderHermite']))
-    self.x_leg, self.w_leg = leggauss(int(self.params['orderLegendre']))
+  @component('r', 'd', 'pVal', 'pShell', 'sldCore', 'sldShell', 'sldSolvent', 'sigR', 'orderHermite', 'orderLegendre')
+  def superballFormfactor(q, r, d, pVal, pShell, sldCore, sldShell, sldSolvent, sigR, orderHermite, orderLegendre):
+    return gauss(superball_new_cs.formfactor, orderHermite, orderLegendre)(
+      q,
+      r,
+      d,
+      pVal,
+      pShell,
+      sldCore,
+      sldShell,
+      sldSolvent,
+      sigR
+    )
 
-    self.I = self.params['i0'] * superball_new_cs.formfactor(
-      self.q,
-      self.params['r'],
-      self.params['d'],
-      self.params['pVal'],
-      self.params['pShell'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSolvent'],
-      self.params['sigR'],
-      self.x_herm, self.w_herm, self.x_leg, self.w_leg
-    ) + self.params['i0Oleic'] * sphere.formfactor(
-      self.q,
-      self.params['rOleic'],
-      self.params['sldShell'],
-      self.params['sldSolvent'],
-      0
-    ) + self.params['bg']
+  @component('rOleic', 'sldShell', 'sldSolvent')
+  def oleicFormfactor(q, rOleic, sldShell, sldSolvent):
+    return sphere.formfactor(q, rOleic, sldShell, sldSolvent, 0)
 
-    r1, sld1 = superball_new_cs.sld(
-      self.params['r'],
-      self.params['d'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSolvent']
-    )
-    r2, sld2 = sphere.sld(
-      self.params['rOleic'],
-      self.params['sldShell'],
-      self.params['sldSolvent']
+  @classmethod
+  def evaluate(cls, q, theta):
+    return (
+      theta['i0'] * cls.superballFormfactor(q, theta)
+      + theta['i0Oleic'] * cls.oleicFormfactor(q, theta)
+      + theta['bg']
     )
-    self.r = np.concatenate([r1, r1[::-1], r2])
-    self.sld = np.concatenate([sld1, sld1[::-1], sld2])
 
+  @component(
+    'r', 'd', 'pVal', 'pShell', 'sldCore', 'sldShell', 'sldSolvent', 'sigR',
+    'magSldCore', 'magSldShell', 'magSldSolvent', 'xi', 'sin2alpha', 'polarization',
+    'orderHermite', 'orderLegendre'
+  )
+  def superballMagneticFormfactor(
+    q, r, d, pVal, pShell, sldCore, sldShell, sldSolvent, sigR,
+    magSldCore, magSldShell, magSldSolvent, xi, sin2alpha, polarization,
+    orderHermite, orderLegendre
+  ):
+    return gauss(superball_new_cs.magnetic_formfactor, orderHermite, orderLegendre)(
+      q,
+      r,
+      d,
+      pVal,
+      pShell,
+      sldCore,
+      sldShell,
+      sldSolvent,
+      sigR,
+      magSldCore,
+      magSldShell,
+      magSldSolvent,
+      xi,
+      sin2alpha,
+      polarization
+    )
 
-  def calcMagneticModel(self):
-    self.x_herm, self.w_herm = hermgauss(int(self.params['orderHermite']))
-    self.x_leg, self.w_leg = leggauss(int(self.params['orderLegendre']))
-
-    self.I = self.params['i0'] * superball_new_cs.magnetic_formfactor(
-      self.q,
-      self.params['r'],
-      self.params['d'],
-      self.params['pVal'],
-      self.params['pShell'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSolvent'],
-      self.params['sigR'],
-      self.params['magSldCore'],
-      self.params['magSldShell'],
-      self.params['magSldSolvent'],
-      self.params['xi'],
-      self.params['sin2alpha'],
-      self.params['polarization'],
-      self.x_herm, self.w_herm, self.x_leg, self.w_leg
-    ) + self.params['i0Oleic'] * sphere.formfactor(
-      self.q,
-      self.params['rOleic'],
-      self.params['sldShell'],
-      self.params['sldSolvent'],
-      0
-    ) + self.params['bg']
+  @classmethod
+  def evaluateMagnetic(cls, q, theta):
+    return (
+      theta['i0'] * cls.superballMagneticFormfactor(q, theta)
+      + theta['i0Oleic'] * cls.oleicFormfactor(q, theta)
+      + theta['bg']
+    )
 
+  @classmethod
+  def profile(cls, theta):
     r1, sld1 = superball_new_cs.sld(
-      self.params['r'],
-      self.params['d'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSolvent']
+      theta['r'],
+      theta['d'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSolvent']
     )
-
     r2, sld2 = sphere.sld(
-      self.params['rOleic'],
-      self.params['sldShell'],
-      self.params['sldSolvent']
+      theta['rOleic'],
+      theta['sldShell'],
+      theta['sldSolvent']
     )
-    self.r = np.concatenate([r1, r1[::-1], r2])
-    self.sld = np.concatenate([sld1, sld1[::-1], sld2])
+    r = np.concatenate([r1, r1[::-1], r2])
+    sld = np.concatenate([sld1, sld1[::-1], sld2])
+    return {'r': r, 'sld': sld}
 
+  @classmethod
+  def magneticProfile(cls, theta):
+    profile = cls.profile(theta)
     rMag1, sldMag1 = superball_new_cs.sld(
-      self.params['r'],
-      self.params['d'],
-      self.params['magSldCore'],
-      self.params['magSldShell'],
-      self.params['magSldSolvent'],
+      theta['r'],
+      theta['d'],
+      theta['magSldCore'],
+      theta['magSldShell'],
+      theta['magSldSolvent'],
     )
 
     rMag2, sldMag2 = sphere.sld(
-      self.params['rOleic'],
+      theta['rOleic'],
       0,
       0
     )
-    self.rMag = np.concatenate([rMag1, rMag1[::-1], rMag2])
-    self.sldMag = np.concatenate([sldMag1, sldMag1[::-1], sldMag2])
\ No newline at end of file
+    rMag = np.concatenate([rMag1, rMag1[::-1], rMag2])
+    sldMag = np.concatenate([sldMag1, sldMag1[::-1], sldMag2])
+    profile.update({'rMag': rMag, 'sldMag': sldMag})
+    return profile
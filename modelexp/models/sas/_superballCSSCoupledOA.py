@@ -1,11 +1,12 @@
 from modelexp.models.sas import SAXSModel
-from fortSAS import superball_css_coupled, sphere
+from modelexp.kernels.sas import superball_css_coupled, sphere
 
 import numpy as np
-from numpy.polynomial.hermite import hermgauss
-from numpy.polynomial.legendre import leggauss
+from modelexp.kernels import gauss
 
 class SuperballCSSCoupledOA(SAXSModel):
+  linearParameters = ('i0', 'i0Oleic', 'bg')
+
   def initParameters(self):
     self.params.add('particleSize', 100)
     self.params.add('dShell', 20)
@@ -34,111 +35,95 @@ class SuperballCSSCoupledOA(SAXSModel):
     self.addConstantParam('magSldSurfactant')
     self.addConstantParam('magSldSolvent')
 
-  def calcModel(self):
-    self.x_herm, self.w_herm = hermgauss(int(self.params['orderHermite']))
-    self.x_leg, self.w_leg = leggauss(int(self.params['orderLegendre']))
-    self.I = self.params['i0'] * superball_css_coupled.formfactor(
-      self.q,
-      self.params['particleSize'],
-      self.params['dShell'],
-      self.params['dSurfactant'],
-      self.params['pVal'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
-      self.params['sigParticleSize'],
-      self.x_herm, self.w_herm, self.x_leg, self.w_leg
-    ) + self.params['i0Oleic'] * sphere.formfactor(
-      self.q,
-      self.params['rOleic'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
+  @classmethod
+  def evaluate(cls, q, theta):
+    return theta['i0'] * gauss(superball_css_coupled.formfactor, theta['orderHermite'], theta['orderLegendre'])(
+      q,
+      theta['particleSize'],
+      theta['dShell'],
+      theta['dSurfactant'],
+      theta['pVal'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSurfactant'],
+      theta['sldSolvent'],
+      theta['sigParticleSize']
+    ) + theta['i0Oleic'] * sphere.formfactor(
+      q,
+      theta['rOleic'],
+      theta['sldSurfactant'],
+      theta['sldSolvent'],
       0
-    ) + self.params['bg']
+    ) + theta['bg']
 
-    r1, sld1 = superball_css_coupled.sld(
-      self.params['particleSize'],
-      self.params['dShell'],
-      self.params['dSurfactant'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent']
-    )
-
-    r2, sld2 = sphere.sld(
-      self.params['rOleic'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent']
-    )
-    self.r = np.concatenate([r1, r1[::-1], r2])
-    self.sld = np.concatenate([sld1, sld1[::-1], sld2])
-
-
-  def calcMagneticModel(self):
-    self.x_herm, self.w_herm = hermgauss(int(self.params['orderHermite']))
-    self.x_leg, self.w_leg = leggauss(int(self.params['orderLegendre']))
-    self.I = self.params['i0'] * superball_css_coupled.magnetic_formfactor(
-      self.q,
-      self.params['particleSize'],
-      self.params['dShell'],
-      self.params['dSurfactant'],
-      self.params['pVal'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
-      self.params['sigParticleSize'],
-      self.params['magSldCore'],
-      self.params['magSldShell'],
-      self.params['magSldSurfactant'],
-      self.params['magSldSolvent'],
-      self.params['xi'],
-      self.params['sin2alpha'],
-      self.params['polarization'],
-      self.x_herm, self.w_herm, self.x_leg, self.w_leg
-    ) + self.params['i0Oleic'] * sphere.formfactor(
-      self.q,
-      self.params['rOleic'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
+  @classmethod
+  def evaluateMagnetic(cls, q, theta):
+    return theta['i0'] * gauss(superball_css_coupled.magnetic_formfactor, theta['orderHermite'], theta['orderLegendre'])(
+      q,
+      theta['particleSize'],
+      theta['dShell'],
+      theta['dSurfactant'],
+      theta['pVal'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSurfactant'],
+      theta['sldSolvent'],
+      theta['sigParticleSize'],
+      theta['magSldCore'],
+      theta['magSldShell'],
+      theta['magSldSurfactant'],
+      theta['magSldSolvent'],
+      theta['xi'],
+      theta['sin2alpha'],
+      theta['polarization']
+    ) + theta['i0Oleic'] * sphere.formfactor(
+      q,
+      theta['rOleic'],
+      theta['sldSurfactant'],
+      theta['sldSolvent'],
       0
-    ) + self.params['bg']
+    ) + theta['bg']
 
+  @classmethod
+  def profile(cls, theta):
     r1, sld1 = superball_css_coupled.sld(
-      self.params['particleSize'],
-      self.params['dShell'],
-      self.params['dSurfactant'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent']
+      theta['particleSize'],
+      theta['dShell'],
+      theta['dSurfactant'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSurfactant'],
+      theta['sldSolvent']
     )
 
     r2, sld2 = sphere.sld(
-      self.params['rOleic'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent']
+      theta['rOleic'],
+      theta['sldSurfactant'],
+      theta['sldSolvent']
     )
-    self.r = np.concatenate([r1, r1[::-1], r2])
-    self.sld = np.concatenate([sld1, sld1[::-1], sld2])
-
+    r = np.concatenate([r1, r1[::-1], r2])
+    sld = np.concatenate([sld1, sld1[::-1], sld2])
+    return {'r': r, 'sld': sld}
 
+  @classmethod
+  def magneticProfile(cls, theta):
+    profile = cls.profile(theta)
     rMag1, sldMag1 = superball_css_coupled.sld(
-      self.params['particleSize'],
-      self.params['dShell'],
-      self.params['dSurfactant'],
-      self.params['magSldCore'],
-      self.params['magSldShell'],
-      self.params['magSldSurfactant'],
-      self.params['magSldSolvent'],
+      theta['particleSize'],
+      theta['dShell'],
+      theta['dSurfactant'],
+      theta['magSldCore'],
+      theta['magSldShell'],
+      theta['magSldSurfactant'],
+      theta['magSldSolvent'],
     )
 
     rMag2, sldMag2 = sphere.sld(
-      self.params['rOleic'],
+      theta['rOleic'],
       0,
       0
     )
-    self.rMag = np.concatenate([rMag1, rMag1[::-1], rMag2])
-    self.sldMag = np.concatenate([sldMag1, sldMag1[::-1], sldMag2])
+    rMag = np.concatenate([rMag1, rMag1[::-1], rMag2])
+    sldMag = np.concatenate([sldMag1, sldMag1[::-1], sldMag2])
+    profile.update({'rMag': rMag, 'sldMag': sldMag})
+    return profile
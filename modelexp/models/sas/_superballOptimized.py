@@ -1,8 +1,7 @@
 from modelexp.models.sas import SAXSModel
-from fortSAS import superball_new
+from modelexp.kernels.sas import superball_new
 
-from numpy.polynomial.hermite import hermgauss
-from numpy.polynomial.legendre import leggauss
+from modelexp.kernels import gauss
 
 class SuperballOptimized(SAXSModel):
   def initParameters(self):
@@ -24,53 +23,49 @@ class SuperballOptimized(SAXSModel):
 
     self.addConstantParam('magSldSolvent')
 
-  def calcModel(self):
-    self.x_herm, self.w_herm = hermgauss(int(self.params['orderHermite']))
-    self.x_leg, self.w_leg = leggauss(int(self.params['orderLegendre']))
+  @classmethod
+  def evaluate(cls, q, theta):
+    return cls.scaleIntensity(theta, gauss(superball_new.formfactor, theta['orderHermite'], theta['orderLegendre'])(
+      q,
+      theta['r'],
+      theta['pVal'],
+      theta['sldCore'],
+      theta['sldSolvent'],
+      theta['sigR']
+    ))
 
-    self.I = self.params['i0'] * superball_new.formfactor(
-      self.q,
-      self.params['r'],
-      self.params['pVal'],
-      self.params['sldCore'],
-      self.params['sldSolvent'],
-      self.params['sigR'],
-      self.x_herm, self.w_herm, self.x_leg, self.w_leg
-    ) + self.params['bg']
+  @classmethod
+  def evaluateMagnetic(cls, q, theta):
+    return cls.scaleIntensity(theta, gauss(superball_new.magnetic_formfactor, theta['orderHermite'], theta['orderLegendre'])(
+      q,
+      theta['r'],
+      theta['pVal'],
+      theta['sldCore'],
+      theta['sldSolvent'],
+      theta['sigR'],
+      theta['magSldCore'],
+      theta['magSldSolvent'],
+      theta['xi'],
+      theta['sin2alpha'],
+      theta['polarization']
+    ))
 
-    self.r, self.sld = superball_new.sld(
-      self.params['r'],
-      self.params['sldCore'],
-      self.params['sldSolvent']
+  @classmethod
+  def profile(cls, theta):
+    r, sld = superball_new.sld(
+      theta['r'],
+      theta['sldCore'],
+      theta['sldSolvent']
     )
+    return {'r': r, 'sld': sld}
 
-  def calcMagneticModel(self):
-    self.x_herm, self.w_herm = hermgauss(int(self.params['orderHermite']))
-    self.x_leg, self.w_leg = leggauss(int(self.params['orderLegendre']))
-
-    self.I = self.params['i0'] * superball_new.magnetic_formfactor(
-      self.q,
-      self.params['r'],
-      self.params['pVal'],
-      self.params['sldCore'],
-      self.params['sldSolvent'],
-      self.params['sigR'],
-      self.params['magSldCore'],
-      self.params['magSldSolvent'],
-      self.params['xi'],
-      self.params['sin2alpha'],
-      self.params['polarization'],
-      self.x_herm, self.w_herm, self.x_leg, self.w_leg
-    ) + self.params['bg']
-
-    self.r, self.sld = superball_new.sld(
-      self.params['r'],
-      self.params['sldCore'],
-      self.params['sldSolvent']
-    )
-
-    self.rMag, self.sldMag = superball_new.sld(
-      self.params['r'],
-      self.params['magSldCore'],
-      self.params['magSldSolvent'],
+  @classmethod
+  def magneticProfile(cls, theta):
+    profile = cls.profile(theta)
+    rMag, sldMag = superball_new.sld(
+      theta['r'],
+      theta['magSldCore'],
+      theta['magSldSolvent'],
     )
+    profile.update({'rMag': rMag, 'sldMag': sldMag})
+    return profile
@@ -1,5 +1,5 @@
 from modelexp.models.sas import SAXSModel
-from fortSAS import sphere_cs
+from modelexp.kernels.sas import sphere_cs
 import numpy as np
 
 class TwoSphereCS(SAXSModel):
@@ -36,115 +36,123 @@ class TwoSphereCS(SAXSModel):
 
 
 
-  def calcModel(self):
-    self.I = self.params['i01'] * sphere_cs.formfactor(
-      self.q,
-      self.params['r1'],
-      self.params['d1'],
-      self.params['sldCore1'],
-      self.params['sldShell1'],
-      self.params['sldSolvent'],
-      self.params['sigR1'],
-      self.params['sigD1']
-    ) + self.params['i02'] * sphere_cs.formfactor(
-      self.q,
-      self.params['r2'],
-      self.params['d2'],
-      self.params['sldCore2'],
-      self.params['sldShell2'],
-      self.params['sldSolvent'],
-      self.params['sigR2'],
-      self.params['sigD2']
-    ) + self.params['bg']
-
+  @classmethod
+  def evaluate(cls, q, theta):
+    return theta['i01'] * sphere_cs.formfactor(
+      q,
+      theta['r1'],
+      theta['d1'],
+      theta['sldCore1'],
+      theta['sldShell1'],
+      theta['sldSolvent'],
+      theta['sigR1'],
+      theta['sigD1']
+    ) + theta['i02'] * sphere_cs.formfactor(
+      q,
+      theta['r2'],
+      theta['d2'],
+      theta['sldCore2'],
+      theta['sldShell2'],
+      theta['sldSolvent'],
+      theta['sigR2'],
+      theta['sigD2']
+    ) + theta['bg']
+
+  @classmethod
+  def evaluateMagnetic(cls, q, theta):
+    return theta['i01'] * sphere_cs.magnetic_formfactor(
+      q,
+      theta['r1'],
+      theta['d1'],
+      theta['sldCore1'],
+      theta['sldShell1'],
+      theta['sldSolvent'],
+      theta['sigR1'],
+      theta['sigD1'],
+      theta['dDead1'],
+      theta['magSldCore1'],
+      theta['magSldShell1'],
+      theta['magSldSolvent'],
+      theta['xi'],
+      theta['sin2alpha'],
+      theta['polarization'],
+    ) + theta['i02'] * sphere_cs.magnetic_formfactor(
+      q,
+      theta['r2'],
+      theta['d2'],
+      theta['sldCore2'],
+      theta['sldShell2'],
+      theta['sldSolvent'],
+      theta['sigR2'],
+      theta['sigD2'],
+      theta['dDead2'],
+      theta['magSldCore2'],
+      theta['magSldShell2'],
+      theta['magSldSolvent'],
+      theta['xi'],
+      theta['sin2alpha'],
+      theta['polarization'],
+    ) + theta['bg']
+
+  @classmethod
+  def profile(cls, theta):
     r1, sld1 = sphere_cs.sld(
-      self.params['r1'],
-      self.params['d1'],
-      self.params['sldCore1'],
-      self.params['sldShell1'],
-      self.params['sldSolvent']
+      theta['r1'],
+      theta['d1'],
+      theta['sldCore1'],
+      theta['sldShell1'],
+      theta['sldSolvent']
     )
 
     r2, sld2 = sphere_cs.sld(
-      self.params['r2'],
-      self.params['d2'],
-      self.params['sldCore2'],
-      self.params['sldShell2'],
-      self.params['sldSolvent']
+      theta['r2'],
+      theta['d2'],
+      theta['sldCore2'],
+      theta['sldShell2'],
+      theta['sldSolvent']
     )
 
-    self.r = np.concatenate([r1, r1[::-1], r2])
-    self.sld = np.concatenate([sld1, sld1[::-1], sld2])
-
-  def calcMagneticModel(self):
-    self.I = self.params['i01'] * sphere_cs.magnetic_formfactor(
-      self.q,
-      self.params['r1'],
-      self.params['d1'],
-      self.params['sldCore1'],
-      self.params['sldShell1'],
-      self.params['sldSolvent'],
-      self.params['sigR1'],
-      self.params['sigD1'],
-      self.params['dDead1'],
-      self.params['magSldCore1'],
-      self.params['magSldShell1'],
-      self.params['magSldSolvent'],
-      self.params['xi'],
-      self.params['sin2alpha'],
-      self.params['polarization'],
-    ) + self.params['i02'] * sphere_cs.magnetic_formfactor(
-      self.q,
-      self.params['r2'],
-      self.params['d2'],
-      self.params['sldCore2'],
-      self.params['sldShell2'],
-      self.params['sldSolvent'],
-      self.params['sigR2'],
-      self.params['sigD2'],
-      self.params['dDead2'],
-      self.params['magSldCore2'],
-      self.params['magSldShell2'],
-      self.params['magSldSolvent'],
-      self.params['xi'],
-      self.params['sin2alpha'],
-      self.params['polarization'],
-    ) + self.params['bg']
+    r = np.concatenate([r1, r1[::-1], r2])
+    sld = np.concatenate([sld1, sld1[::-1], sld2])
+    return {'r': r, 'sld': sld}
 
+  @classmethod
+  def magneticProfile(cls, theta):
     r1, sld1 = sphere_cs.sld(
-      self.params['r1'],
-      self.params['d1'],
-      self.params['sldCore1'],
-      self.params['sldShell1'],
-      self.params['sldSolvent']
+      theta['r1'],
+      theta['d1'],
+      theta['sldCore1'],
+      theta['sldShell1'],
+      theta['sldSolvent']
     )
 
     r2, sld2 = sphere_cs.sld(
-      self.params['r2'],
-      self.params['d2'],
-      self.params['sldCore2'],
-      self.params['sldShell2'],
-      self.params['sldSolvent']
+      theta['r2'],
+      theta['d2'],
+      theta['sldCore2'],
+      theta['sldShell2'],
+      theta['sldSolvent']
     )
 
-    self.r = np.concatenate([r1, r1[::-1], r2])
-    self.sld = np.concatenate([sld1, sld1[::-1], sld2])
+    r = np.concatenate([r1, r1[::-1], r2])
+    sld = np.concatenate([sld1, sld1[::-1], sld2])
 
     rMag1, sldMag1 = sphere_cs.sld(
-      self.params['r1']-self.params['dDead1'],
-      self.params['d1'],
-      self.params['magSldCore1'],
-      self.params['magSldShell1'],
-      self.params['magSldSolvent']
+      theta['r1']-theta['dDead1'],
+      theta['d1'],
+      theta['magSldCore1'],
+      theta['magSldShell1'],
+      theta['magSldSolvent']
     )
 
     rMag2, sldMag2 = sphere_cs.sld(
-      self.params['r2']-self.params['dDead2'],
-      self.params['d2'],
-      self.params['magSldCore2'],
-      self.params['magSldShell2'],
-      self.params['magSldSolvent']
+      theta['r2']-theta['dDead2'],
+      theta['d2'],
+      theta['magSldCore2'],
+      theta['magSldShell2'],
+      theta['magSldSolvent']
     )
 
-    self.rMag = np.concatenate([rMag1, rMag1[::-1], rMag2])
-    self.sldMag = np.concatenate([sldMag1, sldMag1[::-1], sldMag2])
+    rMag = np.concatenate([rMag1, rMag1[::-1], rMag2])
+    sldMag = np.concatenate([sldMag1, sldMag1[::-1], sldMag2])
+    return {'r': r, 'sld': sld, 'rMag': rMag, 'sldMag': sldMag}
@@ -1,2 +1,14 @@
-from ._sphereCSCoupled import SphereCSCoupled
-from ._sphereCSSCoupled import SphereCSSCoupled
+from ..._registry import LazyRegistry as _LazyRegistry, lazyModule as _lazyModule
+
+_registry = _LazyRegistry(__name__, {
+  'SphereCSCoupled': '._sphereCSCoupled',
+  'SphereCSSCoupled': '._sphereCSSCoupled',
+})
+
+__getattr__, __dir__ = _lazyModule(globals(), _registry)
+__all__ = _registry.names()
+
+def list_models():
+  """Names of the models available in this package, without importing them
+  """
+  return _registry.listModels()
@@ -1,7 +1,9 @@
 from modelexp.models.sas import SAXSModel
-from fortSAS import sphere_cs_coupled
+from modelexp.kernels.sas import sphere_cs_coupled
 
 class SphereCSCoupled(SAXSModel):
+  stackable = False # calcModel does not use evaluate
+
   def initParameters(self):
     self.params.add('particleSize', 100)
     self.params.add('d', 20)
@@ -26,34 +28,43 @@ class SphereCSCoupled(SAXSModel):
   def calcModel(self):
     print('Only magnetic model!')
 
-  def calcMagneticModel(self):
-    self.I = self.params['i0'] * sphere_cs_coupled.p_crossterm(
-      self.q,
-      self.params['particleSize'],
-      self.params['d'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSolvent'],
-      self.params['sigParticleSize'],
-      self.params['dDead'],
-      self.params['magSldCore'],
-      self.params['magSldShell'],
-      self.params['xi'],
-      self.params['sin2alpha']
+  @classmethod
+  def evaluateMagnetic(cls, q, theta):
+    return theta['i0'] * sphere_cs_coupled.p_crossterm(
+      q,
+      theta['particleSize'],
+      theta['d'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSolvent'],
+      theta['sigParticleSize'],
+      theta['dDead'],
+      theta['magSldCore'],
+      theta['magSldShell'],
+      theta['xi'],
+      theta['sin2alpha']
     )
 
-    self.r, self.sld = sphere_cs_coupled.sld(
-      self.params['particleSize'],
-      self.params['d'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSolvent']
+  @classmethod
+  def profile(cls, theta):
+    r, sld = sphere_cs_coupled.sld(
+      theta['particleSize'],
+      theta['d'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSolvent']
     )
+    return {'r': r, 'sld': sld}
 
-    self.rMag, self.sldMag = sphere_cs_coupled.sld(
-      self.params['particleSize']-self.params['dDead'],
-      self.params['d'],
-      self.params['magSldCore'],
-      self.params['magSldShell'],
-      self.params['magSldSolvent']
+  @classmethod
+  def magneticProfile(cls, theta):
+    profile = cls.profile(theta)
+    rMag, sldMag = sphere_cs_coupled.sld(
+      theta['particleSize']-theta['dDead'],
+      theta['d'],
+      theta['magSldCore'],
+      theta['magSldShell'],
+      theta['magSldSolvent']
     )
+    profile.update({'rMag': rMag, 'sldMag': sldMag})
+    return profile
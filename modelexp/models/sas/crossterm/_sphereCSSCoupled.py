@@ -1,7 +1,9 @@
 from modelexp.models.sas import SAXSModel
-from fortSAS import sphere_css_coupled
+from modelexp.kernels.sas import sphere_css_coupled
 
 class SphereCSSCoupled(SAXSModel):
+  stackable = False # calcModel does not use evaluate
+
   def initParameters(self):
     self.params.add('particleSize', 100)
     self.params.add('dShell', 30)
@@ -27,40 +29,49 @@ class SphereCSSCoupled(SAXSModel):
   def calcModel(self):
     print('Only magnetic model!')
 
-  def calcMagneticModel(self):
-    self.I = self.params['i0'] * sphere_css_coupled.p_crossterm(
-      self.q,
-      self.params['particleSize'],
-      self.params['dShell'],
-      self.params['dSurfactant'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
-      self.params['sigParticleSize'],
-      self.params['magSldCore'],
-      self.params['magSldShell'],
-      self.params['magSldSurfactant'],
-      self.params['xi'],
-      self.params['sin2alpha']
+  @classmethod
+  def evaluateMagnetic(cls, q, theta):
+    return theta['i0'] * sphere_css_coupled.p_crossterm(
+      q,
+      theta['particleSize'],
+      theta['dShell'],
+      theta['dSurfactant'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSurfactant'],
+      theta['sldSolvent'],
+      theta['sigParticleSize'],
+      theta['magSldCore'],
+      theta['magSldShell'],
+      theta['magSldSurfactant'],
+      theta['xi'],
+      theta['sin2alpha']
     )
 
-    self.r, self.sld = sphere_css_coupled.sld(
-      self.params['particleSize'],
-      self.params['dShell'],
-      self.params['dSurfactant'],
-      self.params['sldCore'],
-      self.params['sldShell'],
-      self.params['sldSurfactant'],
-      self.params['sldSolvent'],
+  @classmethod
+  def profile(cls, theta):
+    r, sld = sphere_css_coupled.sld(
+      theta['particleSize'],
+      theta['dShell'],
+      theta['dSurfactant'],
+      theta['sldCore'],
+      theta['sldShell'],
+      theta['sldSurfactant'],
+      theta['sldSolvent'],
     )
+    return {'r': r, 'sld': sld}
 
-    self.rMag, self.sldMag = sphere_css_coupled.sld(
-      self.params['particleSize'],
-      self.params['dShell'],
-      self.params['dSurfactant'],
-      self.params['magSldCore'],
-      self.params['magSldShell'],
-      self.params['magSldSurfactant'],
-      self.params['magSldSolvent'],
+  @classmethod
+  def magneticProfile(cls, theta):
+    profile = cls.profile(theta)
+    rMag, sldMag = sphere_css_coupled.sld(
+      theta['particleSize'],
+      theta['dShell'],
+      theta['dSurfactant'],
+      theta['magSldCore'],
+      theta['magSldShell'],
+      theta['magSldSurfactant'],
+      theta['magSldSolvent'],
     )
+    profile.update({'rMag': rMag, 'sldMag': sldMag})
+    return profile
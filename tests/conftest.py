@@ -0,0 +1,16 @@
+import pytest
+from modelexp.kernels import registry
+
+@pytest.fixture(autouse=True)
+def kernelCache(tmp_path, monkeypatch):
+  '''
+  Keep the backend choices of the kernels in tmp_path instead of the cache
+  in the home directory
+  '''
+  path = str(tmp_path / 'kernels.json')
+  monkeypatch.setenv('MODELEXP_KERNEL_CACHE', path)
+  monkeypatch.setattr(registry, 'cachePath', path)
+  monkeypatch.setattr(registry, 'choices', None)
+  registry.reset()
+  yield path
+  registry.reset()
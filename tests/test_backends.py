@@ -0,0 +1,86 @@
+import json, time
+import numpy as np
+import pytest
+from modelexp.kernels import BackendRegistry
+from modelexp.kernels._backends import machineKey
+
+name = 'sas.test.kernel' # no extension has it, so there is no fortran backend
+q = np.linspace(0.01, 0.3, 100)
+
+def exact(q):
+  return q**2
+
+def setup(path, wrong=False, calls=None):
+  '''
+  Registry with a numpy and a slower numba implementation, the numpy one
+  is off by 1 % if wrong
+  '''
+  registry = BackendRegistry(cachePath=str(path))
+  def numba(q):
+    if calls is not None:
+      calls.append('numba')
+    time.sleep(1e-3)
+    return exact(q)
+  def numpy(q):
+    if calls is not None:
+      calls.append('numpy')
+    return exact(q) * (1.01 if wrong else 1)
+  registry.register(name, 'numba', numba)
+  registry.register(name, 'numpy', numpy)
+  return registry
+
+def test_the_fastest_agreeing_backend_is_chosen(tmp_path):
+  registry = setup(tmp_path / 'kernels.json')
+  assert registry.listBackends(name) == ['numba', 'numpy']
+  kernel = registry.getKernel(name)
+  assert np.array_equal(kernel(q), exact(q))
+  assert kernel.chosen[128].__name__ == 'numpy'
+
+def test_a_backend_that_does_not_agree_is_not_taken(tmp_path):
+  registry = setup(tmp_path / 'kernels.json', wrong=True)
+  kernel = registry.getKernel(name)
+  with pytest.warns(UserWarning, match='does not agree'):
+    values = kernel(q)
+  assert np.array_equal(values, exact(q))
+  assert kernel.chosen[128].__name__ == 'numba'
+
+def test_set_backend_pins_and_releases(tmp_path):
+  calls = []
+  registry = setup(tmp_path / 'kernels.json', calls=calls)
+  kernel = registry.getKernel(name)
+  registry.setBackend('numba', name)
+  kernel(q)
+  assert calls == ['numba']
+
+  del calls[:]
+  registry.setBackend(None, name)
+  kernel(q)
+  # without a pin the backends are benchmarked again
+  assert 'numpy' in calls and 'numba' in calls and kernel.chosen[128].__name__ == 'numpy'
+
+def test_choices_round_trip_through_the_cache(tmp_path):
+  path = tmp_path / 'kernels.json'
+  setup(path).getKernel(name)(q)
+  with open(path) as f:
+    assert json.load(f)[machineKey()] == {name: {'128': 'numpy'}}
+
+  calls = []
+  registry = setup(path, calls=calls)
+  registry.getKernel(name)(q)
+  # the cached choice is used without a benchmark
+  assert calls == ['numpy']
+
+  registry.clearCache()
+  with open(path) as f:
+    assert json.load(f)[machineKey()] == {}
+
+def test_test_suite_does_not_write_the_home_cache(kernelCache):
+  from modelexp.kernels import registry
+  assert registry.cachePath == kernelCache
+
+def test_out_is_filled_by_backends_without_it(tmp_path):
+  registry = setup(tmp_path / 'kernels.json')
+  kernel = registry.getKernel(name)
+  out = np.empty_like(q)
+  assert kernel(q, out=out) is out
+  assert np.array_equal(out, exact(q))
@@ -0,0 +1,96 @@
+import numpy as np
+from modelexp.models._components import component, domainKey
+
+def test_domain_key_depends_on_content_shape_and_dtype():
+  q = np.linspace(0.01, 0.3, 100)
+  assert domainKey(q) == domainKey(q.copy())
+  assert domainKey(q[::2]) == domainKey(np.ascontiguousarray(q[::2]))
+  assert domainKey(q) != domainKey(q + 1e-12)
+  assert domainKey(q) != domainKey(q.astype(np.float32))
+  assert domainKey(q) != domainKey(q.reshape(10, 10))
+  # the key holds a digest of the content, not the 64 bit hash()
+  assert len(domainKey(q)[2]) == 32
+
+def test_component_is_cached_on_its_own_parameters():
+  calls = []
+  @component('a')
+  def square(x, a):
+    calls.append(a)
+    return a * x**2
+
+  x = np.linspace(0, 1, 10)
+  first = square(x, {'a': 2., 'b': 1.})
+  second = square(x, {'a': 2., 'b': 5.})
+  assert second is first and calls == [2.]
+  assert not first.flags.writeable
+  square(x + 1, {'a': 2.})
+  assert square.cacheInfo()['hits'] == 1 and square.cacheInfo()['misses'] == 2
+
+def jacobian(evaluate, q, theta, names):
+  '''
+  The evaluations of a forward difference Jacobian in the parameters names
+  '''
+  evaluate(q, theta)
+  for name in names:
+    shifted = dict(theta)
+    shifted[name] = theta[name] * (1 + 1e-8) + 1e-10
+    evaluate(q, shifted)
+
+def test_structure_factor_is_only_recalculated_for_its_parameters():
+  from modelexp.models.sas import SphereCSSCoupledHSStructure
+  from modelexp.models.sas._structureFactor import hardSphereStructureFactor
+  cls = SphereCSSCoupledHSStructure
+  theta = {
+    'particleSize': 100., 'dShell': 30., 'dSurfactant': 20., 'sldCore': 40e-6,
+    'sldShell': 30e-6, 'sldSurfactant': 40e-6, 'sldSolvent': 10e-6,
+    'sigParticleSize': 0.05, 'sigD': 0., 'i0': 1., 'bg': 1e-6,
+    'eta': 0.4, 'hardSphereRadius': 110.,
+  }
+  cls.formfactor.cacheClear()
+  hardSphereStructureFactor.cacheClear()
+  jacobian(cls.evaluate, np.linspace(0.01, 0.3, 100), theta, list(theta))
+
+  # the base point, and one column each for eta and hardSphereRadius
+  assert hardSphereStructureFactor.cacheInfo()['misses'] == 3
+  assert hardSphereStructureFactor.cacheInfo()['hits'] == len(theta) - 2
+  # every parameter but i0, bg, eta and hardSphereRadius
+  assert cls.formfactor.cacheInfo()['misses'] == 1 + len(theta) - 4
+
+class CountingKernels():
+  '''
+  Stand in for the superball kernels of fortSAS, which count their calls
+  '''
+  def __init__(self):
+    self.calls = []
+
+  def formfactor(self, q, *args):
+    self.calls.append('formfactor')
+    return np.ones_like(q)
+
+  def magnetic_formfactor(self, q, *args):
+    self.calls.append('magnetic_formfactor')
+    return np.ones_like(q)
+
+def test_magnetic_superball_is_cached(monkeypatch):
+  from modelexp.models.sas import SuperballCSOAOptimized
+  from modelexp.models.sas import _superballCSOAOptimized
+  kernels = CountingKernels()
+  monkeypatch.setattr(_superballCSOAOptimized, 'superball_new_cs', kernels)
+  cls = SuperballCSOAOptimized
+  cls.superballMagneticFormfactor.cacheClear()
+  cls.oleicFormfactor.cacheClear()
+  theta = {
+    'r': 100., 'd': 20., 'pVal': 2.3, 'pShell': 2.3, 'sldCore': 40e-6,
+    'sldShell': 8e-6, 'sldSolvent': 10e-6, 'sigR': 0., 'i0': 1., 'bg': 1e-6,
+    'orderHermite': 20, 'orderLegendre': 20, 'i0Oleic': 1., 'rOleic': 20.,
+    'magSldCore': 5e-6, 'magSldShell': 0., 'magSldSolvent': 0.,
+    'xi': 1., 'sin2alpha': 1., 'polarization': 1.,
+  }
+  free = ['r', 'd', 'pVal', 'i0', 'bg', 'i0Oleic', 'rOleic', 'magSldCore']
+  jacobian(cls.evaluateMagnetic, np.linspace(0.01, 0.3, 100), theta, free)
+
+  # i0, bg, i0Oleic and rOleic do not change the superball
+  assert kernels.calls.count('magnetic_formfactor') == 1 + len(free) - 4
+  assert cls.superballMagneticFormfactor.cacheInfo()['hits'] == 4
+  # only rOleic changes the oleic acid sphere
+  assert cls.oleicFormfactor.cacheInfo()['misses'] == 2
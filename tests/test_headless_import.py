@@ -0,0 +1,33 @@
+import json, os, subprocess, sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def importedModules(code):
+  '''
+  Names in sys.modules after running code in a fresh interpreter
+  '''
+  script = code + '\nimport json, sys\nprint(json.dumps(sorted(sys.modules)))\n'
+  env = dict(os.environ)
+  env['PYTHONPATH'] = os.pathsep.join(filter(None, [ROOT, env.get('PYTHONPATH')]))
+  output = subprocess.run(
+    [sys.executable, '-c', script], cwd=ROOT, env=env,
+    capture_output=True, text=True, check=True
+  ).stdout
+  return json.loads(output.splitlines()[-1])
+
+def isQt(name):
+  return (
+    name.split('.')[0] in ('PyQt5', 'PyQt6', 'PySide2', 'PySide6', 'sip', 'screeninfo')
+    or name.startswith('matplotlib.backends.backend_qt')
+    or name == 'matplotlib.pyplot'
+  )
+
+def test_cli_import_is_headless():
+  modules = importedModules('from modelexp import Cli')
+  assert 'modelexp._cli' in modules
+  assert [name for name in modules if isQt(name)] == []
+
+def test_app_stays_lazy():
+  modules = importedModules('import modelexp')
+  assert not 'modelexp._app' in modules
+  assert not 'modelexp.gui' in modules
@@ -0,0 +1,20 @@
+import importlib, sys
+import pytest
+
+packages = [
+  'modelexp.models.sas', 'modelexp.models.sas.crossterm',
+  'modelexp.models.magnetometry', 'modelexp.models.reflectometry',
+]
+
+@pytest.mark.parametrize('name', packages)
+def test_helpers_are_private(name):
+  package = importlib.import_module(name)
+  public = {attribute for attribute in vars(package) if not attribute.startswith('_')}
+  assert not {'LazyRegistry', 'lazyModule'} & public
+  assert not {'LazyRegistry', 'lazyModule'} & set(package.__all__)
+
+def test_models_load_on_access():
+  package = importlib.import_module('modelexp.models.magnetometry')
+  assert 'Langevin' in package.__all__
+  assert package.Langevin.__name__ == 'Langevin'
+  assert 'modelexp.models.magnetometry._langevin' in sys.modules
@@ -0,0 +1,58 @@
+import math
+import numpy as np
+import pytest
+from numpy.polynomial.hermite import hermgauss
+from modelexp.kernels import registry
+from modelexp.kernels import _magNumpy
+from modelexp.kernels._magNumpy import kB, muB
+
+B = np.concatenate([np.linspace(-2, 2, 41), [1e-9, -1e-7]])
+T = 300.
+
+def langevin(x):
+  if abs(x) < 1e-2:
+    return x/3 - x**3/45 + 2*x**5/945
+  return 1 / math.tanh(x) - 1 / x
+
+def loop(Ms, moments, weights):
+  '''
+  Ms times the weighted mean of the Langevin function, one field and one
+  moment at a time
+  '''
+  return np.array([
+    Ms * sum(w * langevin(m * muB * b / (kB * T)) for m, w in zip(moments, weights)) / sum(weights)
+    for b in B
+  ])
+
+def numberWeighted(mu, sigMu, order=_magNumpy.order):
+  x, w = hermgauss(order)
+  return [mu * math.exp(math.sqrt(2) * sigMu * xi) for xi in x], list(w)
+
+@pytest.mark.parametrize('mu, sigMu', [(5000., 0.), (5000., 0.3), (200., 0.8)])
+def test_magnetization_against_a_loop(mu, sigMu):
+  moments, weights = numberWeighted(mu, sigMu) if sigMu > 0 else ([mu], [1.])
+  expected = loop(2., moments, weights)
+  assert np.allclose(_magNumpy.magnetization(B, 2., mu, T, sigMu), expected, rtol=1e-10, atol=1e-14)
+
+@pytest.mark.parametrize('mu, sigMu', [(5000., 0.3), (200., 0.8)])
+def test_mu_weighted_magnetization_against_a_loop(mu, sigMu):
+  x, w = hermgauss(40)
+  moments, weights = numberWeighted(mu, sigMu, 40)
+  expected = loop(2., moments, [wi * m for wi, m in zip(weights, moments)])
+  values = _magNumpy.muWeightedMagnetization(B, 2., mu, T, sigMu, x, w)
+  assert np.allclose(values, expected, rtol=1e-10, atol=1e-14)
+
+def test_populations_are_the_sum_of_their_magnetizations():
+  Ms, mu, sigMu = np.array([1., 0.5]), np.array([5000., 300.]), np.array([0.2, 0.])
+  expected = sum(_magNumpy.magnetization(B, ms, m, T, sig) for ms, m, sig in zip(Ms, mu, sigMu))
+  assert np.allclose(_magNumpy.magnetizationPopulations(B, Ms, mu, T, sigMu), expected, rtol=1e-12)
+
+@pytest.mark.parametrize('name, args', [
+  ('mag.langevin.magnetization', (B, 2., 5000., T, 0.3)),
+  ('mag.langevin.mu_weighted_magnetization', (B, 2., 5000., T, 0.3, *hermgauss(40))),
+  ('mag.langevin.magnetization_populations', (B, np.array([1., 0.5]), np.array([5000., 300.]), T, np.array([0.2, 0.]))),
+])
+def test_numba_agrees_with_numpy(name, args):
+  pytest.importorskip('numba')
+  implementations = registry.getImplementations(name)
+  assert np.allclose(implementations['numba'](*args), implementations['numpy'](*args), rtol=1e-10, atol=1e-14)
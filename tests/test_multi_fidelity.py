@@ -0,0 +1,107 @@
+import contextlib, io
+import numpy as np
+from numpy.polynomial.hermite import hermgauss
+from numpy.polynomial.legendre import leggauss
+from modelexp import Cli
+from modelexp.experiments.sas import Saxs
+from modelexp.models.sas._saxsModel import SAXSModel
+from modelexp.data import XyeData
+from modelexp.fit import Fit, LevenbergMarquardt, MultiFidelity
+
+class CubeLike(SAXSModel):
+  '''
+  Orientation and size average of a sinc^2 by Gauss-Hermite and
+  Gauss-Legendre quadrature, it oscillates like the formfactor of a cube.
+  The orders of every evaluation are recorded in orders.
+  '''
+  orders = []
+
+  def initParameters(self):
+    self.params.add('a', 100)
+    self.params.add('sig', 0.1)
+    self.params.add('i0', 1)
+    self.params.add('bg', 0)
+    self.params.add('orderHermite', 20)
+    self.params.add('orderLegendre', 40)
+
+  @classmethod
+  def evaluate(cls, q, theta):
+    orders = (int(theta['orderHermite']), int(theta['orderLegendre']))
+    cls.orders.append(orders)
+    x, w = hermgauss(orders[0])
+    mu, v = leggauss(orders[1])
+    A = float(theta['a']) * np.exp(np.sqrt(2) * float(theta['sig']) * x)
+    y = q[:, None, None] * A[None, :, None] * (mu[None, None, :] + 1) / 4
+    f = np.sinc(y / np.pi)**2
+    formfactor = (f * w[None, :, None] * v[None, None, :] / 2).sum((1, 2)) / np.sqrt(np.pi)
+    return cls.scaleIntensity(theta, formfactor)
+
+  @classmethod
+  def profile(cls, theta):
+    return {'r': np.zeros(1), 'sld': np.zeros(1)}
+
+def setup(fitClass, tmp_path):
+  '''
+  Saxs data of CubeLike with a percent of deterministic noise, the fit
+  starts away from its parameters
+  '''
+  q = np.linspace(0.005, 0.2, 200)
+  theta = {'a': 80., 'sig': 0.08, 'i0': 2., 'bg': 1e-3, 'orderHermite': 20, 'orderLegendre': 40}
+  I = CubeLike.evaluate(q, theta) * (1 + 0.01 * np.sin(37 * q))
+  path = str(tmp_path / 'cubeLike.xye')
+  np.savetxt(path, np.transpose([q, I, 0.01 * I]))
+
+  app = Cli()
+  app.setExperiment(Saxs)
+  data = app.setData(XyeData)
+  data.loadFromFile(path)
+  model = app.setModel(CubeLike)
+  model.setParam('a', 90, minVal=50, maxVal=150)
+  model.setParam('sig', 0.1, minVal=0.01, maxVal=0.3)
+  model.setParam('i0', 1.5, minVal=0, maxVal=10)
+  model.setParam('bg', 1e-3, minVal=0, maxVal=1, vary=False)
+  model.setParam('orderHermite', 20, vary=False)
+  model.setParam('orderLegendre', 40, vary=False)
+  return model, app.setFit(fitClass)
+
+def runFit(fit):
+  del CubeLike.orders[:]
+  with contextlib.redirect_stdout(io.StringIO()):
+    return fit.fit()
+
+def test_stages_run_at_reduced_orders(tmp_path):
+  _, fit = setup(MultiFidelity, tmp_path)
+  runFit(fit)
+  assert len(fit.stageResults) > 0
+  staged = [
+    (int(result.params['orderHermite']), int(result.params['orderLegendre']))
+    for result in fit.stageResults
+  ]
+  assert staged[0] == (5, 10)
+  # the orders of the evaluations, in the order of the stages
+  sequence = [orders for k, orders in enumerate(CubeLike.orders) if k == 0 or orders != CubeLike.orders[k-1]]
+  assert sequence == staged + [(20, 40)]
+
+def test_last_stage_is_fitted_by_fit_minimize_at_the_full_orders(tmp_path, monkeypatch):
+  model, fit = setup(MultiFidelity, tmp_path)
+  starts = []
+  minimize = Fit.minimize
+  def recorded(self, residuum, params):
+    starts.append((params['orderHermite'].value, params['orderLegendre'].value))
+    return minimize(self, residuum, params)
+  monkeypatch.setattr(Fit, 'minimize', recorded)
+  result = runFit(fit)
+  assert starts == [(20, 40)]
+  assert result.fidelity == 1.
+  assert (result.params['orderHermite'].value, result.params['orderLegendre'].value) == (20, 40)
+  # the stages bring the last run close to the solution
+  assert result.nfev < sum(stage.nfev for stage in fit.stageResults)
+
+def test_result_agrees_with_levenberg_marquardt(tmp_path):
+  _, fit = setup(MultiFidelity, tmp_path)
+  result = runFit(fit)
+  _, lm = setup(LevenbergMarquardt, tmp_path)
+  reference = runFit(lm)
+  for name in ('a', 'sig', 'i0'):
+    assert np.isclose(result.params[name].value, reference.params[name].value, rtol=1e-5)
+  assert np.isclose(result.chisqr, reference.chisqr, rtol=1e-6)
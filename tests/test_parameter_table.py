@@ -0,0 +1,41 @@
+import os
+import numpy as np
+from modelexp import Cli
+from modelexp.experiments import Generic
+from modelexp.models.generic import Parabola
+from modelexp.models._model import ParameterTable
+from modelexp.data import XyeData
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA = os.path.join(ROOT, 'examples', 'Parabola', 'parabolaData.xye')
+
+class ConstrainedParabola(Parabola):
+  '''
+  Parabola whose offset follows its amplitude
+  '''
+  def initParameters(self):
+    super().initParameters()
+    self.params.add('c', expr='a/2')
+
+def test_table_keeps_the_expression():
+  table = ParameterTable()
+  table.add('a', 1, min=0, max=2)
+  table.add('c', expr='a/2')
+  assert table['a'].expr is None
+  assert table['c'].expr == 'a/2'
+
+def test_expressions_of_modelsets_are_evaluated():
+  app = Cli()
+  experiment = app.setExperiment(Generic)
+  data = app.setData(XyeData)
+  data.loadFromFile(DATA)
+  model = app.setModel(ConstrainedParabola)
+  assert model.params['c'].expr == 'a/2'
+
+  params = model.params.copy()
+  params['a'].value = 1.7
+  experiment.residuum(params)
+  modelset = model.getModelset(0)
+  assert modelset.params['c'] == 0.85
+  x = modelset.getDomain()
+  assert np.allclose(modelset.getValues(), 1.7*(x - modelset.params['x0'])**2 + 0.85)
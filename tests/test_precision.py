@@ -0,0 +1,78 @@
+import contextlib, io, os
+import numpy as np
+from modelexp import Cli
+from modelexp.experiments import Generic
+from modelexp.models.generic import Parabola
+from modelexp.data import XyeData
+from modelexp.fit import LevenbergMarquardt
+from test_variable_projection import setup as sanspol
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA = os.path.join(ROOT, 'examples', 'Parabola', 'parabolaData.xye')
+
+def parabola():
+  '''
+  The Parabola example in single precision
+  '''
+  app = Cli()
+  experiment = app.setExperiment(Generic)
+  data = app.setData(XyeData)
+  data.loadFromFile(DATA)
+  model = app.setModel(Parabola)
+  model.setParam('a', 1.5, -5, 5)
+  model.setParam('x0', 0.3, -3, 3)
+  model.setParam('c', 2, -2, 2)
+  model.setPrecision('single')
+  return experiment, model
+
+def test_residuum_follows_the_precision():
+  experiment, model = parabola()
+  params = model.params.copy()
+  assert experiment.residuum(params).dtype == np.float32
+  assert model.getModelset(0).getValues().dtype == np.float32
+  model.setPrecision('double')
+  assert experiment.residuum(params).dtype == np.float64
+  with model.evaluationPrecision('single'):
+    assert experiment.residuum(params).dtype == np.float32
+  assert model.precision == 'double'
+
+def test_switching_the_precision_recalculates_every_modelset():
+  model, fit = sanspol(LevenbergMarquardt)
+  experiment = fit.ptrExperiment
+  params = model.params.copy()
+  experiment.residuum(params)
+  experiment.residuum(params)
+  assert not any(model.updatedModelsets)
+
+  model.setPrecision('single')
+  experiment.residuum(params)
+  assert all(model.updatedModelsets)
+  assert all(model.getModelset(i).getValues().dtype == np.float32 for i in range(model.nModelsets))
+
+  model.setPrecision('double')
+  experiment.residuum(params)
+  assert all(model.updatedModelsets)
+
+def runFit(fit):
+  with contextlib.redirect_stdout(io.StringIO()):
+    return fit.fit()
+
+def test_single_precision_fit_is_finished_in_double_precision(monkeypatch):
+  experiment, model = parabola()
+  fit = LevenbergMarquardt(experiment, experiment.data, model)
+  dtypes = []
+  residuum = experiment.residuum
+  def recorded(p):
+    values = residuum(p)
+    dtypes.append(values.dtype)
+    return values
+  monkeypatch.setattr(experiment, 'residuum', recorded)
+  result = runFit(fit)
+  assert result.precision == 'double'
+  assert dtypes[0] == np.float32 and dtypes[-1] == np.float64
+  assert model.precision == 'single'
+
+  model.setPrecision('double')
+  reference = runFit(fit)
+  for name in ('a', 'x0', 'c'):
+    assert np.isclose(result.params[name].value, reference.params[name].value, rtol=1e-6)
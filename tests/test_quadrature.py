@@ -0,0 +1,76 @@
+import warnings
+import numpy as np
+from numpy.polynomial.hermite import hermgauss
+from numpy.polynomial.legendre import leggauss
+from modelexp.kernels import AdaptiveOrders
+
+q = np.linspace(0.005, 0.3, 300)
+
+def cubeLike(q, a, sig, x_herm, w_herm, x_leg, w_leg):
+  '''
+  Orientation and size average of a sinc^2, which oscillates like the
+  formfactor of a cube of edge a
+  '''
+  cubeLike.calls.append((len(x_herm), len(x_leg)))
+  A = a * np.exp(np.sqrt(2) * sig * x_herm)
+  mu = (x_leg + 1) / 2
+  x = q[:, None, None] * A[None, :, None] * mu[None, None, :] / 2
+  f = np.sinc(x / np.pi)**2
+  return (f * w_herm[None, :, None] * w_leg[None, None, :] / 2).sum((1, 2)) / np.sqrt(np.pi)
+cubeLike.calls = []
+
+def reference(a, sig):
+  return cubeLike(q, a, sig, *hermgauss(120), *leggauss(150))
+
+def test_remembered_orders_are_used_for_small_changes():
+  adaptive = AdaptiveOrders()
+  adaptive(cubeLike, (0, 0), q, (100., 0.1), {})
+  del cubeLike.calls[:]
+  adaptive(cubeLike, (0, 0), q, (102., 0.1), {})
+  assert len(cubeLike.calls) == 1
+
+def test_orders_follow_a_large_parameter_jump():
+  adaptive = AdaptiveOrders()
+  adaptive(cubeLike, (0, 0), q, (50., 0.05), {})
+  (small, _), = adaptive.orders.values()
+
+  # four times the size oscillates four times faster over the same q-range
+  values = adaptive(cubeLike, (0, 0), q, (200., 0.1), {})
+  (large, _), = adaptive.orders.values()
+  assert large[0] > small[0] and large[1] > small[1]
+  expected = reference(200., 0.1)
+  assert np.allclose(values, expected, rtol=adaptive.rtol, atol=adaptive.rtol * expected.max())
+
+  fresh = AdaptiveOrders()
+  fresh(cubeLike, (0, 0), q, (200., 0.1), {})
+  assert [orders for orders, _ in fresh.orders.values()] == [large]
+
+def test_fixed_orders_are_remembered_separately():
+  adaptive = AdaptiveOrders()
+  adaptive(cubeLike, (0, 12), q, (100., 0.1), {})
+  adaptive(cubeLike, (0, 30), q, (100., 0.1), {})
+  assert sorted(orders[1] for orders, _ in adaptive.orders.values()) == [12, 30]
+
+def sphereLike(q, r, x_herm, w_herm, x_leg, w_leg):
+  '''
+  Monodisperse sphere with its amplitude integrated over the radius, it is
+  exactly 0 where tan(qr) = qr
+  '''
+  R = r * (x_leg + 1) / 2
+  qR = q[:, None] * R[None, :]
+  amplitude = (4 * np.pi * R**2 * np.sinc(qR / np.pi) * w_leg).sum(1) * r / 2
+  return amplitude**2
+
+def test_zeros_of_the_intensity_converge():
+  # the first zeros of a sphere of radius 50 and points in between
+  zeros = np.array([4.493409457909064, 7.725251836937707, 10.904121659428899]) / 50
+  x = np.sort(np.concatenate([zeros, np.linspace(0.01, 0.3, 50)]))
+  adaptive = AdaptiveOrders()
+  with warnings.catch_warnings():
+    warnings.simplefilter('error')
+    values = adaptive(sphereLike, (1, 0), x, (50.,), {})
+  (orders, _), = adaptive.orders.values()
+  assert orders[1] < 50
+  qr = x * 50
+  expected = (4/3 * np.pi * 50**3 * 3 * (np.sin(qr) - qr * np.cos(qr)) / qr**3)**2
+  assert np.allclose(values, expected, rtol=adaptive.rtol, atol=adaptive.rtol * expected.max())
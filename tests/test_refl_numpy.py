@@ -0,0 +1,113 @@
+import cmath, math
+import numpy as np
+import pytest
+from modelexp.kernels import registry
+from modelexp.kernels import _reflNumpy
+
+q = np.linspace(0.005, 0.25, 120)
+# substrate to ambient, absorption is a negative imaginary part
+sld = [2.07e-6, 6e-6 - 1e-8j, 1e-6, 4e-6, 0]
+roughness = [3., 5., 2., 4., 0.]
+thickness = [30., 40., 20., 60., 0.]
+
+def parrattLoop(q, sld, roughness, thickness):
+  '''
+  Parratt recursion for one q at a time, from the substrate up to the
+  ambient medium
+  '''
+  reflectivity = []
+  for x in q:
+    k = [cmath.sqrt((x/2)**2 - 4*math.pi*(rho - sld[-1])) for rho in sld]
+    X = 0
+    for j in range(len(sld) - 1):
+      r = (k[j+1] - k[j]) / (k[j+1] + k[j]) * cmath.exp(-2 * k[j] * k[j+1] * roughness[j]**2)
+      phase = cmath.exp(2j * k[j] * thickness[j]) if j > 0 else 1
+      X = (r + X * phase) / (1 + r * X * phase)
+    reflectivity.append(abs(X)**2)
+  return np.array(reflectivity)
+
+def abeles(q, sld, roughness, thickness):
+  '''
+  Transfer matrix method from the ambient medium down to the substrate. Its
+  waves decay for a negative imaginary part of k, so absorption is a
+  positive imaginary part of the sld and evanescent waves take the lower
+  branch of the root.
+  '''
+  sld, roughness, thickness = np.conj(sld[::-1]), roughness[::-1], thickness[::-1]
+  reflectivity = []
+  for x in q:
+    k = [cmath.sqrt((x/2)**2 - 4*math.pi*(rho - sld[0]) - 1e-30j) for rho in sld]
+    M = np.eye(2, dtype=complex)
+    for j in range(len(sld) - 1):
+      r = (k[j] - k[j+1]) / (k[j] + k[j+1]) * cmath.exp(-2 * k[j] * k[j+1] * roughness[j+1]**2)
+      beta = 1j * k[j] * thickness[j] if j > 0 else 0
+      M = M @ np.array([
+        [cmath.exp(beta), r * cmath.exp(beta)],
+        [r * cmath.exp(-beta), cmath.exp(-beta)],
+      ])
+    reflectivity.append(abs(M[1, 0] / M[0, 0])**2)
+  return np.array(reflectivity)
+
+def roughSldLoop(z, sld, roughness, thickness):
+  '''
+  Sum of error function steps at the interfaces, one z at a time
+  '''
+  interfaces = [0.]
+  for d in thickness[1:-1]:
+    interfaces.append(interfaces[-1] + d)
+  profile = []
+  for x in z:
+    value = sld[0]
+    for j, position in enumerate(interfaces):
+      if roughness[j] > 0:
+        step = 0.5 * (1 + math.erf((x - position) / (math.sqrt(2) * roughness[j])))
+      else:
+        step = float(x >= position)
+      value += (sld[j+1] - sld[j]) * step
+    profile.append(value)
+  return np.array(profile)
+
+@pytest.mark.parametrize('stack', [
+  (sld, roughness, thickness),
+  (np.real(sld).tolist(), roughness, thickness),
+  (sld, [0.] * 5, thickness),
+])
+def test_parratt_against_a_loop(stack):
+  expected = parrattLoop(q, *stack)
+  values = _reflNumpy.parratt(q, *stack)
+  assert np.allclose(values, expected, rtol=1e-10, atol=0)
+  assert np.allclose(abeles(q, *stack), expected, rtol=1e-8, atol=0)
+  assert np.all(values <= 1 + 1e-12)
+
+def test_single_interface_is_fresnel():
+  k = np.sqrt((q/2)**2 - 4*np.pi*2.07e-6 + 0j)
+  fresnel = np.abs((q/2 - k) / (q/2 + k))**2
+  assert np.allclose(_reflNumpy.parratt(q, [2.07e-6, 0], [0, 0], [10, 0]), fresnel, rtol=1e-12)
+  # total reflection below the critical edge, less of it with absorption
+  assert np.isclose(_reflNumpy.parratt(np.array([0.005]), [2.07e-6, 0], [0, 0], [10, 0])[0], 1)
+  assert _reflNumpy.parratt(np.array([0.005]), [2.07e-6 - 1e-7j, 0], [0, 0], [10, 0])[0] < 0.99
+
+def test_batch_equals_the_single_stacks():
+  thicknesses = np.tile(thickness, (5, 1))
+  thicknesses[:, 3] = np.linspace(40, 80, 5)
+  batch = _reflNumpy.parrattBatch(q, np.tile(sld, (5, 1)), np.tile(roughness, (5, 1)), thicknesses)
+  for values, stack in zip(batch, thicknesses):
+    assert np.allclose(values, parrattLoop(q, sld, roughness, stack), rtol=1e-10, atol=0)
+
+def test_rough_sld_against_a_loop():
+  z = np.linspace(-30, 200, 300)
+  expected = roughSldLoop(z, sld, roughness, thickness)
+  assert np.allclose(_reflNumpy.roughSld(z, sld, roughness, thickness), expected, rtol=1e-12, atol=1e-20)
+  sharp = [3., 0., 2., 4., 0.]
+  assert np.allclose(_reflNumpy.roughSld(z, sld, sharp, thickness), roughSldLoop(z, sld, sharp, thickness))
+  batch = _reflNumpy.roughSldBatch(z, [sld, sld], [roughness, sharp], [thickness, thickness])
+  assert np.allclose(batch[1], roughSldLoop(z, sld, sharp, thickness))
+
+@pytest.mark.parametrize('name, args', [
+  ('refl.algorithms.parrat', (q, sld, roughness, thickness)),
+  ('refl.algorithms.roughsld_thick_layers', (np.linspace(-30, 200, 300), sld, roughness, thickness)),
+])
+def test_numpy_agrees_with_fortran(name, args):
+  pytest.importorskip('fortRefl')
+  implementations = registry.getImplementations(name)
+  assert np.allclose(implementations['numpy'](*args), implementations['fortran'](*args), rtol=1e-6)
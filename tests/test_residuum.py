@@ -0,0 +1,120 @@
+import os
+import numpy as np
+import pytest
+from modelexp import Cli
+from modelexp.experiments.sas import Sans, SanspolCrossterm
+from modelexp.experiments.reflectometry import Reflectometry
+from modelexp.experiments.magnetometry import Vsm
+from modelexp.models.sas import Sphere, InstrumentalResolution
+from modelexp.models.reflectometry import Substrate
+from modelexp.models.magnetometry import Langevin
+from modelexp.data import XyeData
+from modelexp.fit import LevenbergMarquardt
+from test_variable_projection import setup as sanspol
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXAMPLES = os.path.join(ROOT, 'examples')
+
+def sans(experimentClass, tmp_path):
+  app = Cli()
+  experiment = app.setExperiment(experimentClass)
+  data = app.setData(XyeData)
+  for suffix, weight in (('sa', 2), ('la', 0.5)):
+    data.loadFromFile(os.path.join(EXAMPLES, 'Sans_Sphere', f'sansSphereData_{suffix}.xye'), suffix, weight)
+  model = app.setModel(Sphere, InstrumentalResolution)
+  model.setParam('r', 48, minVal=0, maxVal=100)
+  model.setParam('sigR', 0.05, minVal=0, maxVal=0.2)
+  app.setFit(LevenbergMarquardt)
+  return experiment, (0.02, 0.1)
+
+def reflectometry(experimentClass, tmp_path):
+  q = np.linspace(0.01, 0.2, 200)
+  R = 1e-4 / q**4 * np.exp(-(q * 10)**2) + 2e-6
+  path = str(tmp_path / 'reflectivity.xye')
+  np.savetxt(path, np.transpose([q, R * (1 + 0.05 * np.sin(50 * q)), 0.1 * R]))
+  app = Cli()
+  experiment = app.setExperiment(experimentClass)
+  data = app.setData(XyeData)
+  data.loadFromFile(path, weight=3)
+  app.setModel(Substrate)
+  app.setFit(LevenbergMarquardt)
+  return experiment, (0.03, 0.15)
+
+def vsm(experimentClass, tmp_path):
+  app = Cli()
+  experiment = app.setExperiment(experimentClass)
+  data = app.setData(XyeData)
+  data.loadFromFile(os.path.join(EXAMPLES, 'Magnetization_Langevin', 'magnetizationLangevin.xye'))
+  model = app.setModel(Langevin)
+  model.setParam('Ms', 190, minVal=0, maxVal=300)
+  model.setParam('mu', 9000, minVal=0, maxVal=20000)
+  app.setFit(LevenbergMarquardt)
+  return experiment, (-1, 1.5)
+
+def baseline(experiment, applyFitRange=True, applyWeight=True, formula=None):
+  '''
+  The residuum as every experiment calculated it for itself before the
+  residuum engine, from the current model values
+  '''
+  formula = experiment.residuumFormula if formula is None else formula
+  slices = []
+  for i in range(experiment.model.nModelsets):
+    data = experiment.data.getDataset(i)
+    x, I, sI = data.getDomain(), data.getValues(), data.getErrors()
+    Imodel = experiment.model.getModelset(i).getValues()
+    if applyFitRange and experiment.fit_range is not None:
+      mask = (x > experiment.fit_range[0]) & (x < experiment.fit_range[1])
+      x, I, sI, Imodel = x[mask], I[mask], sI[mask], Imodel[mask]
+    weight = experiment.data.dataWeights[i] if applyWeight else 1
+    slices.append(np.sqrt(weight) * formula(x, I, sI, Imodel))
+  return np.concatenate(slices)
+
+@pytest.mark.parametrize('formula', ['chi2', 'log chi2'])
+@pytest.mark.parametrize('fitRange', [False, True])
+@pytest.mark.parametrize('experimentClass, setup', [
+  (Sans, sans),
+  (Reflectometry, reflectometry),
+  (Vsm, vsm),
+  (SanspolCrossterm, sans),
+])
+def test_residuum_agrees_with_the_experiment_formulas(experimentClass, setup, fitRange, formula, tmp_path):
+  experiment, fit_range = setup(experimentClass, tmp_path)
+  experiment.setResiduumFormula(formula)
+  if fitRange:
+    experiment.setFitRange(*fit_range)
+  with np.errstate(invalid='ignore'):
+    resi = experiment.residuum(experiment.model.params.copy())
+    if experimentClass is SanspolCrossterm:
+      # the whole range and chi2, whatever was set
+      expected = baseline(experiment, applyFitRange=False, formula=experiment.chi2_residuum)
+    else:
+      expected = baseline(experiment)
+  assert resi.shape == expected.shape
+  assert np.allclose(resi, expected, rtol=1e-12, atol=0, equal_nan=True)
+
+def test_vsm_applies_the_dataset_weights(tmp_path):
+  # the Vsm residuum did not use the weights before, unlike every other
+  # experiment, the residuum engine applies them as it does for the others
+  experiment, _ = vsm(Vsm, tmp_path)
+  unweighted = experiment.residuum(experiment.model.params.copy())
+  assert np.allclose(unweighted, baseline(experiment, applyWeight=False), rtol=1e-12, atol=0)
+
+  experiment.data.dataWeights[0] = 4
+  assert np.allclose(experiment.calcResiduum(), 2 * unweighted, rtol=1e-12, atol=0)
+
+@pytest.mark.parametrize('fitRange', [None, (0.015, 0.08)])
+def test_partially_refilled_residuum_equals_a_full_recalculation(fitRange):
+  model, fit = sanspol(LevenbergMarquardt, fitRange)
+  experiment = fit.ptrExperiment
+  params = model.params.copy()
+  experiment.residuum(params)
+
+  # dTheta_sa only feeds the modelsets of the small angle detector
+  params['dTheta_sa'].value *= 1.5
+  resi = experiment.residuum(params)
+  assert 0 < sum(model.updatedModelsets) < model.nModelsets
+
+  model.calcModel()
+  experiment.residuumLayout = []
+  assert np.array_equal(resi, experiment.calcResiduum())
+  assert np.allclose(resi, baseline(experiment), rtol=1e-12, atol=0)
@@ -0,0 +1,53 @@
+import numpy as np
+from modelexp.fit import LevenbergMarquardt
+from test_variable_projection import setup as sanspol
+
+def setup():
+  model, fit = sanspol(LevenbergMarquardt)
+  experiment = fit.ptrExperiment
+  params = model.params.copy()
+  experiment.residuum(params)
+  return experiment, model, params
+
+def values(model):
+  return [model.getModelset(i).getValues().copy() for i in range(model.nModelsets)]
+
+def test_jacobian_column_of_a_dataset_parameter_recalculates_its_modelsets():
+  experiment, model, params = setup()
+  # the finite difference step of the dTheta_sa column of the Jacobian
+  params['dTheta_sa'].value += 1e-3
+  resi = experiment.residuum(params)
+  suffixes = [model.getModelset(i).suffix for i in range(model.nModelsets)]
+  assert model.updatedModelsets == [suffix[0] == 'sa' for suffix in suffixes]
+
+  partial = values(model)
+  model.calcModel()
+  for result, reference in zip(partial, values(model)):
+    assert np.array_equal(result, reference)
+  assert np.array_equal(resi, experiment.calcResiduum())
+
+def test_unchanged_parameters_are_not_recalculated():
+  experiment, model, params = setup()
+  experiment.residuum(params)
+  assert not any(model.updatedModelsets)
+
+def test_new_domain_is_recalculated():
+  experiment, model, params = setup()
+  modelset = model.getModelset(1)
+  q = modelset.getDomain()
+  modelset.defineDomain(q * 1.01)
+  model.updateModel()
+  assert model.updatedModelsets == [False, True, False, False]
+
+  moved = modelset.getValues().copy()
+  model.calcModel()
+  assert np.array_equal(moved, modelset.getValues())
+  modelset.defineDomain(q)
+  model.updateModel()
+  assert not np.array_equal(moved, modelset.getValues())
+
+def test_reconnected_data_recalculates_every_modelset():
+  experiment, model, params = setup()
+  experiment.connectData(experiment.data)
+  experiment.residuum(params)
+  assert all(model.updatedModelsets)
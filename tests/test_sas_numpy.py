@@ -0,0 +1,97 @@
+import lmfit
+import numpy as np
+import pytest
+from scipy.integrate import quad
+from scipy.stats import lognorm
+from modelexp.kernels import registry
+from modelexp.kernels import _sasNumpy
+from modelexp.models.sas import Sphere, SphereCS
+
+q = np.array([1e-4, 0.01, 0.05, 0.1, 0.3])
+
+# arguments of every numpy kernel and the tolerance against fortSAS, the
+# orders of the size integrals differ, so polydisperse ones agree less
+exact, polydisperse = 1e-6, 1e-3
+cases = [
+  ('sas.sphere.formfactor', (q, 50., 40e-6, 10e-6, 0.), exact),
+  ('sas.sphere.formfactor', (q, 50., 40e-6, 10e-6, 0.1), polydisperse),
+  ('sas.sphere.magnetic_formfactor', (q, 50., 40e-6, 10e-6, 0.1, 1e-6, 0., 1., 1., 1.), polydisperse),
+  ('sas.sphere.magnetic_formfactor', (q, 50., 40e-6, 10e-6, 0.1, 1e-6, 0., 1., 1., -1.), polydisperse),
+  ('sas.sphere.sld', (50., 40e-6, 10e-6), exact),
+  ('sas.sphere_cs.formfactor', (q, 50., 20., 40e-6, 30e-6, 10e-6, 0., 0.), exact),
+  ('sas.sphere_cs.formfactor', (q, 50., 20., 40e-6, 30e-6, 10e-6, 0.1, 0.05), polydisperse),
+  ('sas.sphere_cs.magnetic_formfactor', (
+    q, 50., 20., 40e-6, 30e-6, 10e-6, 0.1, 0., 5., 1e-6, 0., 0., 1., 1., 1.
+  ), polydisperse),
+  ('sas.sphere_cs.sld', (50., 20., 40e-6, 30e-6, 10e-6), exact),
+  ('sas.sphere_css_coupled.formfactor', (
+    q, 50., 10., 15., 40e-6, 30e-6, 8e-6, 6e-6, 0.1, 0.05
+  ), polydisperse),
+  ('sas.sphere_css_coupled.magnetic_formfactor', (
+    q, 50., 10., 15., 40e-6, 30e-6, 8e-6, 6e-6, 0.1, 0.05, 1e-6, 1e-6, 0., 0., 1., 1., 1.
+  ), polydisperse),
+  ('sas.sphere_css_coupled.sld', (50., 10., 15., 40e-6, 30e-6, 8e-6, 6e-6), exact),
+]
+
+def parameters(**values):
+  params = lmfit.Parameters()
+  for name, value in values.items():
+    params.add(name, value)
+  return params
+
+def test_profiles_accept_lmfit_parameters():
+  params = parameters(r=50, d=20, sldCore=40e-6, sldShell=30e-6, sldSolvent=10e-6)
+  profile = Sphere.profile(params)
+  assert profile['sld'][0] == 40e-6 and profile['sld'][-1] == 10e-6
+  profile = SphereCS.profile(params)
+  assert profile['sld'][np.searchsorted(profile['r'], 60)] == 30e-6
+
+def test_formfactor_accepts_lmfit_parameters():
+  params = parameters(r=50, sldCore=40e-6, sldSolvent=10e-6, sigR=0.1)
+  values = _sasNumpy.sphereFormfactor(
+    q, params['r'], params['sldCore'], params['sldSolvent'], params['sigR']
+  )
+  assert np.array_equal(values, _sasNumpy.sphereFormfactor(q, 50., 40e-6, 10e-6, 0.1))
+
+def test_polydisperse_sphere_against_adaptive_quadrature():
+  r, sig, contrast = 50., 0.1, 30e-6
+  def intensity(x, R):
+    qR = x * R
+    return lognorm.pdf(R, sig, scale=r) * (
+      4/3 * np.pi * R**3 * 3 * (np.sin(qR) - qR * np.cos(qR)) / qR**3 * contrast
+    )**2
+  reference = [
+    quad(lambda R: intensity(x, R), r * np.exp(-8*sig), r * np.exp(8*sig), limit=200)[0]
+    for x in q
+  ]
+  values = _sasNumpy.sphereFormfactor(q, r, 40e-6, 10e-6, sig)
+  assert np.allclose(values, reference, rtol=1e-8)
+
+@pytest.mark.parametrize('name, args, rtol', cases)
+def test_numpy_agrees_with_fortran(name, args, rtol):
+  pytest.importorskip('fortSAS')
+  implementations = registry.getImplementations(name)
+  numpy, fortran = implementations['numpy'](*args), implementations['fortran'](*args)
+  if isinstance(fortran, tuple):
+    for result, reference in zip(numpy, fortran):
+      assert np.allclose(result, reference, rtol=rtol)
+  else:
+    assert np.allclose(numpy, fortran, rtol=rtol, atol=rtol * np.max(np.abs(fortran)))
+
+def test_resolution_smear_agrees_with_fortran():
+  pytest.importorskip('fortSAS')
+  implementations = registry.getImplementations('sas.math.resolution_smear')
+  x = np.linspace(0.01, 0.3, 500)
+  I = _sasNumpy.sphereFormfactor(x, 50., 40e-6, 10e-6, 0.1)
+  sigQ = 0.002 + 0.01 * x
+  assert np.allclose(
+    implementations['numpy'](x, I, sigQ), implementations['fortran'](x, I, sigQ), rtol=polydisperse
+  )
+
+def test_resolution_smear_writes_into_out():
+  x = np.linspace(0.01, 0.3, 500)
+  I = _sasNumpy.sphereFormfactor(x, 50., 40e-6, 10e-6, 0.1)
+  sigQ = 0.002 + 0.01 * x
+  out = np.empty_like(x)
+  assert _sasNumpy.resolutionSmear(x, I, sigQ, chunk=2**12, out=out) is out
+  assert np.array_equal(out, _sasNumpy.resolutionSmear(x, I, sigQ, chunk=2**12))
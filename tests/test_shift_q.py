@@ -0,0 +1,56 @@
+import numpy as np
+from modelexp import Cli
+from modelexp.experiments.reflectometry import Reflectometry
+from modelexp.models.reflectometry import Substrate, ShiftQ
+from modelexp.data import XyeData
+from modelexp.fit import LevenbergMarquardt
+
+def setup(tmp_path):
+  q = np.linspace(0.01, 0.2, 200)
+  R = 1e-4 / q**4 * np.exp(-(q * 10)**2) + 2e-6
+  path = str(tmp_path / 'reflectivity.xye')
+  np.savetxt(path, np.transpose([q, R, 0.1 * R]))
+  app = Cli()
+  experiment = app.setExperiment(Reflectometry)
+  data = app.setData(XyeData)
+  data.loadFromFile(path)
+  model = app.setModel(Substrate, ShiftQ)
+  model.setParam('qShift', 3e-3, minVal=-0.1, maxVal=0.1, vary=True)
+  app.setFit(LevenbergMarquardt)
+  return experiment, model
+
+def unshifted(modelset, q):
+  '''
+  Values of the model without ShiftQ on q
+  '''
+  reference = Substrate(None)
+  reference.params = modelset.params
+  reference.defineDomain(q)
+  reference.calcModel()
+  return reference.getValues()
+
+def test_repeated_calc_model_keeps_q(tmp_path):
+  experiment, model = setup(tmp_path)
+  modelset = model.getModelset(0)
+  q = modelset.getDomain()
+  original = q.copy()
+  model.calcModel()
+  for _ in range(100):
+    modelset.calcDecoratedModel()
+  assert modelset.getDomain() is q
+  assert np.array_equal(q, original)
+  assert np.array_equal(modelset.getValues(), unshifted(modelset, original - 3e-3))
+
+def test_residua_with_a_changing_shift_keep_q(tmp_path):
+  experiment, model = setup(tmp_path)
+  modelset = model.getModelset(0)
+  original = modelset.getDomain().copy()
+  params = model.params.copy()
+  for k in range(50):
+    params['qShift'].value = 1e-3 * np.sin(k)
+    experiment.residuum(params)
+  assert np.array_equal(modelset.getDomain(), original)
+
+  params['qShift'].value = 3e-3
+  experiment.residuum(params)
+  assert np.array_equal(modelset.getValues(), unshifted(modelset, original - 3e-3))
@@ -0,0 +1,44 @@
+import numpy as np
+from modelexp.fit import LevenbergMarquardt
+from test_variable_projection import setup as sanspol, kernelCalls
+
+def values(model):
+  return [model.getModelset(i).getValues().copy() for i in range(model.nModelsets)]
+
+def test_stacked_evaluation_agrees_with_the_modelsets(kernelCalls):
+  model, _ = sanspol(LevenbergMarquardt)
+  model.calcModel()
+  separate = values(model)
+  assert len(kernelCalls) == 4
+
+  del kernelCalls[:]
+  model.enableStackedEvaluation()
+  model.calcModel()
+  # a kernel call per polarization, on the domains of both detector distances
+  assert len(kernelCalls) == 2
+  sizes = sorted(len(domain) for domain in kernelCalls)
+  assert sizes == 2 * [len(model.getModelset(0).getDomain()) + len(model.getModelset(2).getDomain())]
+  for stacked, reference in zip(values(model), separate):
+    assert np.allclose(stacked, reference, rtol=1e-12, atol=0)
+
+def test_only_the_recalculated_modelsets_are_stacked(kernelCalls):
+  model, fit = sanspol(LevenbergMarquardt)
+  model.enableStackedEvaluation()
+  params = model.params.copy()
+  fit.ptrExperiment.residuum(params)
+  del kernelCalls[:]
+
+  # the modelsets of the small angle detector, one per polarization
+  params['dTheta_sa'].value *= 1.5
+  fit.ptrExperiment.residuum(params)
+  assert [len(domain) for domain in kernelCalls] == 2 * [len(model.getModelset(0).getDomain())]
+
+  del kernelCalls[:]
+  params['r'].value += 1
+  fit.ptrExperiment.residuum(params)
+  assert len(kernelCalls) == 2
+  stacked = values(model)
+  model.disableStackedEvaluation()
+  model.calcModel()
+  for result, reference in zip(stacked, values(model)):
+    assert np.allclose(result, reference, rtol=1e-12, atol=0)
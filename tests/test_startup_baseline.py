@@ -0,0 +1,25 @@
+import importlib.util, json, os
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def loadBenchmark():
+  spec = importlib.util.spec_from_file_location('startup', os.path.join(ROOT, 'benchmarks', 'startup.py'))
+  module = importlib.util.module_from_spec(spec)
+  spec.loader.exec_module(module)
+  return module
+
+startup = loadBenchmark()
+with open(startup.BASELINE) as f:
+  baseline = json.load(f)
+
+@pytest.mark.parametrize('name', sorted(startup.ENTRY_POINTS))
+def test_entry_point_imports_match_baseline(name):
+  '''
+  The module list is deterministic, unlike the times checked by --check
+  '''
+  assert not 'error' in baseline[name], 'the baseline has to be saved from a working import'
+  result = startup.runEntryPoint(startup.ENTRY_POINTS[name])
+  assert not 'error' in result, result.get('error')
+  modules = {m for m in result['modules'] if m.split('.')[0] == 'modelexp'}
+  assert sorted(modules - set(baseline[name]['modelexp_modules'])) == []
@@ -0,0 +1,94 @@
+import contextlib, io, os
+import numpy as np
+import pytest
+from modelexp import Cli
+from modelexp.experiments.sas import Sanspol
+from modelexp.models.sas import Sphere, InstrumentalResolution, Magnetic
+from modelexp.data import XyeData
+from modelexp.fit import LevenbergMarquardt, VariableProjection
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXAMPLE = os.path.join(ROOT, 'examples', 'Sanspol_Sphere')
+
+def setup(fitClass, fitRange=None):
+  '''
+  The Sanspol_Sphere example, started away from the solution
+  '''
+  app = Cli()
+  experiment = app.setExperiment(Sanspol)
+  data = app.setData(XyeData)
+  for suffix in (['sa', 'p'], ['sa', 'm'], ['la', 'p'], ['la', 'm']):
+    data.loadFromFile(os.path.join(EXAMPLE, f'sansSphereData_{suffix[0]}_{suffix[1]}.xye'), suffix)
+  model = app.setModel(Sphere, [Magnetic, InstrumentalResolution])
+  model.setParam('r', 45, minVal=0, maxVal=100)
+  model.setParam('sldCore', 4.5e-05, minVal=0, maxVal=4.5e-4, vary=False)
+  model.setParam('sldSolvent', 1e-05, minVal=0, maxVal=1e-4, vary=False)
+  model.setParam('sigR', 0.08, minVal=0, maxVal=0.2)
+  model.setParam('i0', 0.8, minVal=0, maxVal=10)
+  model.setParam('bg', 0.0, minVal=0, maxVal=1, vary=False)
+  if fitRange is not None:
+    experiment.setFitRange(*fitRange)
+  return model, app.setFit(fitClass)
+
+@pytest.fixture
+def kernelCalls(monkeypatch):
+  '''
+  Domains of all evaluations of the sphere kernel
+  '''
+  calls = []
+  evaluate = Sphere.evaluateMagnetic.__func__
+  def counted(cls, q, theta):
+    calls.append(np.array(q))
+    return evaluate(cls, q, theta)
+  monkeypatch.setattr(Sphere, 'evaluateMagnetic', classmethod(counted))
+  return calls
+
+def runFit(fit):
+  with contextlib.redirect_stdout(io.StringIO()):
+    return fit.fit()
+
+def test_fewer_model_evaluations_than_levenberg_marquardt(kernelCalls):
+  _, lm = setup(LevenbergMarquardt)
+  reference = runFit(lm)
+  lmCalls = len(kernelCalls)
+
+  del kernelCalls[:]
+  _, vp = setup(VariableProjection)
+  result = runFit(vp)
+
+  assert len(kernelCalls) < lmCalls
+  # i0 is the only probed column, one evaluation per projected residual
+  assert vp.probedColumns == [0] and vp.fixedOffset is not None
+  assert vp.nProbes <= vp.projection_result.nfev + 16
+  for name in ('r', 'sigR', 'i0'):
+    assert result.params[name].value == pytest.approx(reference.params[name].value, rel=1e-3)
+
+def test_probes_only_evaluate_the_window(kernelCalls, monkeypatch):
+  model, vp = setup(VariableProjection, fitRange=(0.3, 0.6))
+  probing = []
+  evaluate = VariableProjection.evaluate
+  def flagged(self, *args):
+    start = len(kernelCalls)
+    values = evaluate(self, *args)
+    probing.extend(kernelCalls[start:])
+    return values
+  monkeypatch.setattr(VariableProjection, 'evaluate', flagged)
+  runFit(vp)
+
+  assert len(probing) > 0
+  full = max(len(model.getModelset(i).getDomain()) for i in range(model.nModelsets))
+  # the small angle modelsets lie outside of the window and are never probed
+  assert all(q.max() > 0.1 for q in probing)
+  assert all(len(q) < full for q in probing)
+
+def test_executor_is_created_once_per_fit(monkeypatch):
+  model, vp = setup(VariableProjection)
+  created = []
+  setExecutor = type(model).setExecutor
+  def counted(self, *args, **kwargs):
+    created.append(args)
+    return setExecutor(self, *args, **kwargs)
+  monkeypatch.setattr(type(model), 'setExecutor', counted)
+  runFit(vp)
+  assert created == [('thread', None)]
+  assert model.executor is None
@@ -0,0 +1,45 @@
+import numpy as np
+from modelexp.fit import LevenbergMarquardt
+from test_variable_projection import setup as sanspol, kernelCalls
+
+fitRange = (0.02, 0.06)
+
+def setup():
+  model, fit = sanspol(LevenbergMarquardt, fitRange)
+  experiment = fit.ptrExperiment
+  params = model.params.copy()
+  params['dTheta_sa'].value = 2e-4
+  params['dTheta_la'].value = 8e-4
+  return model, experiment, params
+
+def test_windowed_residuum_equals_the_full_residuum_in_the_fit_range():
+  model, experiment, params = setup()
+  full = experiment.residuum(params)
+  with model.evaluationWindow(experiment.getEvaluationRange()):
+    windowed = experiment.residuum(params)
+    assert np.isnan(model.getModelset(0).getValues()).any()
+  # the gaussian of the smearing is cut at 5 widths
+  assert np.allclose(windowed, full, rtol=1e-6, atol=0)
+
+def test_padding_covers_five_resolution_widths(kernelCalls):
+  model, experiment, params = setup()
+  model.params = params
+  model.updateModel()
+  del kernelCalls[:]
+  with model.evaluationWindow(fitRange):
+    model.updateModel()
+
+  assert len(kernelCalls) == model.nModelsets
+  for i, evaluated in enumerate(kernelCalls):
+    modelset = model.getModelset(i)
+    theta = modelset.params
+    q = modelset.getDomain()
+    sigQ = np.sqrt(
+      (theta['dWavelength'] * q)**2 + (4 * np.pi / theta['wavelength'] * theta['dTheta'])**2
+    )
+    needed = (q + 5 * sigQ >= fitRange[0]) & (q - 5 * sigQ <= fitRange[1])
+    assert not needed.all()
+    assert np.array_equal(evaluated, q[needed])
+    # the padding reaches further than the fit range
+    assert evaluated[0] < fitRange[0] or q[0] >= fitRange[0]
+    assert evaluated[-1] > fitRange[1] or q[-1] <= fitRange[1]
@@ -0,0 +1,45 @@
+import tracemalloc
+import numpy as np
+from modelexp.fit import LevenbergMarquardt
+from test_variable_projection import setup as sanspol
+
+def residua(experiment, params, n, start):
+  # i0 is shared, every residual recalculates all modelsets
+  for k in range(n):
+    params['i0'].value = start + 0.001 * k
+    resi = experiment.residuum(params)
+  return resi
+
+def test_sanspol_residua_are_written_into_the_workspace():
+  model, fit = sanspol(LevenbergMarquardt)
+  experiment = fit.ptrExperiment
+  params = model.params.copy()
+  assert model.precision == 'double'
+  residua(experiment, params, 3, 0.8)
+  buffers = [model.getModelset(i).getValues() for i in range(model.nModelsets)]
+  allocations = model.getWorkspaceAllocations()
+  # the scaled intensity and the smeared values of every modelset
+  assert allocations == 2 * model.nModelsets
+
+  tracemalloc.start()
+  try:
+    resi = residua(experiment, params, 10, 0.81)
+    before = tracemalloc.get_traced_memory()[0]
+    resi = residua(experiment, params, 50, 0.82)
+    growth = tracemalloc.get_traced_memory()[0] - before
+  finally:
+    tracemalloc.stop()
+
+  assert all(model.updatedModelsets)
+  assert model.getWorkspaceAllocations() == allocations
+  for i in range(model.nModelsets):
+    assert model.getModelset(i).getValues() is buffers[i]
+  # a leaked array per residual would be at least the size of the residuum
+  assert growth / 50 < resi.nbytes / 4
+
+  # the same values as the evaluation without workspace
+  for i, buffer in enumerate(buffers):
+    modelset = model.getModelset(i)
+    modelset.calcDecoratedModel()
+    assert modelset.getValues() is not buffer
+    assert np.array_equal(modelset.getValues(), buffer)